@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import sys, os, json, uuid, datetime, smtplib
+import sys, os, re, json, copy, uuid, zlib, math, mmap, time, queue, socket, struct, sqlite3, datetime, decimal, hashlib, smtplib, threading, unicodedata
 from email.mime.text import MIMEText
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
 
 # PyQt5
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -21,6 +23,56 @@ import pymssql
 ###############################################################################
 CONFIG_FILE = "config.json"
 ICON_FILE = "icon.jpg"  # Gerçek bir ikon dosyanız varsa buraya yolunu yazın.
+SYNC_MODES = ["", "upsert", "full_sync", "bulk_load"]  # "" = sadece hedefte olmayan kayıtları ekle
+SHARD_METHODS = ["hash", "range"]
+# Kaynak oturumu okuma yalıtımı: (değer, etiket); "" = sunucu varsayılanı (READ COMMITTED / RCSI)
+READ_ISOLATION_LEVELS = [
+    ("", "Varsayılan (READ COMMITTED)"),
+    ("snapshot", "SNAPSHOT"),
+    ("read_uncommitted", "NOLOCK (READ UNCOMMITTED)")
+]
+UPSERT_BATCH_SIZE = 500
+BULK_LOAD_BATCH_ROWS = 100000
+BULK_LOAD_DEDUP_ROWS = 10000000  # bulk_load tekrar indeksinin Bloom boyutu için satır tahmini (kaynak sayısı bilinmez)
+CONTROL_PING_SECONDS = 30  # kontrol DB bağlantısı bu süreden eski kontrolse kullanmadan önce yoklanır
+CONTROL_RECONNECT_SECONDS = 5  # başarısız bağlantı denemesinden sonra bekleme
+QUEUE_LEASE_SECONDS = 300  # kuyruktan alınan iş bu süre içinde yenilenmezse başka düğüm devralır
+QUEUE_RETENTION_DAYS = 7
+NODE_ID = f"{socket.gethostname()}:{os.getpid()}"  # aynı kontrol DB'yi paylaşan instance'ları ayırır
+LIMIT_REFRESH_SECONDS = 60  # kaynak limitleri (zaman pencereleri) çalışma sırasında bu aralıkla yeniden okunur
+SOURCE_SLOT_WAIT_SECONDS = 600  # eşzamanlı sorgu sınırında boş slot için en fazla bekleme
+STREAM_FETCH_SIZE = 1000
+BATCH_MIN_ROWS = 50
+BATCH_MAX_ROWS = 50000
+BATCH_PROBE_ROWS = 200
+# Geçici sayılan SQL Server / DB-Lib hata kodları (deadlock, kilit/sorgu zaman aşımı,
+# kopan bağlantı, Azure geçici hataları); bunlarda batch beklenip tekrar denenir
+TRANSIENT_ERROR_CODES = {
+    1205, 1222, -2, 233, 10053, 10054, 10060, 20003, 20004, 20006, 20009, 20047,
+    40197, 40501, 40613, 49918, 49919, 49920
+}
+TRANSIENT_ERROR_TEXTS = (
+    "deadlock", "timeout", "timed out", "connection reset", "dbprocess is dead",
+    "write to the server failed", "read from the server failed", "connection is broken"
+)
+CHAR_TYPES = ("char", "varchar", "nchar", "nvarchar")
+INT_RANGES = {
+    "tinyint": (0, 255),
+    "smallint": (-2 ** 15, 2 ** 15 - 1),
+    "int": (-2 ** 31, 2 ** 31 - 1),
+    "bigint": (-2 ** 63, 2 ** 63 - 1)
+}
+DECIMAL_CONTEXT = decimal.Context(prec=38)  # SQL Server decimal/numeric en fazla 38 basamak
+DATETIME_RANGES = {
+    "datetime": (datetime.datetime(1753, 1, 1), datetime.datetime.max),
+    "smalldatetime": (datetime.datetime(1900, 1, 1), datetime.datetime(2079, 6, 6, 23, 59)),
+    "datetime2": (datetime.datetime.min, datetime.datetime.max),
+    "date": (datetime.datetime.min, datetime.datetime.max)
+}
+BIT_VALUES = {
+    True: 1, False: 0, "1": 1, "0": 0, "true": 1, "false": 0,
+    "evet": 1, "hayır": 0, "e": 1, "h": 0, "yes": 1, "no": 0
+}
 
 ###############################################################################
 # CONFIG MANAGER
@@ -73,27 +125,107 @@ class DatabaseManager:
     """
     def __init__(self, config: ConfigManager):
         self.config = config
-        self.conn = None
+        # Her thread kendi kontrol DB bağlantısını kullanır (pymssql thread-safe değil)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []
+        self.generation = 0
+        # job_id -> JobPlan; plan_version değişince yeniden derlenir
+        self.plan_cache = {}
         self.connect()
 
+    @property
+    def conn(self):
+        """
+        Çağıran thread'in bağlantısı. Yoksa açılır; son yoklamadan bu yana
+        CONTROL_PING_SECONDS geçtiyse ya da invalidate() çağrıldıysa yoklanır ve kopmuşsa
+        yeniden bağlanılır. Bağlanılamazsa None döner.
+        """
+        local = self.local
+        conn = getattr(local, "conn", None)
+        now = time.monotonic()
+        if getattr(local, "generation", None) != self.generation:
+            return self.connect()
+        if conn is None:
+            if now - local.checked_at < CONTROL_RECONNECT_SECONDS:
+                return None
+            return self.connect()
+        # Sürekli kullanılan bağlantı da düzenli yoklanır; kullanım kopmuş bağlantıyı canlı göstermez
+        if getattr(local, "suspect", False) or now - local.checked_at > CONTROL_PING_SECONDS:
+            try:
+                cur = conn.cursor()
+                cur.execute("SELECT 1")
+                cur.fetchall()
+                local.checked_at = now
+                local.suspect = False
+            except Exception:
+                return self.connect()
+        return conn
+
+    def invalidate(self):
+        """
+        Kontrol DB işlemi hata verdiğinde çağrılır; thread'in bağlantısı bir sonraki
+        kullanımda yoklanır ve kopmuşsa yeniden açılır.
+        """
+        self.local.suspect = True
+
     def connect(self):
-        c = self.config.config_data
+        """
+        Çağıran thread için kontrol DB bağlantısını (yeniden) açar.
+        """
+        self.release_local()
         try:
-            self.conn = pymssql.connect(
-                server=c["db_server"],
-                user=c["db_user"],
-                password=c["db_password"],
-                database=c["db_name"],
-                port=c.get("db_port", 1433),
-                timeout=10
-            )
+            conn = self.open_control_connection()
         except Exception as e:
             print("Veritabanına bağlanırken hata oluştu:", str(e))
-            self.conn = None
+            conn = None
+        self.local.conn = conn
+        self.local.generation = self.generation
+        self.local.checked_at = time.monotonic()
+        self.local.suspect = False
+        if conn is not None:
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def open_control_connection(self):
+        c = self.config.config_data
+        return pymssql.connect(
+            server=c["db_server"],
+            user=c["db_user"],
+            password=c["db_password"],
+            database=c["db_name"],
+            port=c.get("db_port", 1433),
+            timeout=10
+        )
+
+    def release_local(self):
+        conn = getattr(self.local, "conn", None)
+        self.local.conn = None
+        if conn is not None:
+            with self.lock:
+                if conn in self.connections:
+                    self.connections.remove(conn)
+            try:
+                conn.close()
+            except Exception:
+                pass
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        """
+        Tüm thread'lerin bağlantılarını kapatır (ör. DB ayarları değişince); thread'ler
+        sonraki erişimde yeni ayarlarla yeniden bağlanır.
+        """
+        with self.lock:
+            connections, self.connections = self.connections, []
+            self.generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self.local.conn = None
+        self.plan_cache.clear()
 
     def create_tables_if_not_exists(self):
         if not self.conn:
@@ -121,7 +253,15 @@ class DatabaseManager:
             target_password VARCHAR(255),
             target_db VARCHAR(255),
             create_date DATETIME DEFAULT GETDATE(),
-            last_run_date DATETIME
+            last_run_date DATETIME,
+            plan_version INT NOT NULL DEFAULT 0,
+            read_isolation VARCHAR(30),
+            statement_timeout INT,
+            source_conn_ids VARCHAR(1000),
+            shard_conn_ids VARCHAR(1000),
+            shard_columns VARCHAR(500),
+            shard_method VARCHAR(20),
+            shard_bounds VARCHAR(1000)
         )
         """)
         cursor.execute("""
@@ -136,6 +276,9 @@ class DatabaseManager:
             fixed_value VARCHAR(255),
             convert_type VARCHAR(50),
             is_key BIT DEFAULT 0,
+            filter_predicate VARCHAR(1000),
+            sync_mode VARCHAR(20),
+            suspend_constraints BIT DEFAULT 0,
             FOREIGN KEY (job_id) REFERENCES TransferJobs(job_id)
         )
         """)
@@ -171,11 +314,100 @@ class DatabaseManager:
             username VARCHAR(255),
             passw VARCHAR(255),
             dbname VARCHAR(255),
-            port INT
+            port INT,
+            replica_servers VARCHAR(1000),
+            max_replica_lag INT
+        )
+        """)
+        cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='TransferRunStats' AND xtype='U')
+        CREATE TABLE TransferRunStats (
+            stat_id INT IDENTITY(1,1) PRIMARY KEY,
+            job_id INT NOT NULL,
+            source_table VARCHAR(255),
+            target_table VARCHAR(255),
+            sync_mode VARCHAR(20),
+            rows_read BIGINT,
+            duration_seconds FLOAT,
+            run_date DATETIME DEFAULT GETDATE()
+        )
+        """)
+        cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='TransferSuspendedObjects' AND xtype='U')
+        CREATE TABLE TransferSuspendedObjects (
+            suspend_id INT IDENTITY(1,1) PRIMARY KEY,
+            job_id INT NOT NULL,
+            target_server VARCHAR(255),
+            target_db VARCHAR(255),
+            table_name VARCHAR(255),
+            object_type VARCHAR(20),
+            object_name VARCHAR(255),
+            suspended_at DATETIME DEFAULT GETDATE()
+        )
+        """)
+        cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='TransferSourceWatermarks' AND xtype='U')
+        CREATE TABLE TransferSourceWatermarks (
+            job_id INT NOT NULL,
+            conn_id INT NOT NULL,
+            last_run_date DATETIME,
+            last_status VARCHAR(20),
+            rows_read BIGINT,
+            duration_seconds FLOAT,
+            message VARCHAR(MAX),
+            updated_at DATETIME DEFAULT GETDATE(),
+            PRIMARY KEY (job_id, conn_id)
+        )
+        """)
+        cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='TransferSourceLimits' AND xtype='U')
+        CREATE TABLE TransferSourceLimits (
+            limit_id INT IDENTITY(1,1) PRIMARY KEY,
+            job_id INT NULL,
+            source_server VARCHAR(255) NULL,
+            start_time VARCHAR(5) NULL,
+            end_time VARCHAR(5) NULL,
+            max_rows_per_sec INT NULL,
+            max_concurrent INT NULL
+        )
+        """)
+        cursor.execute("""
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='TransferQueue' AND xtype='U')
+        CREATE TABLE TransferQueue (
+            queue_id INT IDENTITY(1,1) PRIMARY KEY,
+            job_id INT NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            enqueued_at DATETIME DEFAULT GETDATE(),
+            claimed_by VARCHAR(255),
+            claimed_at DATETIME,
+            lease_until DATETIME,
+            attempts INT NOT NULL DEFAULT 0,
+            finished_at DATETIME,
+            message VARCHAR(MAX)
         )
         """)
+        # Eski kurulumlarda sonradan eklenen kolonlar
+        self.add_column_if_missing(cursor, "TransferJobs", "plan_version", "INT NOT NULL DEFAULT 0")
+        self.add_column_if_missing(cursor, "SavedConnections", "replica_servers", "VARCHAR(1000)")
+        self.add_column_if_missing(cursor, "SavedConnections", "max_replica_lag", "INT")
+        self.add_column_if_missing(cursor, "TransferJobs", "read_isolation", "VARCHAR(30)")
+        self.add_column_if_missing(cursor, "TransferJobs", "statement_timeout", "INT")
+        self.add_column_if_missing(cursor, "TransferJobs", "source_conn_ids", "VARCHAR(1000)")
+        self.add_column_if_missing(cursor, "TransferJobs", "shard_conn_ids", "VARCHAR(1000)")
+        self.add_column_if_missing(cursor, "TransferJobs", "shard_columns", "VARCHAR(500)")
+        self.add_column_if_missing(cursor, "TransferJobs", "shard_method", "VARCHAR(20)")
+        self.add_column_if_missing(cursor, "TransferJobs", "shard_bounds", "VARCHAR(1000)")
+        self.add_column_if_missing(cursor, "TransferJobDetails", "filter_predicate", "VARCHAR(1000)")
+        self.add_column_if_missing(cursor, "TransferJobDetails", "sync_mode", "VARCHAR(20)")
+        self.add_column_if_missing(cursor, "TransferJobDetails", "suspend_constraints", "BIT DEFAULT 0")
         self.conn.commit()
 
+    def add_column_if_missing(self, cursor, table, column, definition):
+        cursor.execute(f"""
+        IF COL_LENGTH('{table}', '{column}') IS NULL
+        ALTER TABLE {table} ADD {column} {definition}
+        """)
+
     def get_setting(self, key):
         if not self.conn:
             return None
@@ -199,13 +431,18 @@ class DatabaseManager:
     def insert_transfer_job(self, job_data):
         sql = """INSERT INTO TransferJobs (
             job_name, source_server, source_user, source_password, source_db,
-            target_server, target_user, target_password, target_db
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+            target_server, target_user, target_password, target_db, read_isolation, statement_timeout,
+            source_conn_ids, shard_conn_ids, shard_columns, shard_method, shard_bounds
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         vals = (
             job_data["job_name"],
             job_data["source_server"], job_data["source_user"], job_data["source_password"], job_data["source_db"],
-            job_data["target_server"], job_data["target_user"], job_data["target_password"], job_data["target_db"]
+            job_data["target_server"], job_data["target_user"], job_data["target_password"], job_data["target_db"],
+            job_data.get("read_isolation") or None, job_data.get("statement_timeout") or None,
+            job_data.get("source_conn_ids") or None,
+            job_data.get("shard_conn_ids") or None, job_data.get("shard_columns") or None,
+            job_data.get("shard_method") or None, job_data.get("shard_bounds") or None
         )
         cursor = self.conn.cursor()
         cursor.execute(sql, vals)
@@ -223,18 +460,39 @@ class DatabaseManager:
             target_server=%s,
             target_user=%s,
             target_password=%s,
-            target_db=%s
+            target_db=%s,
+            read_isolation=%s,
+            statement_timeout=%s,
+            source_conn_ids=%s,
+            shard_conn_ids=%s,
+            shard_columns=%s,
+            shard_method=%s,
+            shard_bounds=%s
             WHERE job_id=%s
         """
         vals = (
             job_data["job_name"],
             job_data["source_server"], job_data["source_user"], job_data["source_password"], job_data["source_db"],
             job_data["target_server"], job_data["target_user"], job_data["target_password"], job_data["target_db"],
+            job_data.get("read_isolation") or None, job_data.get("statement_timeout") or None,
+            job_data.get("source_conn_ids") or None,
+            job_data.get("shard_conn_ids") or None, job_data.get("shard_columns") or None,
+            job_data.get("shard_method") or None, job_data.get("shard_bounds") or None,
             job_id
         )
         cursor = self.conn.cursor()
         cursor.execute(sql, vals)
         self.conn.commit()
+        self.bump_plan_version(job_id)
+
+    def bump_plan_version(self, job_id):
+        """
+        İşin derlenmiş planını geçersiz kılar (sonraki çalışmada yeniden derlenir).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("UPDATE TransferJobs SET plan_version = plan_version + 1 WHERE job_id=%s", (job_id,))
+        self.conn.commit()
+        self.plan_cache.pop(job_id, None)
 
     def delete_transfer_job(self, job_id):
         cursor = self.conn.cursor()
@@ -242,14 +500,18 @@ class DatabaseManager:
         cursor.execute("DELETE FROM TransferJobDetails WHERE job_id=%s", (job_id,))
         cursor.execute("DELETE FROM TransferTriggers WHERE job_id=%s OR dependent_job_id=%s", (job_id, job_id))
         cursor.execute("DELETE FROM TransferLogs WHERE job_id=%s", (job_id,))
+        cursor.execute("DELETE FROM TransferRunStats WHERE job_id=%s", (job_id,))
+        cursor.execute("DELETE FROM TransferQueue WHERE job_id=%s AND status='pending'", (job_id,))
+        cursor.execute("DELETE FROM TransferSourceWatermarks WHERE job_id=%s", (job_id,))
         cursor.execute("DELETE FROM TransferJobs WHERE job_id=%s", (job_id,))
         self.conn.commit()
+        self.plan_cache.pop(job_id, None)
 
     def insert_transfer_job_details(self, details):
         sql = """INSERT INTO TransferJobDetails (
             job_id, source_table, target_table, source_column, target_column,
-            fixed_value, convert_type, is_key
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            fixed_value, convert_type, is_key, filter_predicate, sync_mode, suspend_constraints
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
         cursor = self.conn.cursor()
         for d in details:
@@ -259,7 +521,10 @@ class DatabaseManager:
                 d["source_column"], d["target_column"],
                 d.get("fixed_value", None),
                 d.get("convert_type", None),
-                1 if d.get("is_key", False) else 0
+                1 if d.get("is_key", False) else 0,
+                d.get("filter_predicate", None),
+                d.get("sync_mode", None),
+                1 if d.get("suspend_constraints", False) else 0
             )
             cursor.execute(sql, vals)
         self.conn.commit()
@@ -269,6 +534,7 @@ class DatabaseManager:
         cursor.execute("DELETE FROM TransferJobDetails WHERE job_id=%s", (job_id,))
         self.conn.commit()
         self.insert_transfer_job_details(details)
+        self.bump_plan_version(job_id)
 
     def insert_trigger(self, job_id, dep_job_id, check_table, check_column, check_value):
         sql = """INSERT INTO TransferTriggers (
@@ -285,6 +551,192 @@ class DatabaseManager:
         cursor.execute(sql, (job_id, message))
         self.conn.commit()
 
+    def insert_run_stats(self, job_id, source_table, target_table, sync_mode, rows_read, duration_seconds):
+        sql = """INSERT INTO TransferRunStats (job_id, source_table, target_table, sync_mode, rows_read, duration_seconds)
+                 VALUES (%s, %s, %s, %s, %s, %s)"""
+        cursor = self.conn.cursor()
+        cursor.execute(sql, (job_id, source_table, target_table, sync_mode, rows_read, duration_seconds))
+        self.conn.commit()
+
+    def get_throughput(self, source_table, target_table, sync_mode):
+        """
+        Geçmiş çalışmalardan satır/saniye hızı. Önce aynı tablo çiftinin son 10
+        çalışmasına, yoksa aynı moddaki tüm çalışmalara bakılır; veri yoksa None.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT SUM(rows_read), SUM(duration_seconds) FROM (
+                SELECT TOP 10 rows_read, duration_seconds FROM TransferRunStats
+                WHERE source_table=%s AND target_table=%s AND rows_read > 0
+                ORDER BY stat_id DESC
+            ) s
+        """, (source_table, target_table))
+        rows, seconds = cursor.fetchone()
+        if not rows or not seconds:
+            cursor.execute("""
+                SELECT SUM(rows_read), SUM(duration_seconds) FROM TransferRunStats
+                WHERE ISNULL(sync_mode, '')=%s AND rows_read > 0
+            """, (sync_mode,))
+            rows, seconds = cursor.fetchone()
+        if not rows or not seconds:
+            return None
+        return float(rows) / float(seconds)
+
+    def insert_suspended_object(self, job_id, target_server, target_db, table_name, object_type, object_name):
+        sql = """INSERT INTO TransferSuspendedObjects (
+            job_id, target_server, target_db, table_name, object_type, object_name
+        ) VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(sql, (job_id, target_server, target_db, table_name, object_type, object_name))
+        self.conn.commit()
+        cursor.execute("SELECT @@IDENTITY")
+        return int(cursor.fetchone()[0])
+
+    def get_suspended_objects(self, job_id, target_server, target_db):
+        cursor = self.conn.cursor(as_dict=True)
+        cursor.execute("""SELECT * FROM TransferSuspendedObjects
+            WHERE job_id=%s AND target_server=%s AND target_db=%s ORDER BY suspend_id""",
+            (job_id, target_server, target_db))
+        return cursor.fetchall()
+
+    def delete_suspended_object(self, suspend_id):
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM TransferSuspendedObjects WHERE suspend_id=%s", (suspend_id,))
+        self.conn.commit()
+
+    def get_recovery_switches(self, target_server, target_db):
+        """
+        Hedef veritabanında recovery modunu değiştirmiş (tüm işlerin) süren yüklemeleri.
+        """
+        cursor = self.conn.cursor(as_dict=True)
+        cursor.execute("""SELECT * FROM TransferSuspendedObjects
+            WHERE object_type='RECOVERY' AND LOWER(target_server)=LOWER(%s) AND LOWER(target_db)=LOWER(%s)
+            ORDER BY suspend_id""", (target_server, target_db))
+        return cursor.fetchall()
+
+    def enqueue_job(self, job_id, min_interval_seconds=0):
+        """
+        İşi kuyruğa ekler. Bekleyen/çalışan kaydı varsa ya da son min_interval_seconds
+        içinde (başka bir düğümce) eklenmişse eklemez; eklendiyse True döner.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO TransferQueue (job_id, status)
+            SELECT %s, 'pending'
+            WHERE NOT EXISTS (
+                SELECT 1 FROM TransferQueue WITH (UPDLOCK, HOLDLOCK)
+                WHERE job_id=%s AND (status IN ('pending', 'running')
+                    OR enqueued_at > DATEADD(second, -%s, GETDATE()))
+            )
+        """, (job_id, job_id, int(min_interval_seconds)))
+        added = cursor.rowcount > 0
+        cursor.execute("""DELETE FROM TransferQueue WHERE status IN ('done', 'failed')
+            AND finished_at < DATEADD(day, -%s, GETDATE())""", (QUEUE_RETENTION_DAYS,))
+        self.conn.commit()
+        return added
+
+    def claim_queued_job(self, node_id, lease_seconds):
+        """
+        Sıradaki bekleyen ya da kiralaması dolmuş işi bu düğüme alır. READPAST ile başka
+        düğümün kilitlediği satır atlanır, böylece her kayıt tek bir düğümde çalışır.
+        (queue_id, job_id) ya da None döner.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            WITH next_job AS (
+                SELECT TOP (1) * FROM TransferQueue WITH (ROWLOCK, READPAST, UPDLOCK)
+                WHERE status='pending' OR (status='running' AND lease_until < GETDATE())
+                ORDER BY queue_id
+            )
+            UPDATE next_job SET status='running', claimed_by=%s, claimed_at=GETDATE(),
+                lease_until=DATEADD(second, %s, GETDATE()), attempts=attempts + 1
+            OUTPUT inserted.queue_id, inserted.job_id
+        """, (node_id, int(lease_seconds)))
+        row = cursor.fetchone()
+        self.conn.commit()
+        return (row[0], row[1]) if row else None
+
+    def heartbeat_queued_job(self, queue_id, node_id, lease_seconds):
+        """
+        Kiralamayı uzatır; kayıt artık bu düğümde değilse False döner.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""UPDATE TransferQueue SET lease_until=DATEADD(second, %s, GETDATE())
+            WHERE queue_id=%s AND claimed_by=%s AND status='running'""",
+            (int(lease_seconds), queue_id, node_id))
+        renewed = cursor.rowcount > 0
+        self.conn.commit()
+        return renewed
+
+    def complete_queued_job(self, queue_id, node_id, status, message=None):
+        cursor = self.conn.cursor()
+        cursor.execute("""UPDATE TransferQueue SET status=%s, finished_at=GETDATE(), message=%s
+            WHERE queue_id=%s AND claimed_by=%s""", (status, message, queue_id, node_id))
+        self.conn.commit()
+
+    def get_source_limits(self, job_id=None, source_server=None):
+        """
+        Parametresiz tüm limitler; verilirse işe ya da (iş belirtilmemiş) kaynak sunucuya ait olanlar.
+        """
+        cursor = self.conn.cursor(as_dict=True)
+        if job_id is None and source_server is None:
+            cursor.execute("SELECT * FROM TransferSourceLimits ORDER BY limit_id")
+        else:
+            cursor.execute("""SELECT * FROM TransferSourceLimits
+                WHERE job_id=%s OR (job_id IS NULL AND source_server=%s) ORDER BY limit_id""",
+                (job_id, source_server))
+        return cursor.fetchall()
+
+    def replace_source_limits(self, limits):
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM TransferSourceLimits")
+        for l in limits:
+            cursor.execute("""INSERT INTO TransferSourceLimits (
+                job_id, source_server, start_time, end_time, max_rows_per_sec, max_concurrent
+            ) VALUES (%s, %s, %s, %s, %s, %s)""", (
+                l["job_id"], l["source_server"], l["start_time"], l["end_time"],
+                l["max_rows_per_sec"], l["max_concurrent"]
+            ))
+        self.conn.commit()
+
+    def acquire_slot(self, resource, slots, wait_seconds=SOURCE_SLOT_WAIT_SECONDS):
+        """
+        resource için slots adet oturum applock'undan boş olanı alır (düğümler arası
+        eşzamanlılık sınırı). Kilit ayrı bir bağlantıda tutulur; thread'in kontrol bağlantısı
+        yeniden açılsa da düşmez. Alınan slot (ad, bağlantı), süre dolarsa None döner.
+        """
+        conn = self.open_control_connection()
+        try:
+            deadline = time.monotonic() + wait_seconds
+            while True:
+                cursor = conn.cursor()
+                for i in range(slots):
+                    name = f"{resource}:{i}"
+                    cursor.execute("""DECLARE @r INT;
+                        EXEC @r = sp_getapplock @Resource=%s, @LockMode='Exclusive', @LockOwner='Session', @LockTimeout=0;
+                        SELECT @r""", (name,))
+                    if cursor.fetchone()[0] >= 0:
+                        return name, conn
+                if time.monotonic() >= deadline:
+                    conn.close()
+                    return None
+                time.sleep(1)
+        except Exception:
+            conn.close()
+            raise
+
+    def release_slot(self, slot):
+        name, conn = slot
+        try:
+            cursor = conn.cursor()
+            cursor.execute("EXEC sp_releaseapplock @Resource=%s, @LockOwner='Session'", (name,))
+        except Exception:
+            # Bağlantı koptuysa kilit oturumla birlikte zaten bırakılmıştır
+            pass
+        finally:
+            conn.close()
+
     def get_saved_connections(self):
         cursor = self.conn.cursor(as_dict=True)
         cursor.execute("SELECT * FROM SavedConnections ORDER BY conn_id")
@@ -292,28 +744,74 @@ class DatabaseManager:
 
     def insert_saved_connection(self, data):
         sql = """INSERT INTO SavedConnections (
-            conn_name, server, username, passw, dbname, port
-        ) VALUES (%s, %s, %s, %s, %s, %s)
+            conn_name, server, username, passw, dbname, port, replica_servers, max_replica_lag
+        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
         cursor = self.conn.cursor()
         cursor.execute(sql, (
             data["conn_name"], data["server"], data["username"],
-            data["passw"], data["dbname"], data["port"]
+            data["passw"], data["dbname"], data["port"],
+            data.get("replica_servers") or None, data.get("max_replica_lag") or None
         ))
         self.conn.commit()
 
     def update_saved_connection(self, conn_id, data):
         sql = """UPDATE SavedConnections SET
-            conn_name=%s, server=%s, username=%s, passw=%s, dbname=%s, port=%s
+            conn_name=%s, server=%s, username=%s, passw=%s, dbname=%s, port=%s,
+            replica_servers=%s, max_replica_lag=%s
             WHERE conn_id=%s
         """
         cursor = self.conn.cursor()
         cursor.execute(sql, (
             data["conn_name"], data["server"], data["username"],
-            data["passw"], data["dbname"], data["port"], conn_id
+            data["passw"], data["dbname"], data["port"],
+            data.get("replica_servers") or None, data.get("max_replica_lag") or None, conn_id
         ))
         self.conn.commit()
 
+    def get_saved_connection(self, conn_id):
+        cursor = self.conn.cursor(as_dict=True)
+        cursor.execute("SELECT * FROM SavedConnections WHERE conn_id=%s", (conn_id,))
+        return cursor.fetchone()
+
+    def get_source_watermark(self, job_id, conn_id):
+        cursor = self.conn.cursor(as_dict=True)
+        cursor.execute("SELECT * FROM TransferSourceWatermarks WHERE job_id=%s AND conn_id=%s", (job_id, conn_id))
+        return cursor.fetchone()
+
+    def set_source_watermark(self, job_id, conn_id, status, rows_read, duration_seconds, message=None, run_started=None):
+        """
+        Kaynağın son çalışma sonucunu yazar; last_run_date yalnızca başarılı çalışmada
+        kaynağın çalışma başlangıcına (run_started, kaynak sunucu saati) ilerler.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""UPDATE TransferSourceWatermarks SET
+                last_run_date = CASE WHEN %s='ok' THEN %s ELSE last_run_date END,
+                last_status=%s, rows_read=%s, duration_seconds=%s, message=%s, updated_at=GETDATE()
+            WHERE job_id=%s AND conn_id=%s""",
+            (status, run_started, status, rows_read, duration_seconds, message, job_id, conn_id))
+        if cursor.rowcount == 0:
+            cursor.execute("""INSERT INTO TransferSourceWatermarks (
+                    job_id, conn_id, last_run_date, last_status, rows_read, duration_seconds, message
+                ) VALUES (%s, %s, CASE WHEN %s='ok' THEN %s END, %s, %s, %s, %s)""",
+                (job_id, conn_id, status, run_started, status, rows_read, duration_seconds, message))
+        self.conn.commit()
+
+    def get_source_replicas(self, server, dbname):
+        """
+        Sunucu/veritabanı ile eşleşen kayıtlı bağlantının okuma replikaları ve izin verilen
+        gecikme (sn). Kayıt veya replika yoksa ([], None).
+        """
+        cursor = self.conn.cursor(as_dict=True)
+        cursor.execute("""SELECT TOP 1 replica_servers, max_replica_lag FROM SavedConnections
+            WHERE LOWER(server)=LOWER(%s) AND LOWER(dbname)=LOWER(%s)
+                AND replica_servers IS NOT NULL AND replica_servers <> ''
+            ORDER BY conn_id""", (server or "", dbname or ""))
+        row = cursor.fetchone()
+        if not row:
+            return [], None
+        return [r.strip() for r in row["replica_servers"].split(",") if r.strip()], row["max_replica_lag"]
+
     def delete_saved_connection(self, conn_id):
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM SavedConnections WHERE conn_id=%s", (conn_id,))
@@ -341,7 +839,14 @@ class DatabaseManager:
             "target_server": job["target_server"],
             "target_user": job["target_user"],
             "target_password": job["target_password"],
-            "target_db": job["target_db"]
+            "target_db": job["target_db"],
+            "read_isolation": job["read_isolation"],
+            "statement_timeout": job["statement_timeout"],
+            "source_conn_ids": job["source_conn_ids"],
+            "shard_conn_ids": job["shard_conn_ids"],
+            "shard_columns": job["shard_columns"],
+            "shard_method": job["shard_method"],
+            "shard_bounds": job["shard_bounds"]
         }
         new_job_id = self.insert_transfer_job(new_data)
 
@@ -358,7 +863,10 @@ class DatabaseManager:
                 "target_column": d["target_column"],
                 "fixed_value": d["fixed_value"],
                 "convert_type": d["convert_type"],
-                "is_key": True if d["is_key"] else False
+                "is_key": True if d["is_key"] else False,
+                "filter_predicate": d.get("filter_predicate"),
+                "sync_mode": d.get("sync_mode"),
+                "suspend_constraints": True if d.get("suspend_constraints") else False
             })
         self.insert_transfer_job_details(new_details)
 
@@ -377,142 +885,3497 @@ class DatabaseManager:
 
 
 ###############################################################################
-# AKTARIM İŞİ (RUNNER)
+# YARDIMCI FONKSİYONLAR
 ###############################################################################
-class TransferJobRunner:
+FILTER_PLACEHOLDER_RE = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+def render_filter_predicate(predicate, context):
     """
-    Tek bir aktarım işini çalıştırır.
+    Filtre ifadesindeki {last_run_date} gibi yer tutucuları %s parametrelerine
+    çevirir. (sql, params) döner; bilinmeyen yer tutucuda ValueError fırlatır.
     """
-    def __init__(self, db_manager: DatabaseManager, job_id):
-        self.db_manager = db_manager
-        self.job_id = job_id
+    predicate = (predicate or "").strip()
+    if not predicate:
+        return "", ()
+    # split sonucu: [metin, isim, metin, isim, ..., metin]
+    parts = FILTER_PLACEHOLDER_RE.split(predicate)
+    if len(parts) == 1:
+        return predicate, ()
+    sql_parts, params = [], []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            # parametreli sorguda pymssql '%' karakterini özel kabul eder (LIKE 'A%' gibi)
+            sql_parts.append(part.replace("%", "%%"))
+        else:
+            if part not in context:
+                raise ValueError(f"Bilinmeyen filtre parametresi: {{{part}}}")
+            sql_parts.append("%s")
+            params.append(context[part])
+    return "".join(sql_parts), tuple(params)
+
+def is_transient_error(e):
+    """
+    Hata tekrar denendiğinde geçebilecek türden mi (deadlock, zaman aşımı, kopan bağlantı).
+    """
+    code = e.args[0] if e.args else None
+    if isinstance(code, tuple) and code:
+        code = code[0]
+    if isinstance(code, int) and code in TRANSIENT_ERROR_CODES:
+        return True
+    text = " ".join(
+        a.decode("utf-8", "replace") if isinstance(a, bytes) else str(a) for a in e.args
+    ).lower()
+    return any(t in text for t in TRANSIENT_ERROR_TEXTS)
+
+class ManagedConnection:
+    """
+    pymssql bağlantısını sarar; kopan bağlantı aynı nesne üzerinden yeniden açılır,
+    böylece bağlantıyı paylaşan yazıcılar yeni bağlantıyı görür. info, bağlantının
+    açıldığı sunucu/DB bilgisi (ör. hedef kayıtlarını TransferSuspendedObjects'e yazmak için).
+    """
+    def __init__(self, factory, info=None):
+        self.factory = factory
+        self.info = info
+        self.raw = factory()
+
+    def cursor(self, *args, **kwargs):
+        return self.raw.cursor(*args, **kwargs)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+    def autocommit(self, status):
+        self.raw.autocommit(status)
+
+    def ensure_alive(self):
+        try:
+            cur = self.raw.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchall()
+        except Exception:
+            self.close()
+            self.raw = self.factory()
+
+def normalize_hash_value(val):
+    """
+    Kaynak ve hedefte farklı tiplerle gelen aynı değerin (1, 1.0, Decimal('1.00')
+    gibi) aynı metne dönüşmesi için normalize eder.
+    """
+    if val is None:
+        return "\x00"
+    if isinstance(val, bool):
+        return "1" if val else "0"
+    if isinstance(val, (int, float, decimal.Decimal)):
+        try:
+            d = decimal.Decimal(str(val)).normalize()
+            return "0" if d.is_zero() else format(d, "f")
+        except decimal.InvalidOperation:
+            return str(val)
+    if isinstance(val, datetime.datetime):
+        if val.time() == datetime.time(0, 0):
+            return val.date().isoformat()
+        return val.isoformat(sep=" ")
+    if isinstance(val, datetime.date):
+        return val.isoformat()
+    if isinstance(val, (bytes, bytearray)):
+        return val.hex()
+    return str(val)
+
+def normalize_key_value(val, fold_case=False, fold_accents=False):
+    """
+    Anahtar eşitliği için normalize değer. SQL Server metin karşılaştırmasında sondaki
+    boşlukları yok sayar; collation CI/AI ise büyük-küçük harf ve aksan farkı da eşittir.
+    """
+    if isinstance(val, str):
+        val = val.rstrip(" ")
+        if fold_accents:
+            val = "".join(ch for ch in unicodedata.normalize("NFD", val) if not unicodedata.combining(ch))
+        if fold_case:
+            val = val.casefold()
+        return val
+    return normalize_hash_value(val)
+
+def key_folds(schema, key_names):
+    """
+    Anahtar kolonlarının collation'ına göre [(büyük/küçük harf duyarsız, aksan duyarsız)].
+    Şema yoksa veya kolon metin değilse yalnızca sondaki boşluklar yok sayılır.
+    """
+    folds = []
+    for name in key_names:
+        collation = ((schema or {}).get(name.lower()) or {}).get("collation") or ""
+        folds.append(("_CI" in collation.upper(), "_AI" in collation.upper()))
+    return folds
+
+def normalize_key(values, folds):
+    return tuple(normalize_key_value(v, *f) for v, f in zip(values, folds))
+
+def hash_columns(schema, names):
+    """
+    row_hash için kolonların hedef şeması; şemada olmayan kolon için None.
+    """
+    return [(schema or {}).get((name or "").lower()) for name in names]
+
+def to_target_value(val, col):
+    """
+    Değeri hedef kolonda saklandıktan sonra geri okunduğu biçime getirir: char/nchar
+    boşlukla, binary sıfırla doldurulmuş gelir; real float32'ye, datetime 1/300 sn'ye,
+    smalldatetime dakikaya, datetime2 kesir basamağına yuvarlanır. Kaynak değeri ve
+    hedeften okunan karşılığı böylece aynı hash'i verir.
+    """
+    if val is None or col is None:
+        return val
+    t = col["data_type"]
+    if t in ("char", "nchar"):
+        return val.rstrip(" ") if isinstance(val, str) else val
+    if t == "binary":
+        return bytes(val).rstrip(b"\x00") if isinstance(val, (bytes, bytearray)) else val
+    if t in ("real", "float") and isinstance(val, (int, float, decimal.Decimal)) and not isinstance(val, bool):
+        val = float(val)
+        return struct.unpack("f", struct.pack("f", val))[0] if t == "real" else val
+    if not isinstance(val, datetime.datetime):
+        return val
+    if t == "datetime":
+        day = val.replace(hour=0, minute=0, second=0, microsecond=0)
+        ticks = ((val - day) // datetime.timedelta(microseconds=1) * 300 + 500000) // 1000000
+        return day + datetime.timedelta(microseconds=ticks * 1000000 // 300)
+    if t == "smalldatetime":
+        return (val + datetime.timedelta(seconds=30)).replace(second=0, microsecond=0)
+    if t in ("datetime2", "datetimeoffset") and col["scale"] is not None and col["scale"] < 6:
+        step = 10 ** (6 - col["scale"])
+        return val.replace(microsecond=0) + datetime.timedelta(microseconds=(val.microsecond + step // 2) // step * step)
+    return val
+
+def row_hash(values, cols=None):
+    """
+    Kolon değerlerinin sıraya bağlı MD5 özeti. cols (hash_columns) verilirse değerler
+    önce hedef kolonun biçimine getirilir; kaynak satırı ve hedeften okunan satır aynı
+    cols ile özetlenir.
+    """
+    h = hashlib.md5()
+    for i, v in enumerate(values):
+        if cols is not None:
+            v = to_target_value(v, cols[i])
+        h.update(normalize_hash_value(v).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.digest()
+
+def get_table_schema(conn, table):
+    """
+    Tablonun kolon bilgileri: {kolon adı (küçük harf): {name, data_type, max_length,
+    precision, scale, is_nullable, column_id, collation}}. max_length karakter cinsindendir
+    (MAX için -1). Şemalı (dbo.X) ad da olur.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT c.name, TYPE_NAME(c.system_type_id), c.max_length, c.precision, c.scale,
+               c.is_nullable, c.column_id, c.collation_name
+        FROM sys.columns c
+        WHERE c.object_id = OBJECT_ID(%s)
+    """, (table,))
+    schema = {}
+    for name, data_type, max_length, precision, scale, is_nullable, column_id, collation in cur.fetchall():
+        data_type = (data_type or "").lower()
+        if data_type in ("nchar", "nvarchar") and max_length > 0:
+            max_length //= 2
+        schema[name.lower()] = {
+            "name": name,
+            "data_type": data_type,
+            "max_length": max_length,
+            "precision": precision,
+            "scale": scale,
+            "is_nullable": bool(is_nullable),
+            "column_id": column_id,
+            "collation": collation
+        }
+    return schema
+
+def get_table_indexes(conn, table):
+    """
+    Tablodaki indekslerin anahtar kolonları: {indeks adı: [küçük harf kolon adları]}.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT i.name, c.name
+        FROM sys.indexes i
+        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE i.object_id = OBJECT_ID(%s) AND ic.key_ordinal > 0 AND i.is_hypothetical = 0
+        ORDER BY i.index_id, ic.key_ordinal
+    """, (table,))
+    indexes = {}
+    for index_name, column in cur.fetchall():
+        indexes.setdefault(index_name, []).append(column.lower())
+    return indexes
+
+def split_table_name(name):
+    """
+    "[dbo].[Tablo]" / "dbo.Tablo" / "Tablo" -> (şema veya None, tablo), küçük harfle.
+    """
+    parts = [p.strip().strip("[]").lower() for p in name.split(".")]
+    return (parts[-2] if len(parts) > 1 else None, parts[-1])
+
+def get_foreign_key_pairs(conn):
+    """
+    Veritabanındaki FK'ler: [((alt şema, alt tablo), (üst şema, üst tablo))]; kendine
+    referanslar hariç.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT OBJECT_SCHEMA_NAME(parent_object_id), OBJECT_NAME(parent_object_id),
+               OBJECT_SCHEMA_NAME(referenced_object_id), OBJECT_NAME(referenced_object_id)
+        FROM sys.foreign_keys WHERE parent_object_id <> referenced_object_id
+    """)
+    return [((cs.lower(), ct.lower()), (ps.lower(), pt.lower())) for cs, ct, ps, pt in cur.fetchall()]
+
+def get_schema_fingerprint(conn, tables):
+    """
+    Tabloların kolon tanımları ve FK'lerinden üretilen özet; tablo değiştirilince
+    (ALTER TABLE, yeniden oluşturma, yeni/silinen FK) değişir. Okunamazsa None.
+    """
+    if not tables:
+        return ""
+    ids = ",".join(["OBJECT_ID(%s)"] * len(tables))
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT
+                (SELECT CHECKSUM_AGG(CHECKSUM(object_id, name, system_type_id, max_length, precision,
+                                              scale, is_nullable, column_id, collation_name))
+                 FROM sys.columns WHERE object_id IN ({ids})),
+                (SELECT CHECKSUM_AGG(CHECKSUM(object_id, parent_object_id, referenced_object_id))
+                 FROM sys.foreign_keys WHERE parent_object_id IN ({ids}) OR referenced_object_id IN ({ids}))
+        """, tuple(tables) * 3)
+        columns, fks = cur.fetchone()
+    except Exception:
+        return None
+    return f"{columns}:{fks}"
+
+def find_covering_index(indexes, columns):
+    """
+    Baş kolonları verilen kolonların tamamı olan (sırası önemsiz) ilk indeksin adı.
+    """
+    wanted = {c.lower() for c in columns}
+    for index_name, index_cols in indexes.items():
+        if wanted and set(index_cols[:len(wanted)]) == wanted:
+            return index_name
+    return None
+
+def qualify_table(db_name, table):
+    """
+    Tablo adını çapraz veritabanı sorgusu için [db].şema.tablo biçimine getirir;
+    şema verilmemişse kullanıcının varsayılan şeması kullanılır ([db]..tablo).
+    """
+    parts = table.count(".")
+    if parts >= 2:
+        return table
+    if parts == 1:
+        return f"[{db_name}].{table}"
+    return f"[{db_name}]..{table}"
+
+def sql_literal(value):
+    return "N'" + str(value).replace("'", "''") + "'"
+
+# convert_type'ların sunucu tarafı karşılığı; dönüşemeyen değer NULL olur (Python yolu gibi)
+DATETIME_STYLES = (126, 121, 104, 103, 112, 111, 105)
+SERVER_CONVERT = {
+    "int": lambda expr: f"TRY_CAST({expr} AS BIGINT)",
+    "float": lambda expr: f"TRY_CAST({expr} AS FLOAT)",
+    "datetime": lambda expr: "COALESCE(" + ", ".join(
+        f"TRY_CONVERT(DATETIME2, {expr}, {style})" for style in DATETIME_STYLES
+    ) + ")"
+}
+
+def build_server_insert_sql(src_qualified, tgt_qualified, col_maps, filter_sql, escape_percent):
+    """
+    Eşleşmelerden tek bir INSERT ... SELECT ... WHERE NOT EXISTS cümlesi üretir.
+    Kaynakta tekrar eden anahtarlardan yalnızca biri eklenir. Anahtarı sabit değerden
+    gelen gruplar için None döner (sunucu tarafında karşılığı yok).
+    """
+    key_maps = [c for c in col_maps if c["is_key"]]
+    if any(c["fixed_value"] or not c["source_column"] for c in key_maps):
+        return None
+    exprs = []
+    for c in col_maps:
+        fv = c["fixed_value"]
+        if fv and fv.lower() == "guid":
+            expr = "NEWID()"
+        elif fv and fv.lower() == "null":
+            expr = "NULL"
+        elif fv:
+            expr = sql_literal(fv)
+            if escape_percent:
+                expr = expr.replace("%", "%%")
+        else:
+            expr = c["source_column"]
+        if c["convert_type"] in SERVER_CONVERT:
+            expr = SERVER_CONVERT[c["convert_type"]](expr)
+        exprs.append(expr)
+    aliases = [f"c{i}" for i in range(len(col_maps))]
+    select_sql = ", ".join(f"{e} AS {a}" for e, a in zip(exprs, aliases))
+    tgt_cols = ",".join(c["target_column"] for c in col_maps)
+    where_sql = f" WHERE {filter_sql}" if filter_sql else ""
+    if not key_maps:
+        return (f"INSERT INTO {tgt_qualified} ({tgt_cols}) "
+                f"SELECT {select_sql} FROM {src_qualified}{where_sql}")
+    key_idx = [col_maps.index(c) for c in key_maps]
+    partition = ", ".join(exprs[i] for i in key_idx)
+    match = " AND ".join(f"t.{col_maps[i]['target_column']} = s.{aliases[i]}" for i in key_idx)
+    return (
+        f"INSERT INTO {tgt_qualified} ({tgt_cols}) "
+        f"SELECT {', '.join(aliases)} FROM ("
+        f"SELECT {select_sql}, ROW_NUMBER() OVER (PARTITION BY {partition} ORDER BY (SELECT NULL)) AS rn "
+        f"FROM {src_qualified}{where_sql}) s "
+        f"WHERE s.rn = 1 AND NOT EXISTS (SELECT 1 FROM {tgt_qualified} t WHERE {match})"
+    )
+
+def measure_probe_ms(conn, table, key_names, samples=20):
+    """
+    Hedefteki örnek anahtarlarla tekrar kontrolü sorgusunun ortalama süresi (ms).
+    Tablo boşsa None döner.
+    """
+    cur = conn.cursor()
+    cur.execute(f"SELECT TOP {int(samples)} {','.join(key_names)} FROM {table}")
+    keys = cur.fetchall()
+    if not keys:
+        return None
+    sql = f"SELECT COUNT(*) FROM {table} WHERE " + " AND ".join(f"{k}=%s" for k in key_names)
+    started = time.perf_counter()
+    for key in keys:
+        cur.execute(sql, tuple(key))
+        cur.fetchall()
+    return (time.perf_counter() - started) * 1000 / len(keys)
+
+def get_column_types(conn, table):
+    """
+    Tablonun {kolon adı (küçük harf): veri tipi} sözlüğü.
+    """
+    return {name: col["data_type"] for name, col in get_table_schema(conn, table).items()}
+
+def merge_key_mode(src_type, tgt_type):
+    """
+    Anahtar kolonunun merge-join'de nasıl karşılaştırılacağı: "guid" (büyük harf metin),
+    "text" (metin) veya "" (doğal tip). GUID'in doğal sırası SQL Server'da bayt grubu
+    sırasıdır ve Python'daki UUID sırasından farklıdır; bu yüzden metin olarak sıralanır.
+    """
+    types = (src_type, tgt_type)
+    if "uniqueidentifier" in types:
+        return "guid"
+    if any(t in CHAR_TYPES for t in types):
+        return "text"
+    return ""
+
+def merge_order_expr(column, data_type, as_str):
+    """
+    Merge-join için ORDER BY ifadesi; metin anahtarlar NVARCHAR'a çevrilip BIN2 (UTF-16
+    kod birimi) sırasında. varchar doğrudan Latin1 BIN2'ye çevrilirse kod sayfası dışındaki
+    karakterler bozulur ve sıra bayt sırası olur, bu yüzden önce NVARCHAR'a çevrilir.
+    """
+    if not as_str:
+        return column
+    if data_type in ("nchar", "nvarchar"):
+        expr = column
+    else:
+        expr = f"CAST({column} AS NVARCHAR(4000))"
+    if as_str == "guid":
+        expr = f"UPPER({expr})"
+    return f"{expr} COLLATE Latin1_General_BIN2"
+
+def merge_key(values, as_str):
+    """
+    SQL Server ORDER BY sırasıyla uyumlu karşılaştırma anahtarı (NULL'lar önce).
+    as_str: kolon başına merge_key_mode sonucu.
+    """
+    key = []
+    for v, s in zip(values, as_str):
+        if v is None:
+            key.append((0, b""))
+        elif s:
+            # SQL Server karşılaştırmada sondaki boşlukları yok sayar; BIN2 UTF-16 kod birimlerini karşılaştırır
+            text = str(v).rstrip(" ")
+            if s == "guid":
+                text = text.strip().upper()
+            key.append((1, text.encode("utf-16-be")))
+        elif isinstance(v, datetime.date) and not isinstance(v, datetime.datetime):
+            key.append((1, datetime.datetime.combine(v, datetime.time())))
+        else:
+            key.append((1, v))
+    return tuple(key)
+
+class RowBatch:
+    """
+    Satırların kolon bazlı tutulduğu batch. Satır başına sözlük yerine her kolon
+    tek bir liste; kolon adı -> sıra eşlemesi batch başına bir kez kurulur.
+    """
+    __slots__ = ("names", "index", "columns", "size")
+
+    def __init__(self, names, columns, size):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.columns = columns
+        self.size = size
+
+    @classmethod
+    def from_rows(cls, names, rows):
+        if not rows:
+            return cls(names, [[] for _ in names], 0)
+        return cls(names, [list(col) for col in zip(*rows)], len(rows))
+
+    def rows(self):
+        return zip(*self.columns)
+
+    def without(self, drop):
+        """
+        drop kümesindeki satır sıraları çıkarılmış yeni batch.
+        """
+        return self.take([i for i in range(self.size) if i not in drop])
+
+    def take(self, keep):
+        """
+        Yalnızca keep'teki satır sıralarından oluşan yeni batch.
+        """
+        return RowBatch(self.names, [[col[i] for i in keep] for col in self.columns], len(keep))
+
+class ShardRouter:
+    """
+    Hedef satırlarını shard kolonlarına göre N hedef bağlantıdan birine yönlendirir.
+    hash: kolon değerlerinin normalize metninin CRC32'si mod N (çalıştırmalar ve
+    düğümler arasında kararlı); metin hedef collation'ına göre normalize edilir
+    (normalize_key_value), böylece hedefte eşit sayılan değerler aynı shard'a gider.
+    range: ilk kolon, N-1 artan üst sınırla karşılaştırılır; değer < sınır[i] ise
+    shard i, hiçbirinden küçük değilse son shard.
+    """
+    def __init__(self, method, columns, count, bounds=None):
+        self.method = method
+        self.columns = columns
+        self.count = count
+        self.bounds = bounds or []
+        self.typed_bounds = None
+
+    def split(self, batch, folds=None):
+        """
+        Batch'i shard sırasıyla N alt batch'e böler. folds: shard kolonu başına
+        (CI, AI); bkz. key_folds.
+        """
+        lower = {name.lower(): i for i, name in enumerate(batch.names)}
+        cols = [batch.columns[lower[c.lower()]] for c in self.columns]
+        folds = folds or [(False, False)] * len(self.columns)
+        buckets = [[] for _ in range(self.count)]
+        if self.method == "hash":
+            shard_of = lambda vals: self.hash_shard(vals, folds)
+        else:
+            shard_of = self.range_shard
+        for i, vals in enumerate(zip(*cols)):
+            buckets[shard_of(vals)].append(i)
+        return [batch.take(b) for b in buckets]
+
+    def hash_shard(self, vals, folds):
+        text = "\x1f".join(normalize_key_value(v, *f) for v, f in zip(vals, folds))
+        return zlib.crc32(text.encode("utf-8")) % self.count
+
+    def range_shard(self, vals):
+        value = vals[0]
+        if value is None:
+            return 0
+        if self.typed_bounds is None:
+            self.typed_bounds = [self.cast_bound(value, b) for b in self.bounds]
+        for i, bound in enumerate(self.typed_bounds):
+            if value < bound:
+                return i
+        return len(self.typed_bounds)
+
+    @staticmethod
+    def cast_bound(sample, text):
+        """
+        Sınır metnini kolon değerinin tipine çevirir (ilk satırdaki değerden öğrenilir).
+        """
+        if isinstance(sample, bool):
+            return text.strip().lower() in ("1", "true")
+        if isinstance(sample, int):
+            return int(text)
+        if isinstance(sample, float):
+            return float(text)
+        if isinstance(sample, decimal.Decimal):
+            return decimal.Decimal(text)
+        if isinstance(sample, datetime.datetime):
+            return datetime.datetime.fromisoformat(text)
+        if isinstance(sample, datetime.date):
+            return datetime.date.fromisoformat(text)
+        return str(text)
+
+class WriterThread(threading.Thread):
+    """
+    Hazırlanmış (next() ile başlatılmış) bir generator yazıcıyı kendi thread'inde
+    besler; böylece shard yazıcıları aynı anda commit edebilir. Kuyruk kısa tutulur
+    ki okuma en yavaş shard'ın çok önüne geçip belleği doldurmasın.
+    """
+    ABORT = object()
+
+    def __init__(self, writer, on_exit=None):
+        super().__init__(daemon=True)
+        self.writer = writer
+        self.on_exit = on_exit
+        self.queue = queue.Queue(maxsize=2)
+        self.error = None
+
+    def run(self):
+        try:
+            while True:
+                batch = self.queue.get()
+                if batch is WriterThread.ABORT:
+                    self.writer.close()
+                    return
+                if self.error is None:
+                    try:
+                        self.writer.send(batch)
+                    except StopIteration:
+                        pass
+                    except Exception as e:
+                        self.error = e
+                if batch is None:
+                    return
+        finally:
+            if self.on_exit:
+                self.on_exit()
+
+    def send(self, batch):
+        if self.error is not None:
+            raise self.error
+        self.queue.put(batch)
+
+    def finish(self):
+        self.queue.put(None)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def abort(self):
+        self.queue.put(WriterThread.ABORT)
+        self.join()
+
+def iter_batches(cursor, names, sizer=None, throttle=None):
+    """
+    Tuple satır döndüren imleçten fetchmany ile RowBatch'ler üretir. sizer verilirse
+    her okumanın boyutunu o belirler ve okunan satırlardan satır genişliğini öğrenir;
+    throttle verilirse okunan satır kadar token beklenir.
+    """
+    while True:
+        rows = cursor.fetchmany(sizer.next_size() if sizer else STREAM_FETCH_SIZE)
+        if not rows:
+            return
+        if sizer:
+            sizer.observe(rows)
+        if throttle:
+            throttle.acquire(len(rows))
+        yield RowBatch.from_rows(names, rows)
+
+# Şemadan satır genişliği tahmini için Python nesnesi boyutları (byte, yaklaşık)
+PY_CELL_BYTES = {
+    "tinyint": 28, "smallint": 28, "int": 28, "bigint": 32, "bit": 28,
+    "decimal": 104, "numeric": 104, "money": 104, "smallmoney": 104,
+    "float": 24, "real": 24, "date": 32, "datetime": 48, "datetime2": 48,
+    "smalldatetime": 48, "uniqueidentifier": 85
+}
+
+class BatchSizer:
+    """
+    Okuma/yazma batch boyutunu belirler. Üst sınır bellek bütçesinden (satır genişliği
+    önce hedef şemasından tahmin edilir, ilk okumadan sonra ölçülür), hedef ise commit
+    süresinden gelir: yavaş commit'te batch küçülür, hızlıda büyür.
+    """
+    def __init__(self, memory_budget_bytes, commit_seconds, estimated_row_bytes):
+        self.memory_budget = max(memory_budget_bytes, 1024 * 1024)
+        self.commit_seconds = max(commit_seconds, 0.1)
+        self.row_bytes = max(estimated_row_bytes, 64)
+        self.latency_rows = STREAM_FETCH_SIZE
+        self.measured = False
+        self.rows_read = 0
+
+    @staticmethod
+    def estimate_row_bytes(schema, col_names):
+        total = 0
+        for name in col_names:
+            col = (schema or {}).get((name or "").lower())
+            if col is None:
+                total += 64
+            elif col["data_type"] in CHAR_TYPES:
+                length = col["max_length"] if col["max_length"] and col["max_length"] > 0 else 4000
+                total += 49 + length
+            else:
+                total += PY_CELL_BYTES.get(col["data_type"], 64)
+        # kaynak tuple'ı + kolon listesi referansları
+        return total + 16 * len(col_names)
+
+    def memory_rows(self):
+        return int(self.memory_budget / self.row_bytes)
+
+    def next_size(self):
+        if not self.measured:
+            # Satır genişliği ölçülene kadar küçük bir deneme okuması
+            return max(1, min(BATCH_PROBE_ROWS, self.memory_rows()))
+        return max(BATCH_MIN_ROWS, min(BATCH_MAX_ROWS, self.memory_rows(), int(self.latency_rows)))
+
+    def observe(self, rows):
+        self.rows_read += len(rows)
+        sample = rows[:50]
+        if not sample:
+            return
+        size = sum(sys.getsizeof(v) + 8 for r in sample for v in r) / len(sample) + 64
+        self.row_bytes = size if not self.measured else 0.8 * self.row_bytes + 0.2 * size
+        self.measured = True
+
+    def record_commit(self, rows, seconds):
+        if rows <= 0:
+            return
+        if seconds > self.commit_seconds * 1.5:
+            self.latency_rows = max(BATCH_MIN_ROWS, self.latency_rows / 2)
+        elif seconds < self.commit_seconds / 2:
+            self.latency_rows = min(BATCH_MAX_ROWS, self.latency_rows * 1.5)
+
+class TokenBucket:
+    """
+    Saniyede rate token dolan kova; acquire(n) token yetmezse eksik kadar uyur.
+    rate 0/None ise sınırsızdır. Thread'ler arasında paylaşılabilir: token'lar kilit
+    altında ayrılır, bekleme kilit dışında yapılır.
+    """
+    def __init__(self, rate=None, burst_seconds=1.0):
+        self.burst_seconds = burst_seconds
+        self.lock = threading.Lock()
+        self.rate = None
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        with self.lock:
+            if rate != self.rate:
+                self.rate = rate
+                self.tokens = min(self.tokens, (rate or 0) * self.burst_seconds)
+
+    def acquire(self, n):
+        with self.lock:
+            rate = self.rate
+            if not rate:
+                return
+            now = time.monotonic()
+            self.tokens = min(rate * self.burst_seconds, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            self.tokens -= n
+            wait = -self.tokens / rate
+        if wait > 0:
+            time.sleep(wait)
+
+def in_time_window(start_time, end_time, now):
+    """
+    "SS:DD" penceresi; boş uç gün başı/sonu sayılır, başlangıç > bitiş ise gece yarısını aşar.
+    """
+    t = now.strftime("%H:%M")
+    start = (start_time or "").strip() or "00:00"
+    end = (end_time or "").strip() or "24:00"
+    if start <= end:
+        return start <= t < end
+    return t >= start or t < end
+
+class SourceThrottle:
+    """
+    İşe ve kaynak sunucuya tanımlı limitlerden o anki zaman penceresine uyanları uygular.
+    Aynı kapsamda birden fazla limit uyarsa en düşüğü geçerlidir. readers, kapsam başına
+    ("job"/"server") aynı limitle paralel okuyan ve kendi throttle'ını kullanan okuyucu
+    sayısıdır (ör. çalışan işlemler); satır hızı aralarında bölünür.
+    """
+    def __init__(self, load_limits, refresh_seconds=LIMIT_REFRESH_SECONDS, readers=None):
+        self.load_limits = load_limits
+        self.refresh_seconds = refresh_seconds
+        self.readers = readers or {}
+        self.limits = []
+        self.bucket = TokenBucket()
+        self.refresh()
+
+    def refresh(self):
+        try:
+            self.limits = self.load_limits()
+        except Exception as e:
+            # Kontrol DB'ye erişilemezse önceki limitlerle devam edilir
+            print("Kaynak limitleri okunamadı:", e)
+        self.loaded_at = time.monotonic()
+        self.bucket.set_rate(self.current()["rows_per_sec"])
+
+    def current(self, now=None):
+        """
+        {"rows_per_sec", "job_concurrent", "server_concurrent"}; None = sınırsız.
+        """
+        now = now or datetime.datetime.now()
+        result = {"rows_per_sec": None, "job_concurrent": None, "server_concurrent": None}
+        for l in self.limits:
+            if not in_time_window(l["start_time"], l["end_time"], now):
+                continue
+            scope = "job" if l["job_id"] is not None else "server"
+            rate = l["max_rows_per_sec"]
+            if rate and rate > 0:
+                rate = rate / max(self.readers.get(scope, 1), 1)
+            for key, value in (("rows_per_sec", rate), (f"{scope}_concurrent", l["max_concurrent"])):
+                if value and value > 0 and (result[key] is None or value < result[key]):
+                    result[key] = value
+        return result
+
+    def acquire(self, rows):
+        if time.monotonic() - self.loaded_at > self.refresh_seconds:
+            self.refresh()
+        self.bucket.acquire(rows)
+
+def get_source_columns(col_maps):
+    """
+    Grubun SELECT listesi; aynı kaynak kolon birden fazla eşleşmede olsa da bir kez okunur.
+    """
+    return list(dict.fromkeys(c["source_column"] for c in col_maps if c["source_column"]))
+
+def parse_dmy(text, sep):
+    """
+    gg.aa.yyyy / gg/aa/yyyy için strptime'dan çok daha hızlı sabit genişlikli ayrıştırıcı.
+    """
+    if len(text) != 10 or text[2] != sep or text[5] != sep:
+        raise ValueError(text)
+    return datetime.datetime(int(text[6:10]), int(text[3:5]), int(text[0:2]))
+
+# datetime convert_type için sırayla denenen formatlar (ilk tutan kolon için öğrenilir)
+DATE_FORMATS = [
+    "%Y-%m-%d", "%d.%m.%Y %H:%M:%S", "%d.%m.%Y %H:%M", "%d/%m/%Y %H:%M:%S",
+    "%Y%m%d", "%Y/%m/%d", "%d-%m-%Y", "%b %d %Y %I:%M%p"
+]
+DATE_PARSERS = [
+    datetime.datetime.fromisoformat,
+    lambda text: parse_dmy(text, "."),
+    lambda text: parse_dmy(text, "/"),
+] + [(lambda text, fmt=fmt: datetime.datetime.strptime(text, fmt)) for fmt in DATE_FORMATS]
+
+class ColumnConverter:
+    """
+    Bir eşleşme kolonunun dönüşümü. Önce kullanıcının seçtiği convert_type, ardından
+    hedef kolonun şemasına (tip, uzunluk, hassasiyet, NULL olabilirlik) göre uygunlaştırma
+    uygulanır. Batch'in tüm kolonu tek seferde dönüştürülür; tarih kolonunda tutan
+    format öğrenilip sonraki değerlerde önce o denenir.
+
+    convert_type'a dönüşemeyen değerler None yazılır (failures); hedef kolona hiç
+    yazılamayacak satırlar ise invalid kümesine eklenip gönderilmeden elenir (rejected).
+    """
+    __slots__ = ("target_column", "convert_type", "schema", "truncate", "date_parser",
+                 "failures", "rejected", "truncated", "reject_reason", "schema_stage")
+
+    def __init__(self, target_column, convert_type, schema=None, truncate=False):
+        self.target_column = target_column
+        self.convert_type = convert_type
+        self.schema = schema
+        self.truncate = truncate
+        self.date_parser = None
+        self.failures = 0
+        self.rejected = 0
+        self.truncated = 0
+        self.reject_reason = ""
+        self.schema_stage = self.pick_schema_stage()
+
+    def reset_counters(self):
+        # Önbellekteki planla yeniden çalışırken; öğrenilen tarih formatı korunur
+        self.failures = 0
+        self.rejected = 0
+        self.truncated = 0
+        self.reject_reason = ""
+
+    def convert(self, values, invalid):
+        if self.convert_type == "datetime":
+            values = self.convert_datetime(values)
+        elif self.convert_type == "int":
+            values = self.convert_number(values, int)
+        elif self.convert_type == "float":
+            values = self.convert_number(values, float)
+        if self.schema_stage is not None:
+            values = self.schema_stage(values, invalid)
+        if self.schema is not None and not self.schema["is_nullable"]:
+            for i, v in enumerate(values):
+                if v is None:
+                    self.reject(i, invalid, "NOT NULL kolona NULL")
+        return values
+
+    def reject(self, i, invalid, reason):
+        if i not in invalid:
+            invalid.add(i)
+            self.rejected += 1
+            if not self.reject_reason:
+                self.reject_reason = reason
+
+    def convert_number(self, values, cast):
+        try:
+            return [None if v is None else cast(v) for v in values]
+        except (TypeError, ValueError):
+            pass
+        result = []
+        for v in values:
+            if v is not None:
+                try:
+                    v = cast(v)
+                except (TypeError, ValueError):
+                    self.failures += 1
+                    v = None
+            result.append(v)
+        return result
+
+    def convert_datetime(self, values):
+        parser = self.date_parser
+        if parser is not None:
+            try:
+                return [parser(v) if isinstance(v, str) else v for v in values]
+            except ValueError:
+                pass
+        result = []
+        for v in values:
+            if isinstance(v, str):
+                v = self.parse_datetime(v)
+            result.append(v)
+        return result
+
+    def parse_datetime(self, text):
+        text = text.strip()
+        if not text:
+            return None
+        val = self.match_datetime(text)
+        if val is None:
+            self.failures += 1
+        return val
+
+    def match_datetime(self, text):
+        if self.date_parser is not None:
+            try:
+                return self.date_parser(text)
+            except ValueError:
+                pass
+        for parser in DATE_PARSERS:
+            try:
+                val = parser(text)
+            except ValueError:
+                continue
+            self.date_parser = parser
+            return val
+        return None
+
+    # --- Hedef şemasına göre uygunlaştırma ---------------------------------
+
+    def pick_schema_stage(self):
+        if self.schema is None:
+            return None
+        t = self.schema["data_type"]
+        if t in CHAR_TYPES:
+            return self.coerce_string
+        if t in INT_RANGES:
+            return self.coerce_int
+        if t in ("decimal", "numeric", "money", "smallmoney"):
+            return self.coerce_decimal
+        if t in ("float", "real"):
+            return self.coerce_float
+        if t == "bit":
+            return self.coerce_bit
+        if t in DATETIME_RANGES:
+            return self.coerce_datetime
+        if t == "uniqueidentifier":
+            return self.coerce_uuid
+        return None
+
+    def coerce_string(self, values, invalid):
+        limit = self.schema["max_length"]
+        if limit is None or limit < 0:
+            return values
+        result = []
+        for i, v in enumerate(values):
+            if isinstance(v, str) and len(v) > limit:
+                if self.truncate:
+                    v = v[:limit]
+                    self.truncated += 1
+                else:
+                    self.reject(i, invalid, f"{limit} karakter sınırı aşıldı")
+            result.append(v)
+        return result
+
+    def coerce_int(self, values, invalid):
+        low, high = INT_RANGES[self.schema["data_type"]]
+        result = []
+        for i, v in enumerate(values):
+            if v is not None:
+                try:
+                    v = int(v.strip()) if isinstance(v, str) else int(v)
+                except (TypeError, ValueError, OverflowError):
+                    self.reject(i, invalid, f"{self.schema['data_type']} değil: {v!r}")
+                else:
+                    if not low <= v <= high:
+                        self.reject(i, invalid, f"{self.schema['data_type']} aralığı dışında: {v}")
+            result.append(v)
+        return result
+
+    def coerce_decimal(self, values, invalid):
+        precision, scale = self.schema["precision"], self.schema["scale"]
+        quantum = decimal.Decimal(1).scaleb(-scale)
+        limit = decimal.Decimal(10) ** (precision - scale)
+        result = []
+        for i, v in enumerate(values):
+            if v is not None:
+                try:
+                    d = v if isinstance(v, decimal.Decimal) else decimal.Decimal(str(v).strip())
+                except (decimal.InvalidOperation, ValueError):
+                    d = None
+                if d is None or not d.is_finite():
+                    self.reject(i, invalid, f"sayı değil: {v!r}")
+                else:
+                    # Varsayılan 28 basamaklı context geçerli decimal(38,s) değerlerinde hata verirdi
+                    try:
+                        with decimal.localcontext(DECIMAL_CONTEXT):
+                            q = d.quantize(quantum, rounding=decimal.ROUND_HALF_UP)
+                    except decimal.InvalidOperation:
+                        q = None
+                    if q is None or abs(q) >= limit:
+                        self.reject(i, invalid, f"decimal({precision},{scale}) taşması: {d}")
+                    else:
+                        v = q
+            result.append(v)
+        return result
+
+    def coerce_float(self, values, invalid):
+        result = []
+        for i, v in enumerate(values):
+            if v is not None and not isinstance(v, float):
+                try:
+                    v = float(v.strip()) if isinstance(v, str) else float(v)
+                except (TypeError, ValueError):
+                    self.reject(i, invalid, f"sayı değil: {v!r}")
+            result.append(v)
+        return result
+
+    def coerce_bit(self, values, invalid):
+        result = []
+        for i, v in enumerate(values):
+            if v is not None:
+                key = v.strip().lower() if isinstance(v, str) else v
+                if key in BIT_VALUES:
+                    v = BIT_VALUES[key]
+                elif isinstance(v, (int, float, decimal.Decimal)):
+                    v = 1 if v else 0
+                else:
+                    self.reject(i, invalid, f"bit değil: {v!r}")
+            result.append(v)
+        return result
+
+    def coerce_datetime(self, values, invalid):
+        t = self.schema["data_type"]
+        low, high = DATETIME_RANGES[t]
+        result = []
+        for i, v in enumerate(values):
+            if isinstance(v, str):
+                text = v.strip()
+                parsed = self.match_datetime(text) if text else None
+                if parsed is None and text:
+                    self.reject(i, invalid, f"tarih değil: {v!r}")
+                v = parsed
+            if isinstance(v, datetime.date):
+                if not isinstance(v, datetime.datetime):
+                    v = datetime.datetime.combine(v, datetime.time())
+                if not low <= v <= high:
+                    self.reject(i, invalid, f"{t} aralığı dışında: {v}")
+                elif t == "date":
+                    v = v.date()
+            result.append(v)
+        return result
+
+    def coerce_uuid(self, values, invalid):
+        result = []
+        for i, v in enumerate(values):
+            if v is not None and not isinstance(v, uuid.UUID):
+                try:
+                    v = str(uuid.UUID(str(v).strip()))
+                except ValueError:
+                    self.reject(i, invalid, f"GUID değil: {v!r}")
+            result.append(v)
+        return result
+
+def make_converters(col_maps, schema=None, truncate=False):
+    """
+    Eşleşme satırlarıyla aynı sırada ColumnConverter listesi. Hedef şeması verilirse
+    convert_type seçilmemiş kolonlar da şemaya göre dönüştürülür; gereği yoksa None.
+    """
+    converters = []
+    for cm in col_maps:
+        col_schema = schema.get((cm["target_column"] or "").lower()) if schema else None
+        if cm["convert_type"] or col_schema is not None:
+            converters.append(ColumnConverter(cm["target_column"], cm["convert_type"], col_schema, truncate))
+        else:
+            converters.append(None)
+    return converters
+
+def iter_stream(cursor, size=STREAM_FETCH_SIZE):
+    """
+    fetchall yerine parça parça okuyarak satırları sırayla döndürür.
+    """
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        for r in rows:
+            yield r
+
+def get_table_row_count(conn, table):
+    """
+    Tablonun yaklaşık satır sayısı (COUNT(*) yapmadan, bölüm istatistiklerinden).
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT SUM(row_count) FROM sys.dm_db_partition_stats
+            WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)
+        """, (table,))
+    except Exception:
+        # VIEW DATABASE STATE yetkisi yoksa sys.partitions yeterli
+        cur.execute("""
+            SELECT SUM(rows) FROM sys.partitions
+            WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)
+        """, (table,))
+    row = cur.fetchone()
+    return int(row[0]) if row and row[0] is not None else 0
+
+def get_table_change_state(conn, table):
+    """
+    Tablo değişti mi anlamak için ucuz özet: satır sayısı ve son kullanıcı yazmasının
+    zamanı (sys.dm_db_index_usage_stats; sunucu yeniden başlayınca sıfırlanır, özet de
+    değişmiş görünür). Yazma zamanı okunamazsa yalnızca satır sayısı; hiç okunamazsa None.
+    """
+    try:
+        rows = get_table_row_count(conn, table)
+    except Exception:
+        return None
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT MAX(last_user_update) FROM sys.dm_db_index_usage_stats
+            WHERE database_id = DB_ID() AND object_id = OBJECT_ID(%s)
+        """, (table,))
+        row = cur.fetchone()
+        updated = row[0].isoformat() if row and row[0] is not None else ""
+    except Exception:
+        # VIEW SERVER STATE yetkisi yok
+        updated = "?"
+    return f"{rows}:{updated}"
+
+###############################################################################
+# DİSK TABANLI ANAHTAR İNDEKSİ
+###############################################################################
+class DiskKeyIndex:
+    """
+    Hedef tablonun anahtarlarını yerel bir SQLite dosyasında tutar. Önündeki Bloom
+    filtresi (mmap ile açılan dosya) hedefte olmayan anahtarların çoğunu diske
+    inmeden eler; bellek kullanımı Bloom boyutuyla sınırlıdır.
+
+    İndeks hedefin bir anlık görüntüsüdür: yanında hedefin değişim özeti
+    (get_table_change_state) saklanır ve özet değişmişse yeniden oluşturulur. İsabet
+    yine de yalnızca "belki var" demektir; çağıran hedefte doğrular.
+    """
+    BLOOM_FP_RATE = 0.01
+    BUILD_CHUNK = 10000
+
+    def __init__(self, base_path, key_names, key_folds=None):
+        self.db_path = base_path + ".sqlite"
+        self.bloom_path = base_path + ".bloom"
+        self.key_names = list(key_names)
+        # Hedef collation'ı gibi karşılaştırmak için kolon başına (CI, AI); bkz. key_folds
+        self.key_folds = list(key_folds) if key_folds else [(False, False)] * len(self.key_names)
+        self.db = None
+        self.bloom = None
+        self.bloom_file = None
+        self.m = 0
+        self.k = 0
+        self.pending = 0
+        # Açılıştaki hedef satır sayısı; kapanışta hedefe başkasının yazıp yazmadığını anlamak için
+        self.base_rows = None
+
+    def encode_key(self, values):
+        return "\x1f".join(normalize_key(values, self.key_folds))
+
+    def folds_text(self):
+        return ",".join(f"{int(ci)}{int(ai)}" for ci, ai in self.key_folds)
+
+    def bloom_positions(self, encoded):
+        digest = hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def is_valid(self, table, max_age_hours, state=None):
+        if not (os.path.exists(self.db_path) and os.path.exists(self.bloom_path)):
+            return False
+        try:
+            db = sqlite3.connect(self.db_path)
+            meta = dict(db.execute("SELECT name, value FROM meta").fetchall())
+            db.close()
+        except sqlite3.Error:
+            return False
+        if meta.get("table") != table or meta.get("key_names") != ",".join(self.key_names):
+            return False
+        if meta.get("key_folds") != self.folds_text():
+            # Farklı normalizasyonla (ör. eski sürüm) oluşturulmuş
+            return False
+        if state is not None and meta.get("target_state") != state:
+            # Hedefe indeks dışından yazılmış (başka uygulama, full_sync/upsert silmeleri vb.)
+            return False
+        age = datetime.datetime.now() - datetime.datetime.fromisoformat(meta.get("built_at"))
+        return age.total_seconds() < max_age_hours * 3600
+
+    def build(self, conn, table, expected_rows, bloom_max_bytes, state=None):
+        """
+        Hedefteki anahtarları akış halinde okuyup indeksi sıfırdan oluşturur; conn
+        verilmezse boş indeks oluşturulur. state, okumadan önce alınan hedef değişim
+        özetidir. Yarım kalan oluşturma geçerli indeksin yerine geçmesin diye .tmp
+        dosyalarına yazılır.
+        """
+        n = max(int(expected_rows * 1.2), 100000)
+        m = int(-n * math.log(self.BLOOM_FP_RATE) / (math.log(2) ** 2))
+        m = max(8 * 65536, min(m, bloom_max_bytes * 8))
+        m -= m % 8
+        self.m = m
+        self.k = max(1, min(16, round(m / n * math.log(2))))
+
+        tmp_db, tmp_bloom = self.db_path + ".tmp", self.bloom_path + ".tmp"
+        for f in (tmp_db, tmp_bloom):
+            if os.path.exists(f):
+                os.remove(f)
+        bits = bytearray(m // 8)
+        db = sqlite3.connect(tmp_db)
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("CREATE TABLE keys (k TEXT PRIMARY KEY) WITHOUT ROWID")
+        db.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+
+        cur = None
+        if conn is not None:
+            cur = conn.cursor()
+            cur.execute(f"SELECT {','.join(self.key_names)} FROM {table}")
+        while cur is not None:
+            rows = cur.fetchmany(self.BUILD_CHUNK)
+            if not rows:
+                break
+            chunk = []
+            for r in rows:
+                encoded = self.encode_key(r)
+                chunk.append((encoded,))
+                for pos in self.bloom_positions(encoded):
+                    bits[pos >> 3] |= 1 << (pos & 7)
+            db.executemany("INSERT OR IGNORE INTO keys (k) VALUES (?)", chunk)
+        db.executemany("INSERT INTO meta (name, value) VALUES (?, ?)", [
+            ("table", table),
+            ("key_names", ",".join(self.key_names)),
+            ("key_folds", self.folds_text()),
+            ("target_state", state or ""),
+            ("built_at", datetime.datetime.now().isoformat()),
+            ("bloom_m", str(self.m)),
+            ("bloom_k", str(self.k)),
+        ])
+        db.commit()
+        db.close()
+        with open(tmp_bloom, "wb") as f:
+            f.write(bits)
+        os.replace(tmp_db, self.db_path)
+        os.replace(tmp_bloom, self.bloom_path)
+
+    def open(self):
+        self.db = sqlite3.connect(self.db_path, timeout=60)
+        meta = dict(self.db.execute("SELECT name, value FROM meta").fetchall())
+        self.m = int(meta["bloom_m"])
+        self.k = int(meta["bloom_k"])
+        self.bloom_file = open(self.bloom_path, "r+b")
+        self.bloom = mmap.mmap(self.bloom_file.fileno(), self.m // 8)
+
+    def contains(self, key_values):
+        encoded = self.encode_key(key_values)
+        for pos in self.bloom_positions(encoded):
+            if not self.bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return self.db.execute("SELECT 1 FROM keys WHERE k=?", (encoded,)).fetchone() is not None
+
+    def add(self, key_values):
+        encoded = self.encode_key(key_values)
+        for pos in self.bloom_positions(encoded):
+            self.bloom[pos >> 3] |= 1 << (pos & 7)
+        self.db.execute("INSERT OR IGNORE INTO keys (k) VALUES (?)", (encoded,))
+        self.pending += 1
+        if self.pending >= self.BUILD_CHUNK:
+            self.db.commit()
+            self.pending = 0
+
+    def set_state(self, state):
+        """
+        Kendi eklemelerimizden sonraki hedef özetini kaydeder; okunamadıysa (None)
+        özet boşaltılır ve sonraki açılışta indeks yeniden oluşturulur.
+        """
+        self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('target_state', ?)", (state or "-",))
+
+    def close(self):
+        if self.db:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+        if self.bloom is not None:
+            self.bloom.flush()
+            self.bloom.close()
+            self.bloom = None
+        if self.bloom_file:
+            self.bloom_file.close()
+            self.bloom_file = None
+
+    def remove(self):
+        # Hedefe indeks dışından yazıldığında; sonraki kullanımda yeniden oluşturulur
+        self.close()
+        for path in (self.db_path, self.bloom_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+###############################################################################
+# DERLENMİŞ İŞ PLANI
+###############################################################################
+class JobPlan:
+    """
+    Bir işin çalıştırmalar arasında değişmeyen kısmı: gruplanmış eşleşmeler, tarama
+    görevleri, üretilmiş SQL'ler ve dönüştürücüler. plan_version, uzun metin politikası
+    ve hedef tabloların şema özeti (fingerprint) aynı kaldıkça DatabaseManager.plan_cache'ten
+    tekrar kullanılır.
+
+    tasks: tanımlanma sırasıyla
+      {"kind": "full_sync", "src_table", "tgt_table", "col_maps", "filter", "suspend", "delete_first"}
+      {"kind": "scan", "src_table", "filter", "columns", "select_sql", "targets": [hedef, ...]}
+      delete_first: full_sync görevi FK ile başka bir full_sync görevine bağlıysa silmeleri
+      ayrı bir aşamada, dalgalardan önce ters dalga sırasıyla (önce alt tablolar) yapılır
+    waves: hedef FK'lerine göre görev sırası dalgaları [[görev sırası, ...], ...]; bir
+      dalga ancak öncekiler (üst tablolar) bitince başlar, dalga içi eşzamanlı olabilir
+    deps: görev başına üst tablolarına yazan görevlerin sıraları [{görev sırası, ...}, ...]
+    """
+    def __init__(self, version, truncate, tasks, waves=None, deps=None):
+        self.version = version
+        self.truncate = truncate
+        self.tasks = tasks
+        self.waves = waves if waves is not None else [[i] for i in range(len(tasks))]
+        self.deps = deps if deps is not None else [set() for _ in tasks]
+        self.fingerprint = None
+
+    def target_tables(self):
+        tables = []
+        for task in self.tasks:
+            names = [task["tgt_table"]] if task["kind"] == "full_sync" else [t["table"] for t in task["targets"]]
+            for name in names:
+                if name not in tables:
+                    tables.append(name)
+        return tables
+
+    def ordered_indexes(self):
+        return [i for wave in self.waves for i in wave]
+
+    def children(self, i):
+        return [j for j, parents in enumerate(self.deps) if i in parents]
+
+    def is_valid(self, version, truncate):
+        return self.version == version and self.truncate == truncate
+
+    def copy(self):
+        """
+        Aynı anda birden fazla kaynakta çalıştırmak için bağımsız kopya; dönüştürücülerin
+        sayaçları ve öğrenilmiş tarih formatları paylaşılmaz.
+        """
+        plan = JobPlan(self.version, self.truncate, copy.deepcopy(self.tasks), copy.deepcopy(self.waves),
+                       copy.deepcopy(self.deps))
+        plan.fingerprint = self.fingerprint
+        plan.reset()
+        return plan
+
+    def reset(self):
+        for task in self.tasks:
+            for target in task.get("targets", []):
+                for conv in target["converters"]:
+                    if conv is not None:
+                        conv.reset_counters()
+
+    @staticmethod
+    def compile_target(tgt_table, col_maps, sync_mode, schema, truncate):
+        """
+        Hedef tablo yazıcısının ihtiyaç duyduğu SQL'ler ve dönüştürücüler.
+        """
+        col_names = [c["target_column"] for c in col_maps]
+        key_cols = [c for c in col_maps if c["is_key"]]
+        key_names = [c["target_column"] for c in key_cols]
+        # GUID sabitleri her satırda yeniden üretildiği için sadece insert'te yazılır
+        compare_names = [
+            c["target_column"] for c in col_maps
+            if not c["is_key"] and (c["fixed_value"] or "").lower() != "guid"
+        ]
+        placeholders = ",".join(["%s"] * len(col_names))
+        return {
+            "table": tgt_table,
+            "col_maps": col_maps,
+            "sync_mode": sync_mode,
+            "suspend": any(c.get("suspend_constraints") for c in col_maps),
+            "col_names": col_names,
+            "key_cols": key_cols,
+            "key_names": key_names,
+            "key_folds": key_folds(schema, key_names),
+            # Shard yönlendirmesi kolonları hedef collation'ı gibi karşılaştırır (bkz. ShardRouter)
+            "col_folds": key_folds(schema, col_names),
+            "compare_names": compare_names,
+            "compare_cols": hash_columns(schema, compare_names),
+            "converters": make_converters(col_maps, schema, truncate),
+            "row_bytes": BatchSizer.estimate_row_bytes(schema, col_names),
+            "insert_sql": f"INSERT INTO {tgt_table} ({','.join(col_names)}) VALUES ({placeholders})",
+            "bulk_insert_sql": f"INSERT INTO {tgt_table} WITH (TABLOCK) ({','.join(col_names)}) VALUES ({placeholders})",
+            "column_ids": [schema[n.lower()]["column_id"] for n in col_names]
+                          if schema and all(n.lower() in schema for n in col_names) else None,
+            "exists_sql": (
+                f"SELECT COUNT(*) FROM {tgt_table} WHERE "
+                + " AND ".join(f"{k}=%s" for k in key_names)
+            ) if key_names else None,
+            "update_sql": (
+                f"UPDATE {tgt_table} SET {', '.join(f'{c}=%s' for c in compare_names)} WHERE "
+                + " AND ".join(f"{k}=%s" for k in key_names)
+            ) if key_names and compare_names else None
+        }
+
+###############################################################################
+# AKTARIM İŞİ (RUNNER)
+###############################################################################
+class TransferJobRunner:
+    """
+    Tek bir aktarım işini çalıştırır.
+    """
+    def __init__(self, db_manager: DatabaseManager, job_id):
+        self.db_manager = db_manager
+        self.job_id = job_id
+        self.retry_policy = None
+        # Kuyruktan çalıştırılıyorsa LeaseHeartbeat; kiralama kaybedilirse iş durur
+        self.lease = None
+        # (kaynak, hedef, mod, satır, süre); çok işlemli modda ana işleme raporlanır
+        self.task_stats = []
+        # Kaynağa limit tanımlıysa SourceThrottle; okuma döngüsünde satır hızı sınırlanır
+        self.throttle = None
+        # Hatalı/atlanan grup sayısı; sıfır değilse last_run_date ilerletilmez
+        self.failed_groups = 0
+        # Disk anahtar indeksi dosya öneki; shard'da shard başına ayrılır
+        self.key_index_name = f"job{job_id}"
+        # Çoklu kaynakta kapatılır: kaynak başına indeks diğer kaynakların eklemelerini görmez
+        self.use_key_index = True
+        # Shard'lı hedefte (ShardRouter, [(conn_id, ManagedConnection), ...])
+        self.shards = None
+
+    def run(self):
+        job_info = self.get_job_info()
+        if not job_info:
+            return
+        if not self.check_triggers(self.job_id):
+            self.db_manager.log_message(self.job_id, "Tetikleyici koşulu sağlanmadığı için aktarım başlatılmadı.")
+            return
+        if (job_info.get("source_conn_ids") or "").strip():
+            self.run_sources(job_info)
+            return
+
+        self.route_source(job_info)
+        try:
+            source_conn = ManagedConnection(lambda: self.open_connection(job_info, "source"))
+            # Watermark ilk taramadan önce alınır; çalışma sırasında değişen satırlar sonraki çalışmada okunur
+            run_started = self.get_watermark_time(source_conn, job_info)
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Kaynak DB bağlantı hatası: {str(e)}")
+            self.send_error_mail(f"Kaynak DB bağlantı hatası: {str(e)}")
+            return
+
+        try:
+            target_conn = ManagedConnection(lambda: self.open_connection(job_info, "target"), job_info)
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Hedef DB bağlantı hatası: {str(e)}")
+            self.send_error_mail(f"Hedef DB bağlantı hatası: {str(e)}")
+            return
+
+        plan = self.get_plan(job_info, target_conn)
+        filter_context = self.get_filter_context(job_info)
+        same_instance = self.is_same_instance(source_conn, target_conn)
+        self.throttle = self.make_throttle(job_info)
+        # Önceki çalışma yarıda kaldıysa askıda kalan indeks/FK'ler önce geri açılır
+        self.restore_target_objects(target_conn, self.db_manager.get_suspended_objects(
+            self.job_id, job_info["target_server"], job_info["target_db"]
+        ))
+
+        try:
+            self.shards = self.open_shards(job_info)
+            self.restore_shard_objects()
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Shard hedeflerine bağlanılamadı: {str(e)}")
+            self.send_error_mail(f"Shard hedeflerine bağlanılamadı: {str(e)}")
+            source_conn.close()
+            target_conn.close()
+            return
+        workers = self.get_worker_processes()
+        try:
+            self.run_delete_phase(job_info, source_conn, target_conn, plan, filter_context, same_instance)
+            # Dalgalar sırayla; bir dalga üst tablolarına yazan dalga bitip commit ettikten sonra başlar
+            failed_tasks = set()
+            for wave in plan.waves:
+                if self.lease is not None and self.lease.lost:
+                    self.db_manager.log_message(self.job_id, "Kuyruk kiralaması başka bir düğüme geçti, aktarım durduruldu.")
+                    source_conn.close()
+                    target_conn.close()
+                    return
+                wave = self.skip_failed_children(plan, wave, failed_tasks)
+                if not wave:
+                    continue
+                tasks = [plan.tasks[i] for i in wave]
+                chains = [[wave[i] for i in c] for c in self.chain_tasks(tasks)] if workers > 1 else []
+                if len(chains) > 1:
+                    failed_tasks |= self.run_in_processes(plan, chains, workers)
+                else:
+                    failed = self.run_wave(job_info, source_conn, target_conn, tasks, filter_context, same_instance)
+                    failed_tasks |= {wave[i] for i in failed}
+        finally:
+            self.close_shards()
+        source_conn.close()
+        target_conn.close()
+        if self.failed_groups:
+            self.db_manager.log_message(
+                self.job_id,
+                f"Aktarım {self.failed_groups} hatalı grupla tamamlandı; last_run_date ilerletilmedi, "
+                f"satırlar sonraki çalışmada tekrar okunacak."
+            )
+            return
+        self.update_job_last_run_date(self.job_id, run_started)
+        self.db_manager.log_message(self.job_id, "Aktarım tamamlandı.")
+
+    def get_job_sources(self, job_info):
+        """
+        Çoklu kaynak işinde source_conn_ids'teki kayıtlı bağlantılar (bulunamayanlar loglanır).
+        """
+        sources = []
+        for part in (job_info.get("source_conn_ids") or "").split(","):
+            part = part.strip()
+            if not part.isdigit():
+                continue
+            saved = self.db_manager.get_saved_connection(int(part))
+            if saved:
+                sources.append(saved)
+            else:
+                self.db_manager.log_message(self.job_id, f"Kaynak bağlantı ID={part} bulunamadı, atlandı.")
+        return sources
+
+    def run_sources(self, job_info):
+        """
+        Aynı şemadaki birden fazla kaynağı (ör. şube DB'leri) tek hedefe paralel aktarır.
+        Plan bir kez derlenir, her kaynak kendi kopyasıyla, kendi bağlantılarıyla ve
+        kendi watermark'ıyla ({last_run_date}) ayrı bir thread'de çalışır.
+        """
+        sources = self.get_job_sources(job_info)
+        if not sources:
+            self.db_manager.log_message(self.job_id, "Çoklu kaynak işi için geçerli kaynak bağlantısı yok.")
+            return
+        try:
+            target_conn = ManagedConnection(lambda: self.open_connection(job_info, "target"), job_info)
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Hedef DB bağlantı hatası: {str(e)}")
+            self.send_error_mail(f"Hedef DB bağlantı hatası: {str(e)}")
+            return
+        try:
+            parallel = max(int(self.db_manager.get_setting("source_parallelism") or "4"), 1)
+        except ValueError:
+            parallel = 4
+        failed, starts = 0, []
+        try:
+            plan = self.get_plan(job_info, target_conn)
+            self.restore_target_objects(target_conn, self.db_manager.get_suspended_objects(
+                self.job_id, job_info["target_server"], job_info["target_db"]
+            ))
+            try:
+                self.shards = self.open_shards(job_info)
+                self.restore_shard_objects()
+            except Exception as e:
+                self.db_manager.log_message(self.job_id, f"Shard hedeflerine bağlanılamadı: {str(e)}")
+            finally:
+                self.close_shards()
+            for task in plan.tasks:
+                if task["kind"] == "full_sync":
+                    # Her kaynak diğerlerinin satırlarını silerdi
+                    self.db_manager.log_message(self.job_id, f"{task['src_table']} >> {task['tgt_table']}: full_sync çoklu kaynakta desteklenmez, grup atlandı (upsert kullanın).")
+            # Kaynaklar disk anahtar indeksi kullanmaz; bu yazmaları görmeyecek eski indeksler silinir
+            self.drop_job_key_indexes()
+            # Hedef indeks/FK'ler kaynak başına değil, tüm kaynaklar için bir kez askıya alınır
+            suspended = []
+            for task in plan.tasks:
+                if task["kind"] == "full_sync":
+                    continue
+                for tgt_table, key_names in self.get_suspend_tables(task):
+                    suspended += self.suspend_target_objects(job_info, target_conn, tgt_table, key_names)
+            # Her kaynak kendi throttle'ını kurar: iş limiti eşzamanlı kaynaklar, sunucu limiti
+            # aynı sunucudaki eşzamanlı kaynaklar arasında bölünür
+            workers = min(parallel, len(sources))
+            servers = [self.get_source_server(saved).lower() for saved in sources]
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    futures = {
+                        pool.submit(self.run_source, job_info, saved, plan.copy(),
+                                    {"job": workers, "server": min(workers, servers.count(server))}): saved
+                        for saved, server in zip(sources, servers)
+                    }
+                    for future in as_completed(futures):
+                        saved = futures[future]
+                        status, rows_read, seconds, message, source_started = future.result()
+                        failed += status != "ok"
+                        starts.append(source_started)
+                        self.failed_groups += status != "ok"
+                        self.db_manager.log_message(
+                            self.job_id,
+                            f"[{saved['conn_name']}] {status}: {rows_read} satır, {seconds:.1f} sn" + (f" ({message})" if message else "")
+                        )
+            finally:
+                self.restore_target_objects(target_conn, suspended)
+        finally:
+            target_conn.close()
+        # Filtreler kaynak watermark'larını kullanır; iş seviyesindeki tarih yalnızca tüm kaynaklar
+        # başarılıysa en erken kaynak başlangıcına ilerler
+        if not failed and starts:
+            self.update_job_last_run_date(self.job_id, min(starts))
+        self.db_manager.log_message(self.job_id, f"Aktarım tamamlandı ({len(sources) - failed}/{len(sources)} kaynak başarılı).")
+
+    def make_source_info(self, job_info, saved):
+        """
+        Çoklu kaynak işinde bir kaynak için job_info kopyası; kaynak alanları kayıtlı bağlantıdan.
+        """
+        src_info = dict(job_info)
+        src_info.update({
+            "source_server": self.get_source_server(saved),
+            "source_user": saved["username"],
+            "source_password": saved["passw"],
+            "source_db": saved["dbname"]
+        })
+        return src_info
+
+    def get_source_server(self, saved):
+        port = saved["port"]
+        return saved["server"] if not port or port == 1433 else f"{saved['server']}:{port}"
+
+    def run_source(self, job_info, saved, plan, readers=None):
+        """
+        Tek bir kaynağı thread içinde çalıştırır; (durum, okunan satır, süre, mesaj,
+        başlangıç) döner. Başlangıç, ilk taramadan önce alınan kaynak sunucu saatidir;
+        hatalı grup varsa kaynağın watermark'ı ilerlemez.
+        """
+        runner = TransferJobRunner(self.db_manager, self.job_id)
+        runner.lease = self.lease
+        runner.use_key_index = False
+        started = time.monotonic()
+        status, message, source_started = "ok", None, None
+        try:
+            src_info = self.make_source_info(job_info, saved)
+            watermark = self.db_manager.get_source_watermark(self.job_id, saved["conn_id"])
+            src_info["last_run_date"] = watermark["last_run_date"] if watermark else None
+            runner.route_source(src_info)
+            source_conn = ManagedConnection(lambda: runner.open_connection(src_info, "source"))
+            target_conn = ManagedConnection(lambda: runner.open_connection(src_info, "target"), src_info)
+            try:
+                # Watermark ilk taramadan önce alınır (bkz. run)
+                source_started = runner.get_watermark_time(source_conn, src_info)
+                filter_context = runner.get_filter_context(src_info)
+                same_instance = runner.is_same_instance(source_conn, target_conn)
+                runner.throttle = runner.make_throttle(src_info, readers)
+                runner.shards = runner.open_shards(src_info)
+                failed_tasks = set()
+                for i in plan.ordered_indexes():
+                    runner.check_lease()
+                    task = plan.tasks[i]
+                    if task["kind"] == "full_sync" or not runner.skip_failed_children(plan, [i], failed_tasks):
+                        continue
+                    before = runner.failed_groups
+                    runner.run_planned_task(src_info, source_conn, target_conn, task, filter_context,
+                                            same_instance, suspend=False)
+                    if runner.failed_groups > before:
+                        failed_tasks.add(i)
+            finally:
+                runner.close_shards()
+                source_conn.close()
+                target_conn.close()
+            if runner.failed_groups:
+                status, message = "failed", f"{runner.failed_groups} grup hatalı, ayrıntılar logda"
+        except Exception as e:
+            status, message = "failed", str(e)
+        rows_read = sum(stat[3] for stat in runner.task_stats)
+        seconds = time.monotonic() - started
+        try:
+            self.db_manager.set_source_watermark(self.job_id, saved["conn_id"], status, rows_read, seconds,
+                                                 message, source_started)
+        except Exception as e:
+            message = f"{message or ''} watermark yazılamadı: {str(e)}".strip()
+        finally:
+            self.db_manager.release_local()
+        return status, rows_read, seconds, message, source_started
+
+    def run_wave(self, job_info, source_conn, target_conn, tasks, filter_context, same_instance):
+        """
+        Bir dalganın görevlerini çalıştırır. group_parallelism > 1 ise farklı hedeflere
+        yazan görev zincirleri ayrı thread'lerde, her biri kendi bağlantılarıyla çalışır;
+        aksi halde görevler bu bağlantılarla sırayla çalışır. Hatalı görevlerin tasks
+        içindeki sıralarını döner (thread'de hatalı zincirin tüm görevleri).
+        """
+        try:
+            parallel = int(self.db_manager.get_setting("group_parallelism") or "1")
+        except ValueError:
+            parallel = 1
+        chains = self.chain_tasks(tasks) if parallel > 1 else []
+        failed = set()
+        if len(chains) <= 1:
+            for pos, task in enumerate(tasks):
+                if self.lease is not None and self.lease.lost:
+                    # Kalan görevler atlanır; run() dalga arasında durur
+                    break
+                before = self.failed_groups
+                self.run_planned_task(job_info, source_conn, target_conn, task, filter_context, same_instance)
+                if self.failed_groups > before:
+                    failed.add(pos)
+            return failed
+        with ThreadPoolExecutor(max_workers=min(parallel, len(chains))) as pool:
+            futures = [
+                (chain, pool.submit(self.run_chain_in_thread, job_info, [tasks[i] for i in chain], filter_context))
+                for chain in chains
+            ]
+            for chain, future in futures:
+                runner = future.result()
+                self.task_stats += runner.task_stats
+                self.failed_groups += runner.failed_groups
+                if runner.failed_groups:
+                    failed.update(chain)
+        return failed
+
+    def run_delete_phase(self, job_info, source_conn, target_conn, plan, filter_context, same_instance):
+        """
+        delete_first işaretli full_sync görevlerinin silmelerini dalgalardan önce, ters dalga
+        sırasıyla yapar: alt tablo satırları üst tablonunkilerden önce silinir. Alt tablo
+        silmesi hatalı olan görevin silmesi atlanır.
+        """
+        failed = set()
+        for wave in reversed(plan.waves):
+            for i in wave:
+                task = plan.tasks[i]
+                if not task.get("delete_first") or (self.lease is not None and self.lease.lost):
+                    continue
+                if any(j in failed for j in plan.children(i)):
+                    failed.add(i)
+                    self.failed_groups += 1
+                    self.db_manager.log_message(
+                        self.job_id,
+                        f"{task['src_table']} >> {task['tgt_table']}: alt tablo silmesi hatalı, silme aşaması atlandı."
+                    )
+                    continue
+                before = self.failed_groups
+                self.run_planned_task(job_info, source_conn, target_conn, task, filter_context, same_instance,
+                                      suspend=False, delete_phase=True)
+                if self.failed_groups > before:
+                    failed.add(i)
+
+    def skip_failed_children(self, plan, indexes, failed):
+        """
+        Üst tablosuna yazan görevi hatalı olan görevleri atlar (satırları FK'ye takılırdı);
+        atlananlar da failed'a eklenir ki alt tabloları da atlansın. Çalışacakları döner.
+        """
+        runnable = []
+        for i in indexes:
+            if plan.deps[i] & failed:
+                failed.add(i)
+                self.failed_groups += 1
+                self.db_manager.log_message(self.job_id, f"{plan.tasks[i]['src_table']}: üst tablo grubu hatalı, grup atlandı.")
+            else:
+                runnable.append(i)
+        return runnable
+
+    def run_chain_in_thread(self, job_info, tasks, filter_context):
+        """
+        Dalga içindeki bir görev zincirini thread'de, kendi kaynak/hedef (ve shard)
+        bağlantılarıyla çalıştırır. Sonuçları toplanmak üzere alt çalıştırıcıyı döner.
+        """
+        runner = TransferJobRunner(self.db_manager, self.job_id)
+        runner.lease = self.lease
+        runner.throttle = self.throttle
+        runner.retry_policy = self.retry_policy
+        runner.key_index_name = self.key_index_name
+        try:
+            source_conn = ManagedConnection(lambda: runner.open_connection(job_info, "source"))
+            target_conn = ManagedConnection(lambda: runner.open_connection(job_info, "target"), job_info)
+            try:
+                runner.shards = runner.open_shards(job_info)
+                same_instance = runner.is_same_instance(source_conn, target_conn)
+                for task in tasks:
+                    runner.check_lease()
+                    runner.run_planned_task(job_info, source_conn, target_conn, task, filter_context, same_instance)
+            finally:
+                runner.close_shards()
+                source_conn.close()
+                target_conn.close()
+        except Exception as e:
+            runner.failed_groups += 1
+            names = ", ".join(t["src_table"] for t in tasks)
+            self.db_manager.log_message(self.job_id, f"Grup zinciri hatası ({names}): {str(e)}")
+            self.send_error_mail(f"Grup zinciri hatası ({names}): {str(e)}")
+        finally:
+            self.db_manager.release_local()
+        return runner
+
+    def get_suspend_tables(self, task):
+        """
+        Görevin indeks/FK'leri askıya alınacak hedefleri: [(tablo, anahtar kolonları)].
+        """
+        if task["kind"] == "full_sync":
+            key_names = [c["target_column"] for c in task["col_maps"] if c["is_key"]]
+            return [(task["tgt_table"], key_names)] if task["suspend"] else []
+        return [(t["table"], t["key_names"]) for t in task["targets"] if t["suspend"]]
+
+    def run_planned_task(self, job_info, source_conn, target_conn, task, filter_context, same_instance, suspend=True,
+                         delete_phase=False):
+        """
+        Filtreyi çözer, gerekiyorsa hedef indeks/FK'leri askıya alıp görevi çalıştırır.
+        suspend=False ise askıya alma çağıran tarafından (ör. çoklu kaynakta bir kez) yapılır.
+        delete_phase: full_sync görevinin yalnız silme aşaması (bkz. run_delete_phase).
+        """
+        src_table = task["src_table"]
+        try:
+            filter_sql, filter_params = render_filter_predicate(task["filter"], filter_context)
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Filtre hatası {src_table}: {str(e)}")
+            self.send_error_mail(f"Filtre hatası {src_table}: {str(e)}")
+            return
+
+        # İndeks/FK askıya alma yalnızca yazma aşamasını kapsar
+        suspend_tables = self.get_suspend_tables(task) if suspend else []
+        slots = self.acquire_source_slots(job_info)
+        if slots is None:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"{src_table}: kaynak eşzamanlı sorgu sınırında yer açılmadı, görev atlandı.")
+            return
+        suspended = []
+        try:
+            for tgt_table, key_names in suspend_tables:
+                suspended += self.suspend_target_objects(job_info, target_conn, tgt_table, key_names)
+            try:
+                self.run_task(job_info, source_conn, target_conn, task, filter_sql, filter_params, same_instance,
+                              delete_phase)
+            finally:
+                self.restore_target_objects(target_conn, suspended)
+        finally:
+            for slot in slots:
+                self.db_manager.release_slot(slot)
+
+    def make_throttle(self, job_info, readers=None):
+        """
+        İşe veya kaynak sunucuya limit tanımlı değilse None (ek maliyet yok). readers:
+        bkz. SourceThrottle; aynı throttle'ı paylaşan thread'ler sayılmaz.
+        """
+        load = lambda: self.db_manager.get_source_limits(self.job_id, job_info["source_server"])
+        try:
+            if not load():
+                return None
+        except Exception:
+            return None
+        return SourceThrottle(load, readers=readers)
+
+    def acquire_source_slots(self, job_info):
+        """
+        Geçerli pencerede eşzamanlı sorgu sınırı varsa iş ve kaynak sunucu için applock
+        slotu alır. Alınan slotlar (bkz. acquire_slot), beklerken süre dolarsa None döner.
+        """
+        if self.throttle is None:
+            return []
+        limits = self.throttle.current()
+        resources = []
+        if limits["job_concurrent"]:
+            resources.append((f"Aktarator:job:{self.job_id}", limits["job_concurrent"]))
+        if limits["server_concurrent"]:
+            resources.append((f"Aktarator:src:{job_info['source_server'].lower()}", limits["server_concurrent"]))
+        taken = []
+        for resource, count in resources:
+            slot = self.db_manager.acquire_slot(resource, count)
+            if slot is None:
+                for t in taken:
+                    self.db_manager.release_slot(t)
+                return None
+            taken.append(slot)
+        return taken
+
+    def get_worker_processes(self):
+        try:
+            return int(self.db_manager.get_setting("worker_processes") or "0")
+        except ValueError:
+            return 0
+
+    def chain_tasks(self, tasks):
+        """
+        Görevleri ortak hedef tabloya göre zincirler: aynı hedefe yazan görevler (askıya
+        alma, full_sync silmeleri, kilitler) aynı işlemde sırayla çalışır, zincirler paralel.
+        """
+        chains, owner = [], {}
+        for i, task in enumerate(tasks):
+            if task["kind"] == "full_sync":
+                tables = [task["tgt_table"].lower()]
+            else:
+                tables = [t["table"].lower() for t in task["targets"]]
+            found = sorted({owner[t] for t in tables if t in owner})
+            if not found:
+                chains.append([i])
+                chain_id = len(chains) - 1
+            else:
+                chain_id = found[0]
+                for other in found[1:]:
+                    chains[chain_id] += chains[other]
+                    chains[other] = []
+                    for t, c in owner.items():
+                        if c == other:
+                            owner[t] = chain_id
+                chains[chain_id].append(i)
+            for t in tables:
+                owner[t] = chain_id
+        return [sorted(c) for c in chains if c]
+
+    def run_in_processes(self, plan, chains, workers):
+        """
+        Görev zincirlerini ayrı işlemlerde çalıştırır; her işlem kendi kontrol DB ve
+        kaynak/hedef bağlantılarını açar, sonuçlar ve süreler burada loglanır. Hatalı
+        zincirlerin görev sıralarını döner.
+        """
+        self.db_manager.log_message(self.job_id, f"{len(chains)} görev zinciri {min(workers, len(chains))} işlemde çalıştırılıyor.")
+        with ProcessPoolExecutor(max_workers=min(workers, len(chains)), initializer=init_worker_process) as pool:
+            # Her işlem kendi throttle'ını kurar; işin/sunucunun satır hızı işlemler arasında bölünür
+            readers = min(workers, len(chains))
+            futures = {pool.submit(run_task_chain, self.job_id, plan.version, chain, readers): chain for chain in chains}
+            failed = set()
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.update(futures[future])
+                    self.failed_groups += 1
+                    self.db_manager.log_message(self.job_id, f"Çalışan işlem hatası: {str(e)}")
+                    self.send_error_mail(f"Çalışan işlem hatası: {str(e)}")
+                    continue
+                # Watermark yalnızca tüm işlemlerin grupları başarılıysa ilerler
+                self.failed_groups += result["failed_groups"]
+                if result["failed_groups"]:
+                    failed.update(futures[future])
+                for src_table, tgt_table, sync_mode, rows_read, seconds in result["stats"]:
+                    self.task_stats.append((src_table, tgt_table, sync_mode, rows_read, seconds))
+                    self.db_manager.log_message(
+                        self.job_id,
+                        f"İşlem {result['pid']}: {src_table} >> {tgt_table}: {rows_read} satır, {seconds:.1f} sn"
+                    )
+                if result["error"]:
+                    self.db_manager.log_message(self.job_id, f"İşlem {result['pid']} hatası: {result['error']}")
+                    self.send_error_mail(f"İşlem {result['pid']} hatası: {result['error']}")
+        return failed
+
+    def run_task_chain(self, plan_version, task_indexes, readers=1):
+        """
+        Çalışan işlem tarafı: planı kendi bağlantılarıyla derler ve verilen görevleri
+        sırayla çalıştırır. Sonuç ana işleme picklable bir dict olarak döner; hatalı
+        grup sayısı (failed_groups) ana işlemin sayacına eklenir.
+        """
+        result = {"pid": os.getpid(), "stats": self.task_stats, "error": None, "failed_groups": 0}
+        try:
+            job_info = self.get_job_info()
+            if not job_info:
+                raise RuntimeError("İş bulunamadı")
+            self.route_source(job_info)
+            source_conn = ManagedConnection(lambda: self.open_connection(job_info, "source"))
+            target_conn = ManagedConnection(lambda: self.open_connection(job_info, "target"), job_info)
+            try:
+                plan = self.get_plan(job_info, target_conn)
+                if plan.version != plan_version:
+                    raise RuntimeError("İş çalışırken değiştirildi, görevler atlandı")
+                filter_context = self.get_filter_context(job_info)
+                same_instance = self.is_same_instance(source_conn, target_conn)
+                self.throttle = self.make_throttle(job_info, {"job": readers, "server": readers})
+                self.shards = self.open_shards(job_info)
+                for i in task_indexes:
+                    self.run_planned_task(job_info, source_conn, target_conn, plan.tasks[i],
+                                          filter_context, same_instance)
+            finally:
+                self.close_shards()
+                source_conn.close()
+                target_conn.close()
+        except Exception as e:
+            self.failed_groups += 1
+            result["error"] = str(e)
+            self.db_manager.invalidate()
+        result["failed_groups"] = self.failed_groups
+        return result
+
+    def run_task(self, job_info, source_conn, target_conn, task, filter_sql, filter_params, same_instance,
+                 delete_phase=False):
+        src_table = task["src_table"]
+        if task["kind"] == "full_sync" and self.shards:
+            if not delete_phase:
+                self.db_manager.log_message(self.job_id, f"{src_table} >> {task['tgt_table']}: full_sync shard'lı hedefte desteklenmez, grup atlandı.")
+            return
+        if task["kind"] == "full_sync":
+            tgt_table = task["tgt_table"]
+            if delete_phase:
+                phases = ("delete",)
+            elif task.get("delete_first"):
+                phases = ("insert", "update")
+            else:
+                phases = ("insert", "update", "delete")
+            started = time.monotonic()
+            # full_sync idempotenttir; geçici hatada grup baştan çalıştırılır
+            rows_read = self.with_retry(
+                f"Full sync hatası {src_table} >> {tgt_table}",
+                lambda: self.full_sync_group(job_info, source_conn, target_conn, src_table, tgt_table,
+                                             task["col_maps"], filter_sql, filter_params, phases),
+                [source_conn, target_conn]
+            )
+            if not delete_phase:
+                # Silme aşaması yalnız anahtarları okur; hız tahminine katılmaz
+                self.record_group_stats(src_table, tgt_table, "full_sync", rows_read or 0, started)
+            return
+        targets = task["targets"]
+        if same_instance and not self.shards and not (self.throttle and self.throttle.bucket.rate):
+            # Satır hızı sınırı sunucu tarafı INSERT ... SELECT'te uygulanamaz
+            targets = [
+                t for t in targets
+                if not self.server_side_insert(job_info, target_conn, task, t, filter_sql, filter_params)
+            ]
+        if targets:
+            # Anahtarsız insert hedefi varsa tarama tekrarı kayıt çoğaltır
+            self.with_retry(
+                f"Kaynak okuma hatası {src_table}",
+                lambda: self.scan_group(source_conn, target_conn, task, filter_sql, filter_params, targets),
+                [source_conn, target_conn],
+                retry=all(t["key_names"] for t in targets)
+            )
+
+    def check_key_index(self, target_conn, tgt_table, key_names, create=False):
+        """
+        Hedefte is_key kolonlarını kapsayan indeks var mı bakar; yoksa ve create
+        verilmişse nonclustered indeks oluşturup öncesi/sonrası tekrar kontrolü
+        sorgusunun süresini ölçer. Sonuç sözlüğü döner ve iş loguna yazılır.
+        """
+        result = {"target_table": tgt_table, "keys": key_names, "index": None,
+                  "created": False, "probe_before_ms": None, "probe_after_ms": None, "error": None}
+        try:
+            result["index"] = find_covering_index(get_table_indexes(target_conn, tgt_table), key_names)
+            if result["index"]:
+                return result
+            if not create:
+                # Ölçüm tabloyu tekrar tekrar tarar; yalnızca indeks oluşturulurken yapılır
+                self.db_manager.log_message(
+                    self.job_id,
+                    f"{tgt_table}: anahtar kolonlarını ({', '.join(key_names)}) kapsayan indeks yok; "
+                    f"tekrar kontrolü tablo taraması yapar."
+                )
+                return result
+            result["probe_before_ms"] = measure_probe_ms(target_conn, tgt_table, key_names)
+            safe_table = re.sub(r"[^A-Za-z0-9_]", "_", tgt_table.split(".")[-1])
+            index_name = f"IX_{safe_table}_{'_'.join(key_names)}_aktarim"[:128]
+            cur = target_conn.cursor()
+            cur.execute(f"CREATE NONCLUSTERED INDEX [{index_name}] ON {tgt_table} ({', '.join(key_names)})")
+            target_conn.commit()
+            result["index"] = index_name
+            result["created"] = True
+            result["probe_after_ms"] = measure_probe_ms(target_conn, tgt_table, key_names)
+        except Exception as e:
+            try:
+                target_conn.rollback()
+            except:
+                pass
+            result["error"] = str(e)
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: anahtar indeksi kontrolü/oluşturma hatası: {str(e)}")
+            return result
+
+        def fmt(ms):
+            return "-" if ms is None else f"{ms:.2f} ms"
+        self.db_manager.log_message(
+            self.job_id,
+            f"{tgt_table}: {result['index']} indeksi oluşturuldu; tekrar kontrolü süresi "
+            f"{fmt(result['probe_before_ms'])} -> {fmt(result['probe_after_ms'])}."
+        )
+        return result
+
+    def suspend_target_objects(self, job_info, target_conn, tgt_table, key_names):
+        """
+        Yükleme öncesi hedefin nonclustered indekslerini kapatır ve FK'lerini NOCHECK
+        yapar. Unique indeksler ile tekrar kontrolünün kullandığı anahtar indeksine
+        dokunulmaz. Her değişiklik önce TransferSuspendedObjects'e yazılır ki yarıda
+        kalan çalışma sonraki çalışmada geri alınabilsin.
+        """
+        records = []
+        try:
+            cur = target_conn.cursor()
+            cur.execute("""
+                SELECT name FROM sys.indexes
+                WHERE object_id = OBJECT_ID(%s) AND type = 2 AND is_disabled = 0
+                  AND is_unique = 0 AND is_primary_key = 0 AND is_unique_constraint = 0
+            """, (tgt_table,))
+            index_names = [r[0] for r in cur.fetchall()]
+            cur.execute("""
+                SELECT name FROM sys.foreign_keys
+                WHERE parent_object_id = OBJECT_ID(%s) AND is_disabled = 0
+            """, (tgt_table,))
+            fk_names = [r[0] for r in cur.fetchall()]
+            indexes = get_table_indexes(target_conn, tgt_table) if key_names else {}
+        except Exception as e:
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: indeks/FK bilgisi okunamadı, askıya alma yapılmadı: {str(e)}")
+            return records
+
+        objects = [("INDEX", n) for n in index_names
+                   if not find_covering_index({n: indexes.get(n, [])}, key_names)]
+        objects += [("FK", n) for n in fk_names]
+        for object_type, object_name in objects:
+            suspend_id = self.db_manager.insert_suspended_object(
+                self.job_id, job_info["target_server"], job_info["target_db"], tgt_table, object_type, object_name
+            )
+            record = {"suspend_id": suspend_id, "table_name": tgt_table,
+                      "object_type": object_type, "object_name": object_name}
+            quoted = "[" + object_name.replace("]", "]]") + "]"
+            try:
+                cur = target_conn.cursor()
+                if object_type == "INDEX":
+                    cur.execute(f"ALTER INDEX {quoted} ON {tgt_table} DISABLE")
+                else:
+                    cur.execute(f"ALTER TABLE {tgt_table} NOCHECK CONSTRAINT {quoted}")
+                target_conn.commit()
+                records.append(record)
+            except Exception as e:
+                try:
+                    target_conn.rollback()
+                except:
+                    pass
+                self.db_manager.delete_suspended_object(suspend_id)
+                self.db_manager.log_message(self.job_id, f"{tgt_table}.{object_name} askıya alınamadı: {str(e)}")
+        if records:
+            self.db_manager.log_message(
+                self.job_id,
+                f"{tgt_table}: {sum(r['object_type'] == 'INDEX' for r in records)} indeks kapatıldı, "
+                f"{sum(r['object_type'] == 'FK' for r in records)} FK NOCHECK yapıldı."
+            )
+        return records
+
+    def restore_target_objects(self, target_conn, records):
+        """
+        Askıya alınan indeksleri yeniden oluşturur (REBUILD), ardından FK'leri WITH CHECK
+        ile doğrulayarak açar; yarıda kalan yüklemenin recovery geçişi de bırakılır.
+        Başarılı olanların kaydı silinir; hata alanlar sonraki çalışmada tekrar denenmek
+        üzere kayıtta kalır.
+        """
+        for r in records:
+            if r["object_type"] == "RECOVERY":
+                self.restore_recovery_model(target_conn, r)
+        ordered = [r for r in records if r["object_type"] == "INDEX"] + \
+                  [r for r in records if r["object_type"] == "FK"]
+        for r in ordered:
+            tgt_table, object_name = r["table_name"], r["object_name"]
+            quoted = "[" + object_name.replace("]", "]]") + "]"
+            try:
+                cur = target_conn.cursor()
+                if r["object_type"] == "INDEX":
+                    cur.execute(f"ALTER INDEX {quoted} ON {tgt_table} REBUILD")
+                else:
+                    cur.execute(f"ALTER TABLE {tgt_table} WITH CHECK CHECK CONSTRAINT {quoted}")
+                target_conn.commit()
+                self.db_manager.delete_suspended_object(r["suspend_id"])
+            except Exception as e:
+                try:
+                    target_conn.rollback()
+                except:
+                    pass
+                self.db_manager.log_message(self.job_id, f"{tgt_table}.{object_name} geri açılamadı: {str(e)}")
+                self.send_error_mail(f"{tgt_table}.{object_name} geri açılamadı: {str(e)}")
+
+    def get_plan(self, job_info, target_conn):
+        """
+        İşin derlenmiş planı; plan_version ve hedef tabloların şeması değişmediyse
+        önbellekten döner, yoksa detaylar okunup yeniden derlenir. Şema özeti
+        okunamazsa plan her çalışmada derlenir.
+        """
+        version = job_info.get("plan_version") or 0
+        truncate = self.get_truncate_policy()
+        plan = self.db_manager.plan_cache.get(self.job_id)
+        if plan is not None and plan.is_valid(version, truncate):
+            fingerprint = get_schema_fingerprint(target_conn, plan.target_tables())
+            if fingerprint is not None and fingerprint == plan.fingerprint:
+                plan.reset()
+                return plan
+            self.db_manager.log_message(self.job_id, "Hedef şeması değişti, iş planı yeniden derleniyor.")
+        plan = self.compile_plan(version, truncate, target_conn)
+        plan.fingerprint = get_schema_fingerprint(target_conn, plan.target_tables())
+        self.db_manager.plan_cache[self.job_id] = plan
+        return plan
+
+    def compile_plan(self, version, truncate, target_conn):
+        """
+        Detayları (kaynak, hedef) gruplarına ayırır. Aynı kaynak tabloyu aynı filtreyle
+        okuyan insert/upsert grupları tek taramada birleştirilir; görevler ilk
+        görüldükleri sırada çalışır.
+        """
+        grouped = {}
+        for d in self.get_job_details(self.job_id):
+            grouped.setdefault((d["source_table"], d["target_table"]), []).append(d)
+
+        tasks, scans = [], {}
+        for (src_table, tgt_table), col_maps in grouped.items():
+            sync_mode = self.get_group_sync_mode(col_maps)
+            predicate = (self.get_group_filter(col_maps) or "").strip()
+            if sync_mode == "full_sync":
+                tasks.append({"kind": "full_sync", "src_table": src_table, "tgt_table": tgt_table,
+                              "col_maps": col_maps, "filter": predicate,
+                              "suspend": any(c.get("suspend_constraints") for c in col_maps)})
+                continue
+            scan_key = (src_table.lower(), predicate)
+            if scan_key not in scans:
+                scans[scan_key] = {"kind": "scan", "src_table": src_table, "filter": predicate,
+                                   "columns": [], "targets": []}
+                tasks.append(scans[scan_key])
+            task = scans[scan_key]
+            for c in get_source_columns(col_maps):
+                if c not in task["columns"]:
+                    task["columns"].append(c)
+            schema = self.get_target_schema(target_conn, tgt_table)
+            target = JobPlan.compile_target(tgt_table, col_maps, sync_mode, schema, truncate)
+            task["targets"].append(target)
+            if target["key_names"] and sync_mode != "bulk_load":
+                # Plan her derlendiğinde (iş değiştiğinde) bir kez bakılır
+                self.check_key_index(target_conn, tgt_table, target["key_names"],
+                                     create=(self.db_manager.get_setting("auto_create_key_index") or "0") == "1")
+
+        for task in scans.values():
+            task["select_sql"] = f"SELECT {','.join(task['columns'])} FROM {task['src_table']}"
+        waves, deps = self.order_waves(target_conn, tasks)
+        plan = JobPlan(version, truncate, tasks, waves, deps)
+        for i, task in enumerate(tasks):
+            if task["kind"] == "full_sync":
+                # Üst tablo silmesi, satırlarına bağlı alt tablo satırları silinmeden yapılamaz
+                task["delete_first"] = any(
+                    tasks[j]["kind"] == "full_sync" for j in list(plan.deps[i]) + plan.children(i)
+                )
+        return plan
+
+    def order_waves(self, target_conn, tasks):
+        """
+        Görevleri hedef tablolar arasındaki FK'lere göre dalgalara ayırır: alt tabloya
+        yazan görev, üst tablosuna yazan görevlerden sonraki bir dalgaya düşer. FK'ler
+        okunamazsa tanımlanma sırası (görev başına bir dalga) korunur; döngüde kalan
+        görevler son dalgada tanımlanma sırasıyla çalışır. (dalgalar, bağımlılıklar) döner;
+        bkz. JobPlan.
+        """
+        try:
+            fk_pairs = get_foreign_key_pairs(target_conn)
+        except Exception as e:
+            self.db_manager.log_message(self.job_id, f"Hedef FK'leri okunamadı, gruplar tanımlanma sırasıyla çalışacak: {str(e)}")
+            return None, None
+        writes = []
+        for task in tasks:
+            if task["kind"] == "full_sync":
+                writes.append({split_table_name(task["tgt_table"])})
+            else:
+                writes.append({split_table_name(t["table"]) for t in task["targets"]})
+
+        def same_table(a, b):
+            # Şemasız yazılmış tablo adı her şemadaki aynı adla eşleşir
+            return a[1] == b[1] and (a[0] is None or b[0] is None or a[0] == b[0])
+
+        deps = []
+        for i in range(len(tasks)):
+            parents = [p for c, p in fk_pairs if any(same_table(c, t) for t in writes[i])]
+            deps.append({
+                j for j in range(len(tasks))
+                if j != i and any(same_table(p, t) for p in parents for t in writes[j])
+            })
+        waves, done, remaining = [], set(), list(range(len(tasks)))
+        while remaining:
+            wave = [i for i in remaining if deps[i] <= done]
+            if not wave:
+                names = ", ".join(tasks[i]["src_table"] for i in remaining)
+                self.db_manager.log_message(self.job_id, f"FK döngüsü: {names} grupları tanımlanma sırasıyla çalışacak.")
+                waves += [[i] for i in remaining]
+                break
+            waves.append(wave)
+            done.update(wave)
+            remaining = [i for i in remaining if i not in done]
+        return waves, deps
+
+    def build_target_batch(self, col_maps, src_batch, converters, invalid=None):
+        """
+        Kaynak batch'inden hedef kolonlarını kolon bazlı üretir (sabitler, GUID, convert).
+        Hedefe yazılamayacak satırlar elenir; invalid verilirse elenen satırların kaynak
+        batch'indeki sıraları ona eklenir.
+        """
+        n = src_batch.size
+        names = [cm["target_column"] for cm in col_maps]
+        columns = []
+        if invalid is None:
+            invalid = set()
+        for cm, converter in zip(col_maps, converters):
+            fv = cm["fixed_value"]
+            if fv:
+                if fv.lower() == "guid":
+                    col = [str(uuid.uuid4()) for _ in range(n)]
+                elif fv.lower() == "null":
+                    col = [None] * n
+                else:
+                    col = [fv] * n
+            else:
+                col = src_batch.columns[src_batch.index[cm["source_column"]]]
+            if converter is not None:
+                col = converter.convert(col, invalid)
+            columns.append(col)
+        batch = RowBatch(names, columns, n)
+        if invalid:
+            # Hedefe yazılamayacak satırlar gönderilmeden elenir
+            batch = batch.without(invalid)
+        return batch
+
+    def scan_group(self, source_conn, target_conn, task, filter_sql, filter_params, targets):
+        """
+        Kaynak tabloyu bir kez okur ve her batch'i hedef tablo başına bir yazıcıya
+        dağıtır (task: JobPlan tarama görevi, targets: görevin bu çalışmadaki hedefleri).
+        Kalıcı batch yazma hataları yazıcılar içinde ele alınır; kaynak okuma hataları ve
+        tekrar denemesi tükenen geçici yazma hataları çağırana (with_retry) fırlatılır.
+        """
+        started = time.monotonic()
+        src_table = task["src_table"]
+        cur_s = source_conn.cursor()
+        sql_s = task["select_sql"]
+        if filter_sql:
+            sql_s += f" WHERE {filter_sql}"
+        if filter_params:
+            cur_s.execute(sql_s, filter_params)
+        else:
+            cur_s.execute(sql_s)
+
+        # Tek okuma akışı tüm yazıcıları besler; commit süresine en yavaş yazıcı yön verir
+        sizer = self.make_batch_sizer(sum(t["row_bytes"] for t in targets))
+        active = []
+        for target in targets:
+            if self.shards and self.is_sharded(target):
+                writer = self.shard_writer(src_table, target, sizer)
+            else:
+                writer = self.make_writer(target_conn, src_table, target, sizer)
+            try:
+                next(writer)
+                active.append((target, writer))
+            except StopIteration:
+                # Yazıcı başlamadan grubu atladı (ör. anahtar kolonu yok)
+                pass
+
+        try:
+            if active:
+                for src_batch in iter_batches(cur_s, task["columns"], sizer, self.throttle):
+                    self.check_lease()
+                    for target, writer in active:
+                        writer.send(self.build_target_batch(target["col_maps"], src_batch, target["converters"]))
+            for _, writer in active:
+                try:
+                    writer.send(None)
+                except StopIteration:
+                    pass
+        except Exception:
+            for _, writer in active:
+                writer.close()
+            raise
+        finally:
+            for target in targets:
+                self.log_conversion_failures(target["table"], target["converters"])
+        for target, _ in active:
+            self.record_group_stats(src_table, target["table"], target["sync_mode"], sizer.rows_read, started)
+
+    def make_writer(self, target_conn, src_table, target, sizer):
+        if target["sync_mode"] == "upsert":
+            return self.upsert_writer(target_conn, src_table, target, sizer)
+        if target["sync_mode"] == "bulk_load":
+            return self.bulk_writer(target_conn, src_table, target, sizer)
+        return self.insert_writer(target_conn, src_table, target, sizer)
+
+    def open_shards(self, job_info):
+        """
+        İşte shard hedefleri tanımlıysa (ShardRouter, [(conn_id, bağlantı)]) döner, yoksa None.
+        Shard'lar işin hedef şemasıyla aynı tabloları içermelidir; plan hedef DB'den derlenir.
+        Bu bağlantılar erişimi doğrular ve geri alma için kullanılır; yazıcılar kendi
+        bağlantılarını açar (bkz. shard_writer).
+        """
+        ids = [int(p) for p in (job_info.get("shard_conn_ids") or "").split(",") if p.strip().isdigit()]
+        columns = [c.strip() for c in (job_info.get("shard_columns") or "").split(",") if c.strip()]
+        if not ids:
+            return None
+        method = job_info.get("shard_method") or "hash"
+        bounds = [b.strip() for b in (job_info.get("shard_bounds") or "").split(",") if b.strip()]
+        if not columns or method not in SHARD_METHODS or (method == "range" and len(bounds) != len(ids) - 1):
+            raise RuntimeError("Shard ayarları geçersiz: kolon(lar) girilmeli, range için shard sayısından bir eksik sınır verilmeli")
+        conns = []
+        try:
+            for conn_id in ids:
+                saved = self.db_manager.get_saved_connection(conn_id)
+                if not saved:
+                    raise RuntimeError(f"Shard bağlantısı ID={conn_id} bulunamadı")
+                port = saved["port"]
+                shard_info = {
+                    "target_server": saved["server"] if not port or port == 1433 else f"{saved['server']}:{port}",
+                    "target_user": saved["username"],
+                    "target_password": saved["passw"],
+                    "target_db": saved["dbname"]
+                }
+                conns.append((conn_id, ManagedConnection(lambda info=shard_info: self.open_connection(info, "target"), shard_info)))
+        except Exception:
+            for _, conn in conns:
+                conn.close()
+            raise
+        return ShardRouter(method, columns, len(conns), bounds), conns
+
+    def restore_shard_objects(self):
+        """
+        Önceki çalışmadan shard hedeflerinde kalan kayıtları (ör. recovery geçişi) geri alır.
+        Kaynak/zincir thread'leri başlamadan, bir kez çağrılır.
+        """
+        if not self.shards:
+            return
+        for _, conn in self.shards[1]:
+            self.restore_target_objects(conn, self.db_manager.get_suspended_objects(
+                self.job_id, conn.info["target_server"], conn.info["target_db"]
+            ))
+
+    def close_shards(self):
+        if self.shards:
+            for _, conn in self.shards[1]:
+                conn.close()
+        self.shards = None
+
+    def is_sharded(self, target):
+        """
+        Hedef tüm shard kolonlarını içeriyorsa shard'lara dağıtılır; içermiyorsa (ör. yardımcı
+        tablo) işin ana hedefine yazılır.
+        """
+        names = {n.lower() for n in target["col_names"]}
+        if all(c.lower() in names for c in self.shards[0].columns):
+            return True
+        self.db_manager.log_message(self.job_id, f"{target['table']}: shard kolonları eşleşmede yok, ana hedefe yazılıyor.")
+        return False
+
+    def shard_writer(self, src_table, target, sizer):
+        """
+        Yazıcı protokolündeki generator: gelen hedef batch'ini shard'lara böler, her shard'ın
+        kendi yazıcısı ayrı thread'de eşzamanlı çalışır. Aynı taramanın birden fazla
+        shard'lı hedefi olabileceğinden her yazıcı thread'i shard'a kendi bağlantısını açar
+        (pymssql bağlantısı thread'ler arasında paylaşılamaz). Shard yazıcılarının disk
+        anahtar indeksleri ayrı tutulur; atlanan grup sayıları bu çalıştırıcıya eklenir.
+        """
+        router, shard_conns = self.shards
+        names = [n.lower() for n in target["col_names"]]
+        folds = [target["col_folds"][names.index(c.lower())] for c in router.columns]
+        threads, runners, conns = [], [], []
+        try:
+            for conn_id, shard_conn in shard_conns:
+                conn = ManagedConnection(shard_conn.factory, shard_conn.info)
+                conns.append(conn)
+                runner = TransferJobRunner(self.db_manager, self.job_id)
+                runner.retry_policy = self.retry_policy
+                runner.key_index_name = f"{self.key_index_name}_shard{conn_id}"
+                runner.use_key_index = self.use_key_index
+                writer = runner.make_writer(conn, src_table, target, sizer)
+                try:
+                    next(writer)
+                except StopIteration:
+                    # Tüm shard'lar aynı kuralla atlar (ör. anahtar kolonu yok)
+                    for t in threads:
+                        t.abort()
+                    return
+                thread = WriterThread(writer, self.db_manager.release_local)
+                thread.start()
+                threads.append(thread)
+                runners.append(runner)
+            while True:
+                batch = yield
+                if batch is None:
+                    break
+                for thread, part in zip(threads, router.split(batch, folds)):
+                    if part.size:
+                        thread.send(part)
+            for thread in threads:
+                thread.finish()
+        except BaseException:
+            for thread in threads:
+                if thread.is_alive():
+                    thread.abort()
+            raise
+        finally:
+            for runner in runners:
+                self.failed_groups += runner.failed_groups
+            for conn in conns:
+                conn.close()
+
+    def is_same_instance(self, source_conn, target_conn):
+        """
+        Kaynak ve hedef aynı SQL Server instance'ında mı (sunucu tarafı aktarım için).
+        """
+        if (self.db_manager.get_setting("server_side_insert") or "1") != "1":
+            return False
+        try:
+            cur_s = source_conn.cursor()
+            cur_s.execute("SELECT @@SERVERNAME")
+            cur_t = target_conn.cursor()
+            cur_t.execute("SELECT @@SERVERNAME")
+            src_name, tgt_name = cur_s.fetchone()[0], cur_t.fetchone()[0]
+        except Exception:
+            return False
+        return bool(src_name) and (src_name or "").lower() == (tgt_name or "").lower()
+
+    def server_side_insert(self, job_info, target_conn, task, target, filter_sql, filter_params):
+        """
+        insert modundaki grubu tek bir çapraz veritabanı INSERT ... SELECT ile sunucu
+        tarafında çalıştırır. Uygun değilse veya hata olursa False döner; grup
+        normal yoldan aktarılır.
+        """
+        if target["sync_mode"]:
+            return False
+        if job_info.get("read_isolation") or job_info.get("statement_timeout"):
+            # Sorgu hedef oturumunda çalışır; kaynak oturumunun yalıtımı ve zaman aşımı uygulanmazdı
+            return False
+        src_table, tgt_table = task["src_table"], target["table"]
+        sql = build_server_insert_sql(
+            qualify_table(job_info["source_db"], src_table),
+            qualify_table(job_info["target_db"], tgt_table),
+            target["col_maps"], filter_sql, bool(filter_params)
+        )
+        if sql is None:
+            return False
+        try:
+            started = time.monotonic()
+            cur = target_conn.cursor()
+            if filter_params:
+                cur.execute(sql, filter_params)
+            else:
+                cur.execute(sql)
+            inserted_count = cur.rowcount
+            target_conn.commit()
+        except Exception as e:
+            try:
+                target_conn.rollback()
+            except:
+                pass
+            self.db_manager.log_message(
+                self.job_id,
+                f"{src_table} >> {tgt_table}: sunucu tarafı aktarım yapılamadı, satır bazlı aktarıma geçiliyor: {str(e)}"
+            )
+            return False
+        if target["key_cols"]:
+            # Disk anahtar indeksi bu eklemeleri görmedi; sonraki kullanımda yeniden oluşturulur
+            self.drop_key_index(tgt_table, target["key_cols"])
+        self.db_manager.log_message(
+            self.job_id,
+            f"{src_table} >> {tgt_table}: {inserted_count} kayıt (sunucu tarafında, "
+            f"{time.monotonic() - started:.1f} sn)."
+        )
+        return True
+
+    def insert_writer(self, target_conn, src_table, target, sizer):
+        """
+        Hedefte anahtarı olmayan satırları batch'ler halinde ekler. send() ile gelen
+        hedef batch'lerini yazar; None gönderilince sonucu loglayıp biter.
+        """
+        tgt_table = target["table"]
+        key_cols = target["key_cols"]
+        key_index = self.open_key_index(target_conn, tgt_table, key_cols, target["key_folds"]) if key_cols else None
+        col_names = target["col_names"]
+        sql_t = target["insert_sql"]
+        # GUID/NULL sabit anahtarlar kontrolde NULL olarak aranır (hiç eşleşmez)
+        key_pos = [
+            (col_names.index(c["target_column"]), (c["fixed_value"] or "").lower() in ["guid", "null"])
+            for c in key_cols
+        ]
+        folds = target["key_folds"]
+
+        inserted_count = 0
+        try:
+            while True:
+                batch = yield
+                if batch is None:
+                    break
+                # keys rows ile aynı sırada; NULL'lu anahtar için None. hits: indekste bulunanların rows sırası
+                rows, keys, hits = [], [], []
+                seen = set()
+                for row in batch.rows():
+                    if key_pos:
+                        key_vals = [None if blank else row[i] for i, blank in key_pos]
+                        if any(v is None for v in key_vals):
+                            # NULL içeren anahtar hiçbir satırla eşleşmez; satır her zaman eklenir
+                            keys.append(None)
+                            rows.append(row)
+                            continue
+                        norm_key = normalize_key(key_vals, folds)
+                        if norm_key in seen:
+                            continue
+                        if key_index is not None:
+                            if key_index.contains(key_vals):
+                                hits.append(len(rows))
+                        elif self.target_row_exists(target_conn, target["exists_sql"], key_vals):
+                            continue
+                        seen.add(norm_key)
+                        keys.append(key_vals)
+                    rows.append(row)
+                if hits:
+                    # İndeks isabeti "belki var"dır (indeks oluşturulduktan sonra silinmiş olabilir);
+                    # hedefte olduğu doğrulananlar atlanır
+                    present = self.find_existing_keys(target_conn, tgt_table, target["key_names"], [keys[i] for i in hits])
+                    drop = {hits[i] for i in present}
+                    rows = [r for i, r in enumerate(rows) if i not in drop]
+                    keys = [k for i, k in enumerate(keys) if i not in drop]
+                if not rows:
+                    continue
+
+                try:
+                    started = time.monotonic()
+                    self.write_with_retry(target_conn, tgt_table, lambda: target_conn.cursor().executemany(sql_t, rows))
+                    sizer.record_commit(len(rows), time.monotonic() - started)
+                    inserted_count += len(rows)
+                    if key_index is not None:
+                        for key_vals in keys:
+                            if key_vals is not None:
+                                key_index.add(key_vals)
+                except Exception as e:
+                    try:
+                        target_conn.rollback()
+                    except:
+                        pass
+                    if is_transient_error(e):
+                        # Tekrar denemeler tükendi (hedef erişilemez); satır satır denemek yalnızca bekletir
+                        raise
+                    # Kalıcı hata: hatalı satırı ayırmak için batch'i satır satır tekrar dene
+                    for i, row in enumerate(rows):
+                        try:
+                            self.write_with_retry(target_conn, tgt_table, lambda: target_conn.cursor().execute(sql_t, row))
+                            inserted_count += 1
+                            if key_index is not None and keys[i] is not None:
+                                key_index.add(keys[i])
+                        except Exception as e:
+                            if is_transient_error(e):
+                                raise
+                            self.db_manager.log_message(self.job_id, f"Hedef insert hatası {tgt_table}: {str(e)}")
+                            self.send_error_mail(f"Hedef insert hatası {tgt_table}: {str(e)}")
+                            continue
+        finally:
+            if key_index is not None:
+                self.save_key_index_state(target_conn, tgt_table, key_index, inserted_count)
+                key_index.close()
+        self.db_manager.log_message(self.job_id, f"{src_table} >> {tgt_table}: {inserted_count} kayıt.")
+
+    def bulk_writer(self, target_conn, src_table, target, sizer):
+        """
+        Boş hedefe ilk yükleme: tablo kilidiyle (TABLOCK) ve büyük commit'li batch'lerle
+        yazar, böylece SIMPLE/BULK_LOGGED modda eklemeler minimal loglanır. pymssql
+        bulk_copy destekliyorsa BCP kullanılır. Hedef boş değilse insert modu gibi
+        tekrar kontrolüyle çalışır.
+        """
+        tgt_table = target["table"]
+        try:
+            target_rows = get_table_row_count(target_conn, tgt_table)
+        except Exception:
+            target_rows = None
+        if target_rows != 0:
+            self.db_manager.log_message(
+                self.job_id,
+                f"{src_table} >> {tgt_table}: hedef boş değil, bulk_load yerine tekrar kontrollü insert yapılacak."
+            )
+            yield from self.insert_writer(target_conn, src_table, target, sizer)
+            return
+
+        try:
+            batch_rows = int(self.db_manager.get_setting("bulk_load_batch_rows") or BULK_LOAD_BATCH_ROWS)
+        except ValueError:
+            batch_rows = BULK_LOAD_BATCH_ROWS
+        use_bcp = hasattr(target_conn.raw, "bulk_copy") and target["column_ids"] is not None
+        col_names = target["col_names"]
+        # GUID/NULL sabit anahtar NULL sayılır (insert_writer gibi): hiçbir satırla eşleşmez
+        key_cols = target["key_cols"]
+        if any((c["fixed_value"] or "").lower() in ["guid", "null"] for c in key_cols):
+            key_cols = []
+        key_pos = [col_names.index(c["target_column"]) for c in key_cols]
+        folds = target["key_folds"]
+
+        def write(rows):
+            if use_bcp:
+                target_conn.raw.bulk_copy(tgt_table, rows, column_ids=target["column_ids"],
+                                          batch_size=len(rows), tablock=True)
+            else:
+                target_conn.cursor().executemany(target["bulk_insert_sql"], rows)
+
+        def flush(rows):
+            try:
+                started = time.monotonic()
+                self.write_with_retry(target_conn, tgt_table, lambda: write(rows))
+                sizer.record_commit(len(rows), time.monotonic() - started)
+                return len(rows)
+            except Exception as e:
+                if is_transient_error(e):
+                    raise
+                self.db_manager.log_message(
+                    self.job_id,
+                    f"Hedef bulk_load hatası {tgt_table}: {str(e)}; batch satır satır ekleniyor."
+                )
+            written = 0
+            for row in rows:
+                try:
+                    self.write_with_retry(target_conn, tgt_table,
+                                          lambda: target_conn.cursor().execute(target["insert_sql"], row))
+                    written += 1
+                except Exception as e:
+                    if is_transient_error(e):
+                        raise
+                    self.db_manager.log_message(self.job_id, f"Hedef insert hatası {tgt_table}: {str(e)}")
+                    self.send_error_mail(f"Hedef insert hatası {tgt_table}: {str(e)}")
+            return written
+
+        recovery = self.switch_recovery_model(target_conn, tgt_table)
+        # Tekrarlar tüm yükleme boyunca ayıklanır (hedef boş kabul edildiğinden önceki
+        # flush'larda yazılan anahtar tekrar gelirse eklenmemeli)
+        dedup = self.open_load_key_index(tgt_table, key_cols, folds) if key_pos else None
+        inserted_count = 0
+        pending, seen = [], set()
+        try:
+            while True:
+                batch = yield
+                if batch is not None:
+                    for row in batch.rows():
+                        if key_pos and all(row[i] is not None for i in key_pos):
+                            # NULL içeren anahtar eşleşmez, tekrar sayılmaz
+                            key_vals = [row[i] for i in key_pos]
+                            if dedup is not None:
+                                if dedup.contains(key_vals):
+                                    continue
+                                dedup.add(key_vals)
+                            else:
+                                key = normalize_key(key_vals, folds)
+                                if key in seen:
+                                    continue
+                                seen.add(key)
+                        pending.append(row)
+                    # Bellek bütçesi batch boyutunu sınırlar
+                    if len(pending) < min(batch_rows, max(sizer.memory_rows(), BATCH_MIN_ROWS)):
+                        continue
+                if pending:
+                    inserted_count += flush(pending)
+                    pending = []
+                if batch is None:
+                    break
+        finally:
+            if dedup is not None:
+                dedup.remove()
+            if recovery:
+                self.restore_recovery_model(target_conn, recovery)
+        if target["key_cols"]:
+            self.drop_key_index(tgt_table, target["key_cols"])
+        self.db_manager.log_message(self.job_id, f"{src_table} >> {tgt_table}: {inserted_count} kayıt (bulk_load).")
+
+    def open_load_key_index(self, tgt_table, key_cols, key_folds):
+        """
+        bulk_load boyunca kaynakta tekrar eden anahtarları ayıklayan boş disk indeksi;
+        bellek kullanımı Bloom boyutuyla sınırlıdır. Yükleme bitince silinir. Oluşturulamazsa
+        None döner, tekrarlar bellekte ayıklanır.
+        """
+        try:
+            bloom_mb = int(self.db_manager.get_setting("key_index_bloom_mb") or "256")
+            # Aynı tabloya eşzamanlı yüklemeler (ör. kaynak thread'leri) ayrı dosya kullanır
+            key_index = self.make_key_index(f"{tgt_table}_load{os.getpid()}_{threading.get_ident()}", key_cols, key_folds)
+            os.makedirs(os.path.dirname(key_index.db_path) or ".", exist_ok=True)
+            key_index.build(None, tgt_table, BULK_LOAD_DEDUP_ROWS, bloom_mb * 1024 * 1024)
+            key_index.open()
+            return key_index
+        except Exception as e:
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: yükleme tekrar indeksi oluşturulamadı, tekrarlar bellekte ayıklanacak: {str(e)}")
+            return None
+
+    def set_recovery_model(self, target_conn, model):
+        if model not in ("FULL", "BULK_LOGGED", "SIMPLE"):
+            raise ValueError(f"Geçersiz recovery modu: {model}")
+        target_conn.commit()
+        target_conn.autocommit(True)
+        try:
+            target_conn.cursor().execute(f"ALTER DATABASE CURRENT SET RECOVERY {model}")
+        finally:
+            target_conn.autocommit(False)
+
+    def switch_recovery_model(self, target_conn, tgt_table):
+        """
+        bulk_load_recovery ayarı açıksa FULL recovery modundaki hedefi yükleme süresince
+        BULK_LOGGED'a alır. Geçiş TransferSuspendedObjects'e (RECOVERY) yazılır ve veritabanı
+        başına sayılır: eşzamanlı yüklemeler aynı geçişi paylaşır, eski moda son biten döner;
+        yarıda kalan çalışmanın kaydı sonraki çalışmada geri alınır. Kaydı ya da None döner.
+        """
+        if (self.db_manager.get_setting("bulk_load_recovery") or "0") != "1":
+            return None
+        info = getattr(target_conn, "info", None)
+        if not info:
+            return None
+        server, db = info["target_server"], info["target_db"]
+        lock = self.db_manager.acquire_slot(f"Aktarator:recovery:{server}/{db}".lower(), 1)
+        if lock is None:
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: recovery modu kilidi alınamadı, mod değiştirilmedi.")
+            return None
+        record = None
+        try:
+            active = self.db_manager.get_recovery_switches(server, db)
+            if active:
+                # Başka bir yükleme zaten geçirdi; referans eklenir, eski mod onun kaydından alınır
+                model = active[0]["object_name"]
+            else:
+                cur = target_conn.cursor()
+                cur.execute("SELECT recovery_model_desc FROM sys.databases WHERE database_id = DB_ID()")
+                model = cur.fetchone()[0]
+                target_conn.commit()
+                if model != "FULL":
+                    return None
+            suspend_id = self.db_manager.insert_suspended_object(self.job_id, server, db, tgt_table, "RECOVERY", model)
+            record = {"suspend_id": suspend_id, "table_name": tgt_table, "object_type": "RECOVERY",
+                      "object_name": model, "target_server": server, "target_db": db}
+            if not active:
+                self.set_recovery_model(target_conn, "BULK_LOGGED")
+                self.db_manager.log_message(self.job_id, f"{tgt_table}: yükleme için recovery modu BULK_LOGGED yapıldı.")
+            return record
+        except Exception as e:
+            if record:
+                self.db_manager.delete_suspended_object(record["suspend_id"])
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: recovery modu değiştirilemedi: {str(e)}")
+            return None
+        finally:
+            self.db_manager.release_slot(lock)
+
+    def restore_recovery_model(self, target_conn, record):
+        """
+        Yüklemenin recovery referansını bırakır; veritabanında süren başka yükleme yoksa
+        eski modu geri yükler. Geri alınamazsa kayıt sonraki çalışma için kalır.
+        """
+        server, db = record["target_server"], record["target_db"]
+        lock = self.db_manager.acquire_slot(f"Aktarator:recovery:{server}/{db}".lower(), 1)
+        if lock is None:
+            self.db_manager.log_message(self.job_id, f"{record['table_name']}: recovery modu kilidi alınamadı, sonraki çalışmada geri alınacak.")
+            return
+        try:
+            others = [r for r in self.db_manager.get_recovery_switches(server, db) if r["suspend_id"] != record["suspend_id"]]
+            if not others:
+                self.set_recovery_model(target_conn, record["object_name"])
+                self.db_manager.log_message(self.job_id, f"{record['table_name']}: recovery modu {record['object_name']} olarak geri alındı.")
+            self.db_manager.delete_suspended_object(record["suspend_id"])
+        except Exception as e:
+            self.db_manager.log_message(self.job_id, f"{record['table_name']}: recovery modu geri alınamadı: {str(e)}")
+            self.send_error_mail(f"{record['table_name']}: recovery modu geri alınamadı: {str(e)}")
+        finally:
+            self.db_manager.release_slot(lock)
+
+    def upsert_writer(self, target_conn, src_table, target, sizer):
+        """
+        Anahtara göre toplu karşılaştırma: hedefte olmayan satırlar eklenir, anahtar
+        dışı kolonlarının hash'i farklı olanlar güncellenir, aynı olanlara dokunulmaz.
+        insert_writer gibi send() ile beslenir.
+        """
+        tgt_table = target["table"]
+        key_names = target["key_names"]
+        if not key_names:
+            self.db_manager.log_message(self.job_id, f"{src_table} >> {tgt_table}: upsert için is_key kolonu gerekli, grup atlandı.")
+            return
+        compare_names = target["compare_names"]
+        col_names = target["col_names"]
+        key_pos = [col_names.index(k) for k in key_names]
+        cmp_pos = [col_names.index(c) for c in compare_names]
+        cmp_cols = target["compare_cols"]
+        folds = target["key_folds"]
+        sql_insert = target["insert_sql"]
+        sql_update = target["update_sql"]
+        chunk_size = max(1, min(UPSERT_BATCH_SIZE, 2000 // len(key_names)))
+
+        inserted_count, updated_count = 0, 0
+        while True:
+            batch = yield
+            if batch is None:
+                break
+            batch_rows = list(batch.rows())
+            for start in range(0, len(batch_rows), chunk_size):
+                chunk = {}
+                for row in batch_rows[start:start + chunk_size]:
+                    key = normalize_key([row[k] for k in key_pos], folds)
+                    # Aynı parça içinde (hedef collation'ına göre) tekrar eden anahtarda son satır geçerli
+                    chunk[key] = row
+
+                def write_chunk():
+                    # Tekrar denemede hedef yeniden okunur; karşılaştırma baştan yapılır
+                    existing = self.fetch_target_hashes(
+                        target_conn, tgt_table, key_names, compare_names,
+                        [[row[k] for k in key_pos] for row in chunk.values()], cmp_cols
+                    )
+                    inserts, updates = [], []
+                    for pos, row in enumerate(chunk.values()):
+                        if pos not in existing:
+                            inserts.append(row)
+                        elif cmp_pos:
+                            new_vals = [row[c] for c in cmp_pos]
+                            if existing[pos] != row_hash(new_vals, cmp_cols):
+                                updates.append(tuple(new_vals + [row[k] for k in key_pos]))
+
+                    cur_t = target_conn.cursor()
+                    if inserts:
+                        cur_t.executemany(sql_insert, inserts)
+                    if updates:
+                        cur_t.executemany(sql_update, updates)
+                    return inserts, updates
+
+                try:
+                    started = time.monotonic()
+                    inserts, updates = self.write_with_retry(target_conn, tgt_table, write_chunk)
+                    sizer.record_commit(len(chunk), time.monotonic() - started)
+                    inserted_count += len(inserts)
+                    updated_count += len(updates)
+                except Exception as e:
+                    if is_transient_error(e):
+                        raise
+                    self.db_manager.log_message(self.job_id, f"Hedef upsert hatası {tgt_table}: {str(e)}")
+                    self.send_error_mail(f"Hedef upsert hatası {tgt_table}: {str(e)}")
+                    continue
+
+        self.db_manager.log_message(
+            self.job_id,
+            f"{src_table} >> {tgt_table}: {inserted_count} kayıt eklendi, {updated_count} kayıt güncellendi."
+        )
+
+    def find_existing_keys(self, conn, table, key_names, batch_keys):
+        """
+        batch_keys'ten hedefte bulunanların sıraları (SQL parametre sınırına göre parçalı).
+        """
+        step = max(1, 2000 // (len(key_names) + 1))
+        present = set()
+        for start in range(0, len(batch_keys), step):
+            found = self.fetch_target_hashes(conn, table, key_names, [], batch_keys[start:start + step])
+            present.update(start + i for i in found)
+        return present
+
+    def fetch_target_hashes(self, conn, table, key_names, compare_names, batch_keys, compare_cols=None):
+        """
+        Batch'teki anahtarların hedefteki karşılıklarını tek sorguda okur;
+        {batch_keys sırası: anahtar dışı kolonların hash'i} döner. Eşleşme SQL tarafında
+        (hedef collation'ıyla) yapıldığı için sonuç gönderilen satır sırasıyla eşlenir.
+        compare_cols: row_hash'e verilen hedef kolon şemaları (bkz. hash_columns).
+        """
+        key_aliases = [f"k{i}" for i in range(len(key_names))]
+        rows_sql = ",".join(["(%s," + ",".join(["%s"] * len(key_names)) + ")"] * len(batch_keys))
+        params = []
+        for i, key_vals in enumerate(batch_keys):
+            params.append(i)
+            params.extend(key_vals)
+        select_cols = ",".join(["v.i"] + [f"t.{c}" for c in compare_names])
+        on_sql = " AND ".join(f"t.{k}=v.{a}" for k, a in zip(key_names, key_aliases))
+        sql = (
+            f"SELECT {select_cols} FROM {table} t "
+            f"JOIN (VALUES {rows_sql}) v(i,{','.join(key_aliases)}) ON {on_sql}"
+        )
+        cur = conn.cursor()
+        cur.execute(sql, tuple(params))
+        result = {}
+        for r in cur.fetchall():
+            result[r[0]] = row_hash(r[1:], compare_cols)
+        return result
+
+    def full_sync_group(self, job_info, source_conn, target_conn, src_table, tgt_table,
+                        col_maps, filter_sql, filter_params, phases=("insert", "update", "delete")):
+        """
+        Kaynak ve hedefi is_key kolonlarına göre sıralı iki akış olarak okuyup
+        merge-join ile insert/update/delete kümelerini çıkarır; yalnızca phases'taki
+        işlemler yazılır (yalnız silme aşamasında iki taraftan da sadece anahtarlar
+        okunur). Bellekte yalnızca o anki satırlar ve yazılmayı bekleyen batch tutulur.
+        Okunan kaynak satır sayısını döner.
+        """
+        key_maps = [c for c in col_maps if c["is_key"]]
+        if not key_maps or any(not c["source_column"] or c["fixed_value"] for c in key_maps):
+            self.db_manager.log_message(
+                self.job_id,
+                f"{src_table} >> {tgt_table}: full_sync için tüm is_key kolonları kaynak kolondan gelmeli, grup atlandı."
+            )
+            return 0
+        key_names = [c["target_column"] for c in key_maps]
+        src_keys = [c["source_column"] for c in key_maps]
+        compare_names = [
+            c["target_column"] for c in col_maps
+            if not c["is_key"] and (c["fixed_value"] or "").lower() != "guid"
+        ]
+        delete_only = set(phases) == {"delete"}
+        if delete_only:
+            if filter_sql:
+                # Filtreli grupta silme yapılmaz (aşağıya bkz.)
+                return 0
+            compare_names = []
+            columns_to_select = list(dict.fromkeys(src_keys))
+        else:
+            columns_to_select = get_source_columns(col_maps)
+
+        try:
+            src_types = get_column_types(source_conn, src_table)
+            tgt_schema = get_table_schema(target_conn, tgt_table)
+            tgt_types = {name: col["data_type"] for name, col in tgt_schema.items()}
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Kolon tipleri okunamadı {src_table} >> {tgt_table}: {str(e)}")
+            self.send_error_mail(f"Kolon tipleri okunamadı {src_table} >> {tgt_table}: {str(e)}")
+            return 0
+
+        # İki sunucuda sıralama ile Python karşılaştırması aynı olmalı: herhangi bir
+        # tarafı metin ya da GUID olan anahtar, iki tarafta da BIN2 collation ile metin olarak sıralanır.
+        as_str = [
+            merge_key_mode(src_types.get(s.lower()), tgt_types.get(t.lower()))
+            for s, t in zip(src_keys, key_names)
+        ]
+        src_order = ",".join(merge_order_expr(c, src_types.get(c.lower()), a) for c, a in zip(src_keys, as_str))
+        tgt_order = ",".join(merge_order_expr(c, tgt_types.get(c.lower()), a) for c, a in zip(key_names, as_str))
+
+        sql_s = f"SELECT {','.join(columns_to_select)} FROM {src_table}"
+        if filter_sql:
+            sql_s += f" WHERE {filter_sql}"
+        sql_s += f" ORDER BY {src_order}"
+        sql_r = f"SELECT {','.join(key_names + compare_names)} FROM {tgt_table} ORDER BY {tgt_order}"
+
+        try:
+            reader_conn = self.open_connection(job_info, "target")
+        except Exception as e:
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Hedef DB bağlantı hatası: {str(e)}")
+            self.send_error_mail(f"Hedef DB bağlantı hatası: {str(e)}")
+            return 0
+
+        counts = {"insert": 0, "update": 0, "delete": 0}
+        pending = {"insert": [], "update": [], "delete": []}
+        col_names = [c["target_column"] for c in col_maps]
+        cmp_pos = [col_names.index(c) for c in compare_names]
+        # Kaynak ve hedef değerleri hedef kolonun biçiminde karşılaştırılır (bkz. to_target_value)
+        cmp_cols = hash_columns(tgt_schema, compare_names)
+        placeholders = ",".join(["%s"] * len(col_names))
+        where_sql = " AND ".join(f"{k}=%s" for k in key_names)
+        statements = {
+            "insert": f"INSERT INTO {tgt_table} ({','.join(col_names)}) VALUES ({placeholders})",
+            "update": f"UPDATE {tgt_table} SET {', '.join(f'{c}=%s' for c in compare_names)} WHERE {where_sql}",
+            "delete": f"DELETE FROM {tgt_table} WHERE {where_sql}"
+        }
+        # Filtreli kaynak tablonun sadece bir kısmını döndürdüğü için silme yapılmaz
+        allow_delete = not filter_sql
+        converters = make_converters(col_maps, tgt_schema, self.get_truncate_policy())
+        sizer = self.make_batch_sizer(
+            BatchSizer.estimate_row_bytes(tgt_schema, [c["target_column"] for c in col_maps])
+        )
+
+        def flush(kind=None):
+            started = time.monotonic()
+            kinds = [k for k in ([kind] if kind else ["delete", "update", "insert"]) if pending[k]]
+
+            def write():
+                cur_w = target_conn.cursor()
+                for k in kinds:
+                    cur_w.executemany(statements[k], pending[k])
+
+            self.write_with_retry(target_conn, tgt_table, write)
+            written = 0
+            for k in kinds:
+                counts[k] += len(pending[k])
+                written += len(pending[k])
+                pending[k] = []
+            sizer.record_commit(written, time.monotonic() - started)
+
+        def emit(kind, params):
+            pending[kind].append(params)
+            if len(pending[kind]) >= sizer.next_size():
+                flush(kind)
+
+        try:
+            cur_s = source_conn.cursor()
+            if filter_params:
+                cur_s.execute(sql_s, filter_params)
+            else:
+                cur_s.execute(sql_s)
+            cur_r = reader_conn.cursor()
+            # Yazıcı bağlantı yalnızca okuyucunun geçtiği anahtarlara dokunur; okuyucunun
+            # kendi yazdıklarımızı beklerken kilitlenmemesi için hedef akış kilitsiz okunur.
+            cur_r.execute("SET TRANSACTION ISOLATION LEVEL READ UNCOMMITTED")
+            cur_r.execute(sql_r)
+
+            def iter_source():
+                # (merge anahtarı, hedef satırı) çiftleri; anahtar ham kaynak değerlerinden.
+                # Hedef satırı None ise satır yazılmaz: silme aşaması ya da dönüştürülemeyen
+                # satır (anahtarı akışta kalır ki hedefteki karşılığı silinmesin).
+                for src_batch in iter_batches(cur_s, columns_to_select, sizer, self.throttle):
+                    self.check_lease()
+                    raw_keys = zip(*[src_batch.columns[src_batch.index[c]] for c in src_keys])
+                    if delete_only:
+                        for raw_key in raw_keys:
+                            yield merge_key(raw_key, as_str), None
+                        continue
+                    invalid = set()
+                    tgt_rows = self.build_target_batch(col_maps, src_batch, converters, invalid).rows()
+                    for pos, raw_key in enumerate(raw_keys):
+                        yield merge_key(raw_key, as_str), None if pos in invalid else next(tgt_rows)
+
+            n_keys = len(key_names)
+            src_iter = iter_source()
+            tgt_iter = iter_stream(cur_r)
+            src_row = next(src_iter, None)
+            tgt_row = next(tgt_iter, None)
+            last_src_key, last_tgt_key = None, None
+            while src_row is not None or tgt_row is not None:
+                src_key = tgt_key = None
+                if src_row is not None:
+                    src_key, src_values = src_row
+                    if src_key == last_src_key:
+                        # Kaynakta tekrar eden anahtar; ilk satır geçerli
+                        src_row = next(src_iter, None)
+                        continue
+                if tgt_row is not None:
+                    tgt_key = merge_key(tgt_row[:n_keys], as_str)
+                    if tgt_key == last_tgt_key:
+                        tgt_row = next(tgt_iter, None)
+                        continue
+
+                if tgt_row is None or (src_row is not None and src_key < tgt_key):
+                    if "insert" in phases and src_values is not None:
+                        emit("insert", src_values)
+                    last_src_key = src_key
+                    src_row = next(src_iter, None)
+                elif src_row is None or tgt_key < src_key:
+                    if allow_delete and "delete" in phases:
+                        emit("delete", tuple(tgt_row[:n_keys]))
+                    last_tgt_key = tgt_key
+                    tgt_row = next(tgt_iter, None)
+                else:
+                    if compare_names and "update" in phases and src_values is not None:
+                        new_vals = [src_values[i] for i in cmp_pos]
+                        if row_hash(new_vals, cmp_cols) != row_hash(tgt_row[n_keys:], cmp_cols):
+                            emit("update", tuple(new_vals + list(tgt_row[:n_keys])))
+                    last_src_key, last_tgt_key = src_key, tgt_key
+                    src_row = next(src_iter, None)
+                    tgt_row = next(tgt_iter, None)
+            flush()
+        except Exception as e:
+            try:
+                target_conn.rollback()
+            except:
+                pass
+            if is_transient_error(e):
+                # Okuma akışı koptu; with_retry grubu baştan çalıştırır
+                raise
+            self.failed_groups += 1
+            self.db_manager.log_message(self.job_id, f"Full sync hatası {src_table} >> {tgt_table}: {str(e)}")
+            self.send_error_mail(f"Full sync hatası {src_table} >> {tgt_table}: {str(e)}")
+        finally:
+            reader_conn.close()
+            self.log_conversion_failures(tgt_table, converters)
+
+        if delete_only:
+            msg = f"{src_table} >> {tgt_table}: {counts['delete']} silindi (silme aşaması)."
+        else:
+            msg = (f"{src_table} >> {tgt_table}: {counts['insert']} eklendi, "
+                   f"{counts['update']} güncellendi, {counts['delete']} silindi.")
+        if not allow_delete:
+            msg += " (Filtre tanımlı olduğu için silme yapılmadı.)"
+        elif "delete" not in phases:
+            msg += " (Silmeler dalgalardan önce ayrı aşamada yapıldı.)"
+        self.db_manager.log_message(self.job_id, msg)
+        return sizer.rows_read
+
+    def get_retry_policy(self):
+        """
+        (deneme sayısı, en uzun bekleme sn); error_retry_seconds bekleme üst sınırıdır.
+        """
+        if self.retry_policy is None:
+            try:
+                count = int(self.db_manager.get_setting("error_retry_count") or "5")
+            except ValueError:
+                count = 5
+            try:
+                cap = float(self.db_manager.get_setting("error_retry_seconds") or "60")
+            except ValueError:
+                cap = 60
+            self.retry_policy = (max(count, 0), max(cap, 0))
+        return self.retry_policy
+
+    def wait_before_retry(self, attempt, label, e):
+        count, cap = self.get_retry_policy()
+        delay = min(cap, 2 ** attempt)
+        self.db_manager.log_message(
+            self.job_id,
+            f"{label}: geçici hata, {delay:g} sn sonra tekrar denenecek ({attempt + 1}/{count}): {str(e)}"
+        )
+        time.sleep(delay)
+
+    def write_with_retry(self, conn, tgt_table, work):
+        """
+        work() hedefe yazar, ardından commit edilir. Geçici hatada rollback ve bekleme
+        (gerekirse yeniden bağlanma) sonrası work baştan çalışır; kalıcı hata fırlatılır.
+        """
+        attempt = 0
+        while True:
+            try:
+                result = work()
+                conn.commit()
+                return result
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except:
+                    pass
+                if not is_transient_error(e) or attempt >= self.get_retry_policy()[0]:
+                    raise
+                self.wait_before_retry(attempt, f"Hedef yazma {tgt_table}", e)
+                conn.ensure_alive()
+                attempt += 1
+
+    def check_lease(self):
+        """
+        Kuyruk kiralaması başka düğüme geçtiyse uzun taramayı batch arasında durdurur.
+        """
+        if self.lease is not None and self.lease.lost:
+            raise RuntimeError("Kuyruk kiralaması başka bir düğüme geçti")
+
+    def with_retry(self, label, fn, conns, retry=True):
+        """
+        fn'i çalıştırır; geçici hatada bağlantıları kontrol edip baştan dener. Kalıcı
+        hata veya tükenen deneme loglanıp mail atılır, None döner.
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                if not retry or not is_transient_error(e) or attempt >= self.get_retry_policy()[0]:
+                    self.failed_groups += 1
+                    self.db_manager.log_message(self.job_id, f"{label}: {str(e)}")
+                    self.send_error_mail(f"{label}: {str(e)}")
+                    return None
+                self.wait_before_retry(attempt, label, e)
+                try:
+                    for conn in conns:
+                        conn.ensure_alive()
+                except Exception as ce:
+                    self.failed_groups += 1
+                    self.db_manager.log_message(self.job_id, f"{label}: yeniden bağlanılamadı: {str(ce)}")
+                    self.send_error_mail(f"{label}: yeniden bağlanılamadı: {str(ce)}")
+                    return None
+                attempt += 1
+
+    def open_connection(self, job_info, side):
+        """
+        İşin kaynak ("source") veya hedef ("target") veritabanına bağlanır. Kaynak
+        oturumuna işin okuma yalıtımı ve sorgu zaman aşımı uygulanır.
+        """
+        if side != "source":
+            return pymssql.connect(
+                server=job_info[f"{side}_server"],
+                user=job_info[f"{side}_user"],
+                password=job_info[f"{side}_password"],
+                database=job_info[f"{side}_db"]
+            )
+        timeout = job_info.get("statement_timeout") or 0
+        replica = job_info.get("source_read_server")
+        try:
+            conn = pymssql.connect(
+                server=replica or job_info["source_server"],
+                user=job_info["source_user"],
+                password=job_info["source_password"],
+                database=job_info["source_db"],
+                timeout=timeout
+            )
+        except Exception as e:
+            if not replica:
+                raise
+            # Replika düştüyse çalışmanın kalanı birincil sunucudan okunur
+            self.db_manager.log_message(self.job_id, f"Replika {replica} bağlantı hatası, birincil sunucuya dönülüyor: {str(e)}")
+            job_info["source_read_server"] = None
+            return self.open_connection(job_info, side)
+        self.apply_read_isolation(conn, job_info.get("read_isolation") or "", timeout)
+        return conn
+
+    def route_source(self, job_info):
+        """
+        Kaynağın kayıtlı bağlantısında okuma replikası varsa sağlıklı olan ilkini seçer
+        (iş id'sine göre döndürülerek replikalar arasında dağıtılır). Ağır taramalar
+        job_info["source_read_server"] üzerinden okunur; tetikleyici ve kontrol DB
+        okumaları etkilenmez. Sağlıklı replika yoksa birincil kullanılır. Filtreler
+        {last_run_date} kullanıyorsa gecikme sınırı (max_replica_lag) zorunludur ve
+        gecikmesi ölçülemeyen replika kullanılmaz; bkz. get_watermark_time.
+        """
+        job_info["source_read_server"] = None
+        try:
+            replicas, max_lag = self.db_manager.get_source_replicas(job_info["source_server"], job_info["source_db"])
+        except Exception:
+            return
+        if not replicas:
+            return
+        incremental = self.uses_watermark()
+        if incremental and not max_lag:
+            self.db_manager.log_message(
+                self.job_id,
+                "Filtreler {last_run_date} kullanıyor ancak bağlantıda replika gecikme sınırı yok; "
+                "kaynak birincil sunucudan okunacak."
+            )
+            return
+        start = self.job_id % len(replicas)
+        for replica in replicas[start:] + replicas[:start]:
+            problem = self.check_replica(job_info, replica, max_lag, require_lag=incremental)
+            if problem is None:
+                job_info["source_read_server"] = replica
+                job_info["source_read_max_lag"] = max_lag
+                return
+            self.db_manager.log_message(self.job_id, f"Replika {replica} kullanılmadı: {problem}")
+        self.db_manager.log_message(self.job_id, "Sağlıklı okuma replikası yok, kaynak birincil sunucudan okunacak.")
+
+    def check_replica(self, job_info, replica, max_lag, require_lag=False):
+        """
+        Replikaya bağlanıp veritabanının çevrimiçi olduğunu ve (AG ise) gecikmenin
+        max_lag saniyeyi aşmadığını denetler; require_lag ise gecikmesi ölçülemeyen
+        replika da reddedilir. Sorun yoksa None, varsa açıklama döner.
+        """
+        try:
+            conn = pymssql.connect(
+                server=replica,
+                user=job_info["source_user"],
+                password=job_info["source_password"],
+                database=job_info["source_db"],
+                login_timeout=5,
+                timeout=10
+            )
+        except Exception as e:
+            return f"bağlanılamadı ({str(e)})"
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT CONVERT(VARCHAR(30), DATABASEPROPERTYEX(DB_NAME(), 'Status'))")
+            status = cur.fetchone()[0]
+            if status != "ONLINE":
+                return f"veritabanı durumu {status}"
+            if max_lag:
+                lag = self.get_replica_lag(conn)
+                if lag is None and require_lag:
+                    return "gecikme ölçülemiyor ({last_run_date} filtresi için gerekli)"
+                if lag is not None and lag > max_lag:
+                    return f"gecikme {lag} sn > {max_lag} sn"
+            return None
+        except Exception as e:
+            return f"sağlık kontrolü hatası ({str(e)})"
+        finally:
+            conn.close()
+
+    def get_replica_lag(self, conn):
+        """
+        AG ikincilinin birincilin gerisinde kaldığı saniye; AG değilse ya da eski sürümse None.
+        """
+        try:
+            cur = conn.cursor()
+            cur.execute("""SELECT secondary_lag_seconds FROM sys.dm_hadr_database_replica_states
+                WHERE is_local = 1 AND database_id = DB_ID()""")
+            row = cur.fetchone()
+        except Exception:
+            return None
+        return row[0] if row and row[0] is not None else None
+
+    def uses_watermark(self):
+        try:
+            return any("{last_run_date}" in (d.get("filter_predicate") or "")
+                       for d in self.get_job_details(self.job_id))
+        except Exception:
+            return True
 
-    def run(self):
-        job_info = self.get_job_info()
-        if not job_info:
-            return
-        if not self.check_triggers(self.job_id):
-            self.db_manager.log_message(self.job_id, "Tetikleyici koşulu sağlanmadığı için aktarım başlatılmadı.")
-            return
+    def apply_read_isolation(self, conn, level, timeout):
+        """
+        Kaynak oturumunun yalıtım seviyesi ve kilit bekleme süresi. SNAPSHOT veritabanında
+        açık değilse READ COMMITTED'a düşülür (RCSI açıksa bu da satır versiyonlu okur).
+        Zaman aşımı/kilit hataları geçici sayılır ve retry politikasına göre beklenip denenir.
+        """
+        cur = conn.cursor()
+        if timeout:
+            cur.execute(f"SET LOCK_TIMEOUT {int(timeout) * 1000}")
+        if level == "snapshot":
+            cur.execute("""SELECT snapshot_isolation_state, is_read_committed_snapshot_on
+                FROM sys.databases WHERE name = DB_NAME()""")
+            snapshot_state, rcsi = cur.fetchone()
+            # Yalıtım seviyesi yeni transaction'da geçerli olsun diye önce açık olan kapatılır
+            conn.commit()
+            if snapshot_state == 1:
+                cur.execute("SET TRANSACTION ISOLATION LEVEL SNAPSHOT")
+            else:
+                self.db_manager.log_message(
+                    self.job_id,
+                    "Kaynakta ALLOW_SNAPSHOT_ISOLATION kapalı, READ COMMITTED " +
+                    ("(RCSI açık, satır versiyonlu) " if rcsi else "(kilitli) ") + "ile okunacak."
+                )
+        elif level == "read_uncommitted":
+            cur.execute("SET TRANSACTION ISOLATION LEVEL READ UNCOMMITTED")
+        conn.commit()
 
+    def record_group_stats(self, src_table, tgt_table, sync_mode, rows_read, started):
+        """
+        Grubun okunan satır sayısı ve süresini planlayıcının hız tahmini için saklar.
+        """
+        seconds = time.monotonic() - started
+        self.task_stats.append((src_table, tgt_table, sync_mode, rows_read, seconds))
         try:
-            source_conn = pymssql.connect(
-                server=job_info["source_server"],
-                user=job_info["source_user"],
-                password=job_info["source_password"],
-                database=job_info["source_db"]
-            )
-        except Exception as e:
-            self.db_manager.log_message(self.job_id, f"Kaynak DB bağlantı hatası: {str(e)}")
-            self.send_error_mail(f"Kaynak DB bağlantı hatası: {str(e)}")
-            return
+            self.db_manager.insert_run_stats(self.job_id, src_table, tgt_table, sync_mode, rows_read, seconds)
+        except Exception:
+            pass
 
+    def get_target_schema(self, target_conn, tgt_table):
+        """
+        Hedef tablonun şemasını grup başına bir kez okur. Okunamazsa None döner;
+        bu durumda yalnızca convert_type dönüşümleri uygulanır.
+        """
         try:
-            target_conn = pymssql.connect(
-                server=job_info["target_server"],
-                user=job_info["target_user"],
-                password=job_info["target_password"],
-                database=job_info["target_db"]
-            )
+            return get_table_schema(target_conn, tgt_table)
         except Exception as e:
-            self.db_manager.log_message(self.job_id, f"Hedef DB bağlantı hatası: {str(e)}")
-            self.send_error_mail(f"Hedef DB bağlantı hatası: {str(e)}")
-            return
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: hedef şeması okunamadı, şema kontrolü yapılmayacak: {str(e)}")
+            return None
 
-        details = self.get_job_details(self.job_id)
-        grouped = {}
-        for d in details:
-            key = (d["source_table"], d["target_table"])
-            grouped.setdefault(key, []).append(d)
+    def make_batch_sizer(self, estimated_row_bytes):
+        try:
+            memory_mb = float(self.db_manager.get_setting("batch_memory_mb") or "64")
+        except ValueError:
+            memory_mb = 64
+        try:
+            commit_seconds = float(self.db_manager.get_setting("batch_commit_seconds") or "2")
+        except ValueError:
+            commit_seconds = 2
+        return BatchSizer(int(memory_mb * 1024 * 1024), commit_seconds, estimated_row_bytes)
 
-        for (src_table, tgt_table), col_maps in grouped.items():
-            key_cols = [c for c in col_maps if c["is_key"]]
-            columns_to_select = [c["source_column"] for c in col_maps if c["source_column"]]
+    def get_truncate_policy(self):
+        return (self.db_manager.get_setting("string_truncation") or "reject") == "truncate"
 
-            try:
-                cur_s = source_conn.cursor(as_dict=True)
-                sql_s = f"SELECT {','.join(columns_to_select)} FROM {src_table}"
-                cur_s.execute(sql_s)
-                rows = cur_s.fetchall()
-            except Exception as e:
-                self.db_manager.log_message(self.job_id, f"Kaynak okuma hatası {src_table}: {str(e)}")
-                self.send_error_mail(f"Kaynak okuma hatası {src_table}: {str(e)}")
+    def log_conversion_failures(self, tgt_table, converters):
+        for conv in converters:
+            if conv is None:
                 continue
+            if conv.failures:
+                self.db_manager.log_message(
+                    self.job_id,
+                    f"{tgt_table}.{conv.target_column}: {conv.failures} değer {conv.convert_type} "
+                    f"tipine dönüştürülemedi, NULL yazıldı."
+                )
+            if conv.truncated:
+                self.db_manager.log_message(
+                    self.job_id,
+                    f"{tgt_table}.{conv.target_column}: {conv.truncated} metin kolon uzunluğuna göre kırpıldı."
+                )
+            if conv.rejected:
+                self.db_manager.log_message(
+                    self.job_id,
+                    f"{tgt_table}.{conv.target_column}: {conv.rejected} satır hedef kolona uymadığı için "
+                    f"aktarılmadı (ör. {conv.reject_reason})."
+                )
 
-            inserted_count = 0
-            for row in rows:
-                if key_cols and self.target_row_exists(target_conn, tgt_table, key_cols, row):
-                    continue
-
-                col_names = []
-                col_values = []
-                for cm in col_maps:
-                    val = None
-                    if cm["fixed_value"]:
-                        if cm["fixed_value"].lower() == "guid":
-                            val = str(uuid.uuid4())
-                        elif cm["fixed_value"].lower() == "null":
-                            val = None
-                        else:
-                            val = cm["fixed_value"]
-                    else:
-                        val = row.get(cm["source_column"], None)
+    def get_group_sync_mode(self, col_maps):
+        """
+        Grubun aktarım modu ("" = sadece yeni kayıt ekle); ilk dolu değer kullanılır.
+        """
+        for cm in col_maps:
+            if (cm.get("sync_mode") or "").strip():
+                return cm["sync_mode"].strip().lower()
+        return ""
 
-                    if not cm.get("convert_type") and val is not None:
-                        # Basit örnek: tip kestirimi
-                        pass
+    def get_group_filter(self, col_maps):
+        """
+        Grubun filtre ifadesi; grup satırlarındaki ilk dolu değer kullanılır.
+        """
+        for cm in col_maps:
+            if (cm.get("filter_predicate") or "").strip():
+                return cm["filter_predicate"]
+        return ""
 
-                    if cm["convert_type"] == "datetime" and isinstance(val, str):
-                        try:
-                            val = datetime.datetime.fromisoformat(val)
-                        except:
-                            try:
-                                val = datetime.datetime.strptime(val, "%Y-%m-%d")
-                            except:
-                                val = None
-                    elif cm["convert_type"] == "int" and val is not None:
-                        try:
-                            val = int(val)
-                        except:
-                            val = None
-                    elif cm["convert_type"] == "float" and val is not None:
-                        try:
-                            val = float(val)
-                        except:
-                            val = None
+    def get_filter_context(self, job_info):
+        """
+        Filtre ifadelerinde kullanılabilecek yer tutucu değerleri.
+        """
+        return {
+            "last_run_date": job_info["last_run_date"] or datetime.datetime(1900, 1, 1),
+            "now": datetime.datetime.now(),
+            "job_id": self.job_id
+        }
 
-                    col_names.append(cm["target_column"])
-                    col_values.append(val)
+    def open_key_index(self, target_conn, tgt_table, key_cols, key_folds=None):
+        """
+        Hedef satır sayısı ayarlanan eşiği geçiyorsa disk tabanlı anahtar indeksini
+        açar; yoksa, eskiyse ya da hedef indeks dışından değiştiyse hedeften oluşturur.
+        Kapalıysa veya hata olursa None döner.
+        """
+        if not self.use_key_index:
+            return None
+        try:
+            min_rows = int(self.db_manager.get_setting("key_index_min_rows") or "0")
+        except ValueError:
+            min_rows = 0
+        if min_rows <= 0:
+            return None
+        try:
+            row_count = get_table_row_count(target_conn, tgt_table)
+            if row_count < min_rows:
+                return None
+            bloom_mb = int(self.db_manager.get_setting("key_index_bloom_mb") or "256")
+            max_age = float(self.db_manager.get_setting("key_index_max_age_hours") or "24")
+            key_index = self.make_key_index(tgt_table, key_cols, key_folds)
+            os.makedirs(os.path.dirname(key_index.db_path) or ".", exist_ok=True)
+            state = get_table_change_state(target_conn, tgt_table)
+            if not key_index.is_valid(tgt_table, max_age, state):
+                self.db_manager.log_message(self.job_id, f"{tgt_table}: disk anahtar indeksi oluşturuluyor ({row_count} satır).")
+                key_index.build(target_conn, tgt_table, row_count, bloom_mb * 1024 * 1024, state)
+            key_index.open()
+            key_index.base_rows = row_count
+            return key_index
+        except Exception as e:
+            self.db_manager.log_message(self.job_id, f"{tgt_table}: disk anahtar indeksi kullanılamadı, satır bazlı kontrol yapılacak: {str(e)}")
+            return None
 
+    def save_key_index_state(self, target_conn, tgt_table, key_index, inserted):
+        """
+        Kendi eklemelerimizden sonraki hedef özetini indekse yazar; sonraki çalışma hedefe
+        bizden sonra yazan oldu mu buna göre anlar. Satır sayısı yalnızca bizim
+        eklediğimiz kadar artmadıysa çalışma sırasında başkası da yazmıştır: özet
+        geçersiz yazılır ve indeks sonraki açılışta yeniden oluşturulur.
+        """
+        try:
+            state = get_table_change_state(target_conn, tgt_table)
+            if state is not None and int(state.split(":")[0]) != key_index.base_rows + inserted:
+                state = None
+            key_index.set_state(state)
+        except Exception:
+            pass
+
+    def make_key_index(self, tgt_table, key_cols, key_folds=None):
+        index_dir = self.db_manager.get_setting("key_index_dir") or "key_index"
+        safe_table = re.sub(r"[^A-Za-z0-9_.]", "_", tgt_table)
+        key_names = [c["target_column"] for c in key_cols]
+        return DiskKeyIndex(os.path.join(index_dir, f"{self.key_index_name}_{safe_table}"), key_names, key_folds)
+
+    def drop_job_key_indexes(self):
+        """
+        İşin tüm disk anahtar indekslerini (shard'lar ve eski kaynak başına olanlar dahil) siler.
+        """
+        index_dir = self.db_manager.get_setting("key_index_dir") or "key_index"
+        try:
+            names = os.listdir(index_dir)
+        except OSError:
+            return
+        for name in names:
+            if name.startswith(f"job{self.job_id}_") and name.endswith((".sqlite", ".bloom")):
                 try:
-                    cur_t = target_conn.cursor()
-                    placeholders = ",".join(["%s"] * len(col_values))
-                    sql_t = f"INSERT INTO {tgt_table} ({','.join(col_names)}) VALUES ({placeholders})"
-                    cur_t.execute(sql_t, tuple(col_values))
-                    target_conn.commit()
-                    inserted_count += 1
-                except Exception as e:
-                    self.db_manager.log_message(self.job_id, f"Hedef insert hatası {tgt_table}: {str(e)}")
-                    self.send_error_mail(f"Hedef insert hatası {tgt_table}: {str(e)}")
-                    continue
+                    os.remove(os.path.join(index_dir, name))
+                except OSError:
+                    pass
 
-            self.db_manager.log_message(self.job_id, f"{src_table} >> {tgt_table}: {inserted_count} kayıt.")
-        source_conn.close()
-        target_conn.close()
-        self.update_job_last_run_date(self.job_id)
-        self.db_manager.log_message(self.job_id, "Aktarım tamamlandı.")
+    def drop_key_index(self, tgt_table, key_cols):
+        try:
+            self.make_key_index(tgt_table, key_cols).remove()
+        except Exception:
+            pass
 
-    def target_row_exists(self, conn, table, key_cols, src_row):
-        conds, vals = [], []
-        for c in key_cols:
-            if c["fixed_value"]:
-                fv = c["fixed_value"]
-                val = None if fv.lower() in ["guid", "null"] else fv
-            else:
-                val = src_row.get(c["source_column"])
-            conds.append(f"{c['target_column']}=%s")
-            vals.append(val)
-        sql = f"SELECT COUNT(*) FROM {table} WHERE {' AND '.join(conds)}"
+    def target_row_exists(self, conn, sql, vals):
         try:
             cur = conn.cursor()
             cur.execute(sql, tuple(vals))
@@ -572,9 +4435,32 @@ class TransferJobRunner:
             conn.close()
             return False
 
-    def update_job_last_run_date(self, job_id):
+    def get_server_time(self, conn):
+        cur = conn.cursor()
+        cur.execute("SELECT GETDATE()")
+        return cur.fetchone()[0]
+
+    def get_watermark_time(self, conn, job_info):
+        """
+        Çalışmanın watermark'ı olarak kaynak sunucu saati. Replikadan okunuyorsa birincilde
+        commit edilip replikaya henüz gelmemiş satırlar sonraki çalışmada okunsun diye
+        ölçülen gecikme (ölçülemezse gecikme sınırı) kadar geri çekilir.
+        """
+        now = self.get_server_time(conn)
+        if job_info.get("source_read_server"):
+            lag = self.get_replica_lag(conn)
+            if lag is None:
+                lag = job_info.get("source_read_max_lag") or 0
+            now -= datetime.timedelta(seconds=lag)
+        return now
+
+    def update_job_last_run_date(self, job_id, run_started):
+        """
+        last_run_date'i çalışmanın başladığı ana (kaynak sunucu saati) çeker; bitiş anı
+        yazılsaydı çalışma sırasında değişen satırlar bir daha okunmazdı.
+        """
         cr = self.db_manager.conn.cursor()
-        cr.execute("UPDATE TransferJobs SET last_run_date=GETDATE() WHERE job_id=%s", (job_id,))
+        cr.execute("UPDATE TransferJobs SET last_run_date=%s WHERE job_id=%s", (run_started, job_id))
         self.db_manager.conn.commit()
 
     def send_error_mail(self, message):
@@ -598,6 +4484,293 @@ class TransferJobRunner:
         except Exception as e:
             print("Mail gönderirken hata:", e)
 
+###############################################################################
+# ÇOK İŞLEMLİ ÇALIŞTIRMA
+###############################################################################
+# Her çalışan işlemin kendi kontrol DB bağlantısı (pymssql bağlantıları işlemler arası taşınamaz)
+WORKER_DB_MANAGER = None
+
+def init_worker_process():
+    global WORKER_DB_MANAGER
+    WORKER_DB_MANAGER = DatabaseManager(ConfigManager())
+
+def run_task_chain(job_id, plan_version, task_indexes, readers=1):
+    """
+    ProcessPoolExecutor hedefi; modül seviyesinde olmalı ki Windows'ta (spawn) pickle edilebilsin.
+    """
+    return TransferJobRunner(WORKER_DB_MANAGER, job_id).run_task_chain(plan_version, task_indexes, readers)
+
+###############################################################################
+# AKTARIM KUYRUĞU (ÇOK DÜĞÜM)
+###############################################################################
+class LeaseHeartbeat(threading.Thread):
+    """
+    Çalışan kuyruk kaydının kiralamasını arka planda düzenli olarak uzatır.
+    """
+    def __init__(self, db_manager: DatabaseManager, queue_id, node_id, lease_seconds):
+        super().__init__(daemon=True)
+        self.db_manager = db_manager
+        self.queue_id = queue_id
+        self.node_id = node_id
+        self.lease_seconds = lease_seconds
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        try:
+            while not self.stopped.wait(max(self.lease_seconds / 3.0, 1)):
+                try:
+                    renewed = self.db_manager.heartbeat_queued_job(self.queue_id, self.node_id, self.lease_seconds)
+                except Exception as e:
+                    # Kontrol DB geçici olarak yoksa kiralama dolana kadar denemeye devam edilir
+                    print("Kuyruk heartbeat hatası:", e)
+                    self.db_manager.invalidate()
+                    continue
+                if not renewed:
+                    self.lost = True
+                    return
+        finally:
+            self.db_manager.release_local()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class TransferQueueWorker:
+    """
+    TransferQueue üzerinden iş alıp çalıştırır. Aynı kontrol DB'yi kullanan her
+    instance bir worker'dır; bir iş yalnızca onu claim eden düğümde çalışır.
+    """
+    def __init__(self, db_manager: DatabaseManager, node_id=NODE_ID):
+        self.db_manager = db_manager
+        self.node_id = node_id
+
+    def get_lease_seconds(self):
+        try:
+            return max(int(self.db_manager.get_setting("queue_lease_seconds") or QUEUE_LEASE_SECONDS), 30)
+        except ValueError:
+            return QUEUE_LEASE_SECONDS
+
+    def enqueue(self, job_ids, min_interval_seconds=0):
+        for job_id in job_ids:
+            try:
+                self.db_manager.enqueue_job(job_id, min_interval_seconds)
+            except Exception as e:
+                print("Kuyruğa eklenirken hata:", e)
+                self.db_manager.invalidate()
+
+    def run_pending(self):
+        """
+        Kuyrukta alınabilecek iş kalmayana kadar claim edip çalıştırır; çalışan iş sayısını döner.
+        """
+        lease_seconds = self.get_lease_seconds()
+        count = 0
+        while True:
+            claimed = self.db_manager.claim_queued_job(self.node_id, lease_seconds)
+            if not claimed:
+                return count
+            queue_id, job_id = claimed
+            lease = LeaseHeartbeat(self.db_manager, queue_id, self.node_id, lease_seconds)
+            runner = TransferJobRunner(self.db_manager, job_id)
+            runner.lease = lease
+            lease.start()
+            status, message = "done", None
+            try:
+                runner.run()
+                if runner.failed_groups:
+                    status, message = "failed", f"{runner.failed_groups} hatalı grup/kaynak, ayrıntılar logda"
+            except Exception as e:
+                status, message = "failed", str(e)
+                self.db_manager.invalidate()
+                self.db_manager.log_message(job_id, f"Kuyruk işi hata ile bitti ({self.node_id}): {message}")
+            finally:
+                lease.stop()
+            if lease.lost:
+                # Kayıt başka düğüme geçti; durumu o düğüm yazar
+                continue
+            self.db_manager.complete_queued_job(queue_id, self.node_id, status, message)
+            count += 1
+
+###############################################################################
+# AKTARIM PLANI (DRY-RUN)
+###############################################################################
+class TransferPlanner:
+    """
+    Bir işi veri taşımadan inceler: her grup için satır sayıları, tekrar kontrolünde
+    kullanılacak anahtar/indeks, seçilen strateji ve geçmiş hıza göre süre tahmini.
+    """
+    def __init__(self, db_manager: DatabaseManager, job_id):
+        self.db_manager = db_manager
+        self.job_id = job_id
+        self.runner = TransferJobRunner(db_manager, job_id)
+
+    def plan(self):
+        """
+        Kaynaklara çalıştırmadaki yoldan bağlanır: çoklu kaynak işinde source_conn_ids'teki
+        her bağlantıya, okuma replikası varsa (route_source) replikaya. Kaynak satır
+        sayıları kaynaklar üzerinden toplanır.
+        """
+        job_info = self.runner.get_job_info()
+        if not job_info:
+            return []
+        multi = bool((job_info.get("source_conn_ids") or "").strip())
+        if multi:
+            sources = [(saved["conn_name"], self.runner.make_source_info(job_info, saved))
+                       for saved in self.runner.get_job_sources(job_info)]
+            if not sources:
+                raise RuntimeError("Çoklu kaynak işi için geçerli kaynak bağlantısı yok.")
+        else:
+            sources = [("", job_info)]
+        target_conn = self.runner.open_connection(job_info, "target")
+        source_conns, failures = [], []
+        try:
+            for label, src_info in sources:
+                self.runner.route_source(src_info)
+                try:
+                    source_conns.append((label, self.runner.open_connection(src_info, "source")))
+                except Exception as e:
+                    if not multi:
+                        raise
+                    failures.append(f"[{label}] kaynağına bağlanılamadı, satır sayısına dahil değil: {str(e)}")
+            if not source_conns:
+                raise RuntimeError("Kaynaklara bağlanılamadı: " + "; ".join(failures))
+
+            grouped = {}
+            for d in self.runner.get_job_details(self.job_id):
+                grouped.setdefault((d["source_table"], d["target_table"]), []).append(d)
+            plan = []
+            for (src_table, tgt_table), col_maps in grouped.items():
+                item = self.plan_group(source_conns, target_conn, src_table, tgt_table, col_maps, multi)
+                item["notes"][:0] = failures
+                plan.append(item)
+            return plan
+        finally:
+            for _, conn in source_conns:
+                conn.close()
+            target_conn.close()
+
+    def plan_group(self, source_conns, target_conn, src_table, tgt_table, col_maps, multi=False):
+        """
+        source_conns: [(kaynak adı, bağlantı)]; çoklu kaynakta satır sayıları toplanır,
+        indeksler (şema aynı olduğu için) ilk kaynaktan okunur.
+        """
+        sync_mode = self.runner.get_group_sync_mode(col_maps)
+        filter_predicate = self.runner.get_group_filter(col_maps)
+        key_names = [c["target_column"] for c in col_maps if c["is_key"]]
+        item = {
+            "source_table": src_table,
+            "target_table": tgt_table,
+            "sync_mode": sync_mode,
+            "filter": filter_predicate,
+            "keys": key_names,
+            "source_rows": None,
+            "target_rows": None,
+            "key_index": None,
+            "strategy": "",
+            "estimate_seconds": None,
+            "notes": []
+        }
+        notes = item["notes"]
+        source_rows, counted = 0, 0
+        for label, conn in source_conns:
+            try:
+                source_rows += get_table_row_count(conn, src_table)
+                counted += 1
+            except Exception as e:
+                notes.append(f"Kaynak satır sayısı okunamadı{f' [{label}]' if label else ''}: {str(e)}")
+        if counted:
+            item["source_rows"] = source_rows
+        if multi:
+            notes.append(f"Kaynak satır sayısı {counted} kaynağın toplamıdır.")
+            if sync_mode == "full_sync":
+                notes.append("full_sync çoklu kaynakta desteklenmez: grup çalıştırmada atlanır (upsert kullanın).")
+        try:
+            item["target_rows"] = get_table_row_count(target_conn, tgt_table)
+        except Exception as e:
+            notes.append(f"Hedef satır sayısı okunamadı: {str(e)}")
+        try:
+            target_indexes = get_table_indexes(target_conn, tgt_table)
+            source_indexes = get_table_indexes(source_conns[0][1], src_table)
+        except Exception as e:
+            target_indexes, source_indexes = {}, {}
+            notes.append(f"İndeks bilgisi okunamadı: {str(e)}")
+        if key_names:
+            item["key_index"] = find_covering_index(target_indexes, key_names)
+
+        item["strategy"] = self.describe_strategy(sync_mode, key_names, item["target_rows"])
+        if key_names and not item["key_index"]:
+            if sync_mode == "full_sync":
+                notes.append("Hedefte anahtar indeksi yok: hedef her çalışmada anahtara göre sıralanır.")
+            elif sync_mode == "upsert" or not self.uses_key_index(item["target_rows"]):
+                notes.append("Hedefte anahtar indeksi yok: anahtar kontrolleri tablo taraması yapar.")
+        if sync_mode in ("upsert", "full_sync") and not key_names:
+            notes.append(f"{sync_mode} için is_key kolonu yok: grup çalıştırmada atlanır.")
+        if filter_predicate:
+            leading = {cols[0] for cols in source_indexes.values() if cols}
+            used = {w.lower() for w in re.findall(r"[A-Za-z_][A-Za-z0-9_]*", FILTER_PLACEHOLDER_RE.sub("", filter_predicate))}
+            if not leading & used:
+                notes.append("Filtre kolonlarında kaynak indeksi yok: tam tablo taraması yapılır.")
+            notes.append("Filtre tanımlı: kaynak satır sayısı üst sınırdır.")
+        elif sync_mode != "full_sync":
+            notes.append("Filtre yok: her çalışmada kaynak tablonun tamamı okunur.")
+
+        # Hız geçmişi kaynaktan okunan satırla kaydedilir (full_sync'te hedef taraması da bu süreye dahil)
+        rows_to_read = item["source_rows"] or 0
+        throughput = self.db_manager.get_throughput(src_table, tgt_table, sync_mode)
+        if throughput:
+            item["estimate_seconds"] = rows_to_read / throughput
+        else:
+            notes.append("Geçmiş çalışma verisi yok: süre tahmin edilemedi.")
+        return item
+
+    def advise_key_indexes(self, create=False):
+        """
+        Tekrar kontrolü yapan grupların hedeflerinde anahtar indeksi kapsamını denetler;
+        create verilirse eksik indeksleri oluşturur.
+        """
+        job_info = self.runner.get_job_info()
+        if not job_info:
+            return []
+        target_conn = self.runner.open_connection(job_info, "target")
+        grouped = {}
+        for d in self.runner.get_job_details(self.job_id):
+            grouped.setdefault(d["target_table"], []).append(d)
+        results = []
+        try:
+            for tgt_table, col_maps in grouped.items():
+                key_names = []
+                for c in col_maps:
+                    if c["is_key"] and c["target_column"] not in key_names:
+                        key_names.append(c["target_column"])
+                if key_names:
+                    results.append(self.runner.check_key_index(target_conn, tgt_table, key_names, create))
+        finally:
+            target_conn.close()
+        return results
+
+    def uses_key_index(self, target_rows):
+        try:
+            min_rows = int(self.db_manager.get_setting("key_index_min_rows") or "0")
+        except ValueError:
+            min_rows = 0
+        return min_rows > 0 and target_rows is not None and target_rows >= min_rows
+
+    def describe_strategy(self, sync_mode, key_names, target_rows):
+        if sync_mode == "full_sync":
+            return "full_sync: anahtara göre sıralı merge-join (insert/update/delete)"
+        if sync_mode == "upsert":
+            return "upsert: toplu hash karşılaştırması (insert/update)"
+        if sync_mode == "bulk_load":
+            if target_rows:
+                return "bulk_load: hedef boş değil, tekrar kontrollü insert"
+            return "bulk_load: TABLOCK ile büyük batch'ler (minimal loglama)"
+        if not key_names:
+            return "insert: anahtar yok, tüm satırlar eklenir"
+        if self.uses_key_index(target_rows):
+            return "insert: disk anahtar indeksi ile tekrar kontrolü"
+        return "insert: satır bazlı hedef sorgusu ile tekrar kontrolü"
+
 ###############################################################################
 # KAYITLI VERİTABANLARI YÖNETİM DİYALOĞU
 ###############################################################################
@@ -720,12 +4893,17 @@ class SavedDBEditDialog(QtWidgets.QDialog):
         self.le_pass.setEchoMode(QLineEdit.Password)
         self.le_db = QLineEdit()
         self.le_port = QLineEdit()
+        self.le_replicas = QLineEdit()
+        self.le_replicas.setPlaceholderText("örn: sql-ro1,sql-ro2:1433")
+        self.le_replica_lag = QLineEdit("0")
         layout.addRow("Bağlantı Adı:", self.le_name)
         layout.addRow("Sunucu:", self.le_server)
         layout.addRow("Kullanıcı:", self.le_user)
         layout.addRow("Şifre:", self.le_pass)
         layout.addRow("Veritabanı Adı:", self.le_db)
         layout.addRow("Port:", self.le_port)
+        layout.addRow("Okuma Replikaları (virgülle):", self.le_replicas)
+        layout.addRow("Maks. Replika Gecikmesi (sn, 0=kontrol yok):", self.le_replica_lag)
 
         btn_ok = QPushButton("Kaydet")
         btn_ok.clicked.connect(self.on_save)
@@ -745,6 +4923,8 @@ class SavedDBEditDialog(QtWidgets.QDialog):
             self.le_pass.setText(row["passw"] or "")
             self.le_db.setText(row["dbname"] or "")
             self.le_port.setText(str(row["port"]) if row["port"] else "")
+            self.le_replicas.setText(row["replica_servers"] or "")
+            self.le_replica_lag.setText(str(row["max_replica_lag"] or 0))
 
     def on_save(self):
         data = {
@@ -753,7 +4933,9 @@ class SavedDBEditDialog(QtWidgets.QDialog):
             "username": self.le_user.text().strip(),
             "passw": self.le_pass.text().strip(),
             "dbname": self.le_db.text().strip(),
-            "port": int(self.le_port.text()) if self.le_port.text().isdigit() else 1433
+            "port": int(self.le_port.text()) if self.le_port.text().isdigit() else 1433,
+            "replica_servers": ",".join(r.strip() for r in self.le_replicas.text().split(",") if r.strip()),
+            "max_replica_lag": int(self.le_replica_lag.text()) if self.le_replica_lag.text().isdigit() else 0
         }
         if not data["conn_name"]:
             QMessageBox.warning(self, "Uyarı", "Bağlantı Adı boş olamaz.")
@@ -908,6 +5090,19 @@ class EditJobDialog(QtWidgets.QDialog):
         self.le_target_pass = QLineEdit()
         self.le_target_pass.setEchoMode(QLineEdit.Password)
         self.le_target_db = QLineEdit()
+        self.cbo_read_isolation = QComboBox()
+        for value, label in READ_ISOLATION_LEVELS:
+            self.cbo_read_isolation.addItem(label, value)
+        self.le_statement_timeout = QLineEdit("0")
+        self.le_source_conn_ids = QLineEdit()
+        self.le_source_conn_ids.setPlaceholderText("boş = yukarıdaki tek kaynak; örn: 3,4,7")
+        self.le_shard_conn_ids = QLineEdit()
+        self.le_shard_conn_ids.setPlaceholderText("boş = shard yok; örn: 5,6,8")
+        self.le_shard_columns = QLineEdit()
+        self.cbo_shard_method = QComboBox()
+        self.cbo_shard_method.addItems(SHARD_METHODS)
+        self.le_shard_bounds = QLineEdit()
+        self.le_shard_bounds.setPlaceholderText("range için shard sayısı-1 artan üst sınır; örn: 10000,20000")
 
         form_top.addRow("İş Adı:", self.le_job_name)
         form_top.addRow("Kaynak Server:", self.le_source_server)
@@ -919,6 +5114,13 @@ class EditJobDialog(QtWidgets.QDialog):
         form_top.addRow("Hedef Kullanıcı:", self.le_target_user)
         form_top.addRow("Hedef Şifre:", self.le_target_pass)
         form_top.addRow("Hedef DB:", self.le_target_db)
+        form_top.addRow("Kaynak Okuma Yalıtımı:", self.cbo_read_isolation)
+        form_top.addRow("Kaynak Sorgu Zaman Aşımı (sn, 0=yok):", self.le_statement_timeout)
+        form_top.addRow("Çoklu Kaynak (Kayıtlı Bağlantı ID'leri):", self.le_source_conn_ids)
+        form_top.addRow("Shard Hedefleri (Kayıtlı Bağlantı ID'leri):", self.le_shard_conn_ids)
+        form_top.addRow("Shard Kolonları (hedef, virgülle):", self.le_shard_columns)
+        form_top.addRow("Shard Yöntemi:", self.cbo_shard_method)
+        form_top.addRow("Range Sınırları:", self.le_shard_bounds)
 
         main_layout.addLayout(form_top)
 
@@ -932,10 +5134,11 @@ class EditJobDialog(QtWidgets.QDialog):
 
         # Mapping
         self.tbl_details = QTableWidget()
-        self.tbl_details.setColumnCount(8)
+        self.tbl_details.setColumnCount(11)
         self.tbl_details.setHorizontalHeaderLabels([
             "Kaynak Tablo", "Kaynak Sütun", "Hedef Tablo", "Hedef Sütun",
-            "Sabit Tip", "Sabit Değer", "Convert Type", "is_key"
+            "Sabit Tip", "Sabit Değer", "Convert Type", "is_key", "Filtre (WHERE)", "Aktarım Modu",
+            "İndeks/FK Askıya Al"
         ])
         self.tbl_details.horizontalHeader().setStretchLastSection(True)
         self.tbl_details.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
@@ -981,6 +5184,13 @@ class EditJobDialog(QtWidgets.QDialog):
             self.le_target_user.setText(row["target_user"] or "")
             self.le_target_pass.setText(row["target_password"] or "")
             self.le_target_db.setText(row["target_db"] or "")
+            self.cbo_read_isolation.setCurrentIndex(max(self.cbo_read_isolation.findData(row["read_isolation"] or ""), 0))
+            self.le_statement_timeout.setText(str(row["statement_timeout"] or 0))
+            self.le_source_conn_ids.setText(row["source_conn_ids"] or "")
+            self.le_shard_conn_ids.setText(row["shard_conn_ids"] or "")
+            self.le_shard_columns.setText(row["shard_columns"] or "")
+            self.cbo_shard_method.setCurrentIndex(max(self.cbo_shard_method.findText(row["shard_method"] or "hash"), 0))
+            self.le_shard_bounds.setText(row["shard_bounds"] or "")
 
         cr.execute("SELECT * FROM TransferJobDetails WHERE job_id=%s", (self.job_id,))
         details = cr.fetchall()
@@ -1130,6 +5340,23 @@ class EditJobDialog(QtWidgets.QDialog):
         cb_key.setCurrentText("True" if d.get("is_key") else "False")
         self.tbl_details.setCellWidget(row, 7, cb_key)
 
+        # Filtre (kaynak sorgusuna WHERE olarak eklenir)
+        le_filter = QLineEdit(d.get("filter_predicate") or "")
+        le_filter.setPlaceholderText("örn: ModifiedDate > {last_run_date}")
+        self.tbl_details.setCellWidget(row, 8, le_filter)
+
+        # Aktarım modu ("" = sadece yeni kayıt, upsert = değişenleri de güncelle)
+        cb_mode = QComboBox()
+        cb_mode.addItems(SYNC_MODES)
+        cb_mode.setCurrentText(d.get("sync_mode") or "")
+        self.tbl_details.setCellWidget(row, 9, cb_mode)
+
+        # Yükleme süresince hedefin nonclustered indeksleri kapatılır, FK'ler NOCHECK yapılır
+        cb_suspend = QComboBox()
+        cb_suspend.addItems(["False", "True"])
+        cb_suspend.setCurrentText("True" if d.get("suspend_constraints") else "False")
+        self.tbl_details.setCellWidget(row, 10, cb_suspend)
+
         # Sütunları güncelle
         self.update_source_columns(row)
         self.update_target_columns(row)
@@ -1228,6 +5455,18 @@ class EditJobDialog(QtWidgets.QDialog):
         cb_key = self.tbl_details.cellWidget(row, 7)
         data["is_key"] = True if cb_key and cb_key.currentText() == "True" else False
 
+        # Filtre
+        le_filter = self.tbl_details.cellWidget(row, 8)
+        data["filter_predicate"] = le_filter.text() if le_filter else ""
+
+        # Aktarım modu
+        cb_mode = self.tbl_details.cellWidget(row, 9)
+        data["sync_mode"] = cb_mode.currentText() if cb_mode else ""
+
+        # İndeks/FK askıya alma
+        cb_suspend = self.tbl_details.cellWidget(row, 10)
+        data["suspend_constraints"] = True if cb_suspend and cb_suspend.currentText() == "True" else False
+
         # Yeni satır ekle
         new_row = self.tbl_details.rowCount()
         self.tbl_details.insertRow(new_row)
@@ -1239,7 +5478,10 @@ class EditJobDialog(QtWidgets.QDialog):
             "target_column": data["target_column"],
             "fixed_value": data["fixed_value"],
             "convert_type": data["convert_type"],
-            "is_key": data["is_key"]
+            "is_key": data["is_key"],
+            "filter_predicate": data["filter_predicate"],
+            "sync_mode": data["sync_mode"],
+            "suspend_constraints": data["suspend_constraints"]
         })
 
     def on_add_row(self):
@@ -1253,7 +5495,10 @@ class EditJobDialog(QtWidgets.QDialog):
             "target_column": "",
             "fixed_value": "GUID",  # default
             "convert_type": "",
-            "is_key": False
+            "is_key": False,
+            "filter_predicate": "",
+            "sync_mode": "",
+            "suspend_constraints": False
         }
         self.set_mapping_row(row, d)
 
@@ -1273,6 +5518,13 @@ class EditJobDialog(QtWidgets.QDialog):
             "target_user": self.le_target_user.text().strip(),
             "target_password": self.le_target_pass.text().strip(),
             "target_db": self.le_target_db.text().strip(),
+            "read_isolation": self.cbo_read_isolation.currentData(),
+            "statement_timeout": int(self.le_statement_timeout.text()) if self.le_statement_timeout.text().strip().isdigit() else 0,
+            "source_conn_ids": ",".join(p.strip() for p in self.le_source_conn_ids.text().split(",") if p.strip().isdigit()),
+            "shard_conn_ids": ",".join(p.strip() for p in self.le_shard_conn_ids.text().split(",") if p.strip().isdigit()),
+            "shard_columns": self.le_shard_columns.text().strip(),
+            "shard_method": self.cbo_shard_method.currentText(),
+            "shard_bounds": self.le_shard_bounds.text().strip()
         }
         self.db_manager.update_transfer_job(self.job_id, job_data)
 
@@ -1286,6 +5538,9 @@ class EditJobDialog(QtWidgets.QDialog):
             le_fixed = self.tbl_details.cellWidget(i, 5)
             cb_conv = self.tbl_details.cellWidget(i, 6)
             cb_key = self.tbl_details.cellWidget(i, 7)
+            le_filter = self.tbl_details.cellWidget(i, 8)
+            cb_mode = self.tbl_details.cellWidget(i, 9)
+            cb_suspend = self.tbl_details.cellWidget(i, 10)
 
             src_table = cb_stab.currentText() if cb_stab else ""
             src_col = cb_scol.currentText() if cb_scol else ""
@@ -1305,6 +5560,9 @@ class EditJobDialog(QtWidgets.QDialog):
 
             conv_type = cb_conv.currentText() if cb_conv else ""
             key_str = cb_key.currentText() if cb_key else "False"
+            filter_pred = le_filter.text().strip() if le_filter else ""
+            sync_mode = cb_mode.currentText() if cb_mode else ""
+            suspend_str = cb_suspend.currentText() if cb_suspend else "False"
 
             d = {
                 "job_id": self.job_id,
@@ -1314,7 +5572,10 @@ class EditJobDialog(QtWidgets.QDialog):
                 "target_column": tgt_col,
                 "fixed_value": fixed_val if fixed_val else None,
                 "convert_type": conv_type if conv_type else None,
-                "is_key": (key_str == "True")
+                "is_key": (key_str == "True"),
+                "filter_predicate": filter_pred if filter_pred else None,
+                "sync_mode": sync_mode if sync_mode else None,
+                "suspend_constraints": (suspend_str == "True")
             }
             details_list.append(d)
 
@@ -1381,6 +5642,15 @@ class TransferWizard(QtWidgets.QDialog):
         layout1.addRow("Kaynak Şifre:", self.le_source_pass)
         layout1.addRow("Kaynak DB Adı:", self.le_source_db)
         layout1.addRow("Kaynak Port:", self.le_source_port)
+        self.cbo_read_isolation = QComboBox()
+        for value, label in READ_ISOLATION_LEVELS:
+            self.cbo_read_isolation.addItem(label, value)
+        self.le_statement_timeout = QLineEdit("0")
+        layout1.addRow("Kaynak Okuma Yalıtımı:", self.cbo_read_isolation)
+        layout1.addRow("Kaynak Sorgu Zaman Aşımı (sn, 0=yok):", self.le_statement_timeout)
+        self.le_source_conn_ids = QLineEdit()
+        self.le_source_conn_ids.setPlaceholderText("boş = yukarıdaki tek kaynak; örn: 3,4,7")
+        layout1.addRow("Çoklu Kaynak (Kayıtlı Bağlantı ID'leri):", self.le_source_conn_ids)
 
         self.stacked.addWidget(self.page1)
 
@@ -1406,6 +5676,17 @@ class TransferWizard(QtWidgets.QDialog):
         layout2.addRow("Hedef Şifre:", self.le_target_pass)
         layout2.addRow("Hedef DB Adı:", self.le_target_db)
         layout2.addRow("Hedef Port:", self.le_target_port)
+        self.le_shard_conn_ids = QLineEdit()
+        self.le_shard_conn_ids.setPlaceholderText("boş = shard yok; örn: 5,6,8")
+        self.le_shard_columns = QLineEdit()
+        self.cbo_shard_method = QComboBox()
+        self.cbo_shard_method.addItems(SHARD_METHODS)
+        self.le_shard_bounds = QLineEdit()
+        self.le_shard_bounds.setPlaceholderText("range için shard sayısı-1 artan üst sınır; örn: 10000,20000")
+        layout2.addRow("Shard Hedefleri (Kayıtlı Bağlantı ID'leri):", self.le_shard_conn_ids)
+        layout2.addRow("Shard Kolonları (hedef, virgülle):", self.le_shard_columns)
+        layout2.addRow("Shard Yöntemi:", self.cbo_shard_method)
+        layout2.addRow("Range Sınırları:", self.le_shard_bounds)
 
         self.stacked.addWidget(self.page2)
 
@@ -1420,10 +5701,11 @@ class TransferWizard(QtWidgets.QDialog):
         vlay3.addLayout(hbox_btns)
 
         self.tbl_map = QTableWidget()
-        self.tbl_map.setColumnCount(8)
+        self.tbl_map.setColumnCount(11)
         self.tbl_map.setHorizontalHeaderLabels([
             "Kaynak Tablo", "Kaynak Sütun", "Hedef Tablo", "Hedef Sütun",
-            "Sabit Tip", "Sabit Değer", "Convert Type", "is_key"
+            "Sabit Tip", "Sabit Değer", "Convert Type", "is_key", "Filtre (WHERE)", "Aktarım Modu",
+            "İndeks/FK Askıya Al"
         ])
         self.tbl_map.horizontalHeader().setStretchLastSection(True)
         self.tbl_map.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
@@ -1616,6 +5898,15 @@ class TransferWizard(QtWidgets.QDialog):
         # is_key
         cb_key = self.tbl_map.cellWidget(row, 7)
         d["is_key"] = (cb_key.currentText() == "True") if cb_key else False
+        # Filtre
+        le_filter = self.tbl_map.cellWidget(row, 8)
+        d["filter_predicate"] = le_filter.text() if le_filter else ""
+        # Aktarım modu
+        cb_mode = self.tbl_map.cellWidget(row, 9)
+        d["sync_mode"] = cb_mode.currentText() if cb_mode else ""
+        # İndeks/FK askıya alma
+        cb_suspend = self.tbl_map.cellWidget(row, 10)
+        d["suspend_constraints"] = (cb_suspend.currentText() == "True") if cb_suspend else False
         return d
 
     def populate_map_row(self, row, d):
@@ -1713,6 +6004,23 @@ class TransferWizard(QtWidgets.QDialog):
         cb_key.setCurrentText("True" if d["is_key"] else "False")
         self.tbl_map.setCellWidget(row, 7, cb_key)
 
+        # Filtre (kaynak sorgusuna WHERE olarak eklenir)
+        le_filter = QLineEdit(d.get("filter_predicate") or "")
+        le_filter.setPlaceholderText("örn: ModifiedDate > {last_run_date}")
+        self.tbl_map.setCellWidget(row, 8, le_filter)
+
+        # Aktarım modu ("" = sadece yeni kayıt, upsert = değişenleri de güncelle)
+        cb_mode = QComboBox()
+        cb_mode.addItems(SYNC_MODES)
+        cb_mode.setCurrentText(d.get("sync_mode") or "")
+        self.tbl_map.setCellWidget(row, 9, cb_mode)
+
+        # Yükleme süresince hedefin nonclustered indeksleri kapatılır, FK'ler NOCHECK yapılır
+        cb_suspend = QComboBox()
+        cb_suspend.addItems(["False", "True"])
+        cb_suspend.setCurrentText("True" if d.get("suspend_constraints") else "False")
+        self.tbl_map.setCellWidget(row, 10, cb_suspend)
+
         # Sütun listesi doldurma
         self.update_source_columns(row)
         self.update_target_columns(row)
@@ -1759,7 +6067,10 @@ class TransferWizard(QtWidgets.QDialog):
             "target_column": "",
             "fixed_value": "GUID",
             "convert_type": "",
-            "is_key": False
+            "is_key": False,
+            "filter_predicate": "",
+            "sync_mode": "",
+            "suspend_constraints": False
         }
         self.populate_map_row(row, d)
 
@@ -1784,6 +6095,13 @@ class TransferWizard(QtWidgets.QDialog):
             "target_user": self.le_target_user.text().strip(),
             "target_password": self.le_target_pass.text().strip(),
             "target_db": self.le_target_db.text().strip(),
+            "read_isolation": self.cbo_read_isolation.currentData(),
+            "statement_timeout": int(self.le_statement_timeout.text()) if self.le_statement_timeout.text().strip().isdigit() else 0,
+            "source_conn_ids": ",".join(p.strip() for p in self.le_source_conn_ids.text().split(",") if p.strip().isdigit()),
+            "shard_conn_ids": ",".join(p.strip() for p in self.le_shard_conn_ids.text().split(",") if p.strip().isdigit()),
+            "shard_columns": self.le_shard_columns.text().strip(),
+            "shard_method": self.cbo_shard_method.currentText(),
+            "shard_bounds": self.le_shard_bounds.text().strip()
         }
 
         # Yalnızca 1 kez ekle!
@@ -1799,6 +6117,9 @@ class TransferWizard(QtWidgets.QDialog):
             le_fixed = self.tbl_map.cellWidget(i, 5)
             cb_conv = self.tbl_map.cellWidget(i, 6)
             cb_key = self.tbl_map.cellWidget(i, 7)
+            le_filter = self.tbl_map.cellWidget(i, 8)
+            cb_mode = self.tbl_map.cellWidget(i, 9)
+            cb_suspend = self.tbl_map.cellWidget(i, 10)
 
             src_table = cb_stab.currentText() if cb_stab else ""
             src_col = cb_scol.currentText() if cb_scol else ""
@@ -1817,6 +6138,9 @@ class TransferWizard(QtWidgets.QDialog):
 
             conv_type = cb_conv.currentText() if cb_conv else ""
             key_str = cb_key.currentText() if cb_key else "False"
+            filter_pred = le_filter.text().strip() if le_filter else ""
+            sync_mode = cb_mode.currentText() if cb_mode else ""
+            suspend_str = cb_suspend.currentText() if cb_suspend else "False"
 
             d = {
                 "job_id": job_id,
@@ -1826,7 +6150,10 @@ class TransferWizard(QtWidgets.QDialog):
                 "target_column": tgt_col,
                 "fixed_value": fixed_val if fixed_val else None,
                 "convert_type": conv_type if conv_type else None,
-                "is_key": (key_str == "True")
+                "is_key": (key_str == "True"),
+                "filter_predicate": filter_pred if filter_pred else None,
+                "sync_mode": sync_mode if sync_mode else None,
+                "suspend_constraints": (suspend_str == "True")
             }
             details.append(d)
 
@@ -1860,23 +6187,62 @@ class GeneralSettingsDialog(QtWidgets.QDialog):
 
         self.le_auto_jobs = QLineEdit(self.db_manager.get_setting("auto_start_jobs") or "")
         self.le_retry = QLineEdit(self.db_manager.get_setting("error_retry_seconds") or "60")
+        self.le_retry_count = QLineEdit(self.db_manager.get_setting("error_retry_count") or "5")
         self.le_interval = QLineEdit(self.db_manager.get_setting("auto_transfer_interval") or "0")
+        self.le_queue_lease = QLineEdit(self.db_manager.get_setting("queue_lease_seconds") or str(QUEUE_LEASE_SECONDS))
+        self.le_worker_processes = QLineEdit(self.db_manager.get_setting("worker_processes") or "0")
+        self.le_source_parallelism = QLineEdit(self.db_manager.get_setting("source_parallelism") or "4")
+        self.le_group_parallelism = QLineEdit(self.db_manager.get_setting("group_parallelism") or "1")
         self.le_smtp_server = QLineEdit(self.db_manager.get_setting("smtp_server") or "")
         self.le_smtp_port = QLineEdit(self.db_manager.get_setting("smtp_port") or "587")
         self.le_smtp_user = QLineEdit(self.db_manager.get_setting("smtp_user") or "")
         self.le_smtp_pass = QLineEdit(self.db_manager.get_setting("smtp_pass") or "")
         self.le_smtp_pass.setEchoMode(QLineEdit.Password)
         self.le_smtp_to = QLineEdit(self.db_manager.get_setting("smtp_to") or "")
+        self.le_key_index_min_rows = QLineEdit(self.db_manager.get_setting("key_index_min_rows") or "0")
+        self.le_key_index_dir = QLineEdit(self.db_manager.get_setting("key_index_dir") or "key_index")
+        self.le_key_index_bloom_mb = QLineEdit(self.db_manager.get_setting("key_index_bloom_mb") or "256")
+        self.le_key_index_max_age = QLineEdit(self.db_manager.get_setting("key_index_max_age_hours") or "24")
+        self.le_bulk_batch = QLineEdit(self.db_manager.get_setting("bulk_load_batch_rows") or str(BULK_LOAD_BATCH_ROWS))
+        self.chk_bulk_recovery = QtWidgets.QCheckBox()
+        self.chk_bulk_recovery.setChecked((self.db_manager.get_setting("bulk_load_recovery") or "0") == "1")
+        self.chk_auto_key_index = QtWidgets.QCheckBox()
+        self.chk_auto_key_index.setChecked((self.db_manager.get_setting("auto_create_key_index") or "0") == "1")
+        self.chk_server_side = QtWidgets.QCheckBox()
+        self.chk_server_side.setChecked((self.db_manager.get_setting("server_side_insert") or "1") == "1")
+        self.le_batch_memory = QLineEdit(self.db_manager.get_setting("batch_memory_mb") or "64")
+        self.le_batch_commit = QLineEdit(self.db_manager.get_setting("batch_commit_seconds") or "2")
+        self.cbo_truncation = QComboBox()
+        self.cbo_truncation.addItem("Satırı aktarma", "reject")
+        self.cbo_truncation.addItem("Metni kırp", "truncate")
+        idx = self.cbo_truncation.findData(self.db_manager.get_setting("string_truncation") or "reject")
+        self.cbo_truncation.setCurrentIndex(max(idx, 0))
 
         lay.addRow("Otomatik başlasın mı?", self.chk_auto)
         lay.addRow("Oto. İş ID'leri (virgül):", self.le_auto_jobs)
         lay.addRow("Hata sonrası retry (sn):", self.le_retry)
+        lay.addRow("Geçici hata deneme sayısı:", self.le_retry_count)
         lay.addRow("Oto. Aktarım Sıklığı (sn):", self.le_interval)
+        lay.addRow("Kuyruk kiralama süresi (sn):", self.le_queue_lease)
         lay.addRow("SMTP Server:", self.le_smtp_server)
         lay.addRow("SMTP Port:", self.le_smtp_port)
         lay.addRow("SMTP User:", self.le_smtp_user)
         lay.addRow("SMTP Pass:", self.le_smtp_pass)
         lay.addRow("SMTP To:", self.le_smtp_to)
+        lay.addRow("Disk anahtar indeksi eşiği (satır, 0=kapalı):", self.le_key_index_min_rows)
+        lay.addRow("Anahtar indeksi klasörü:", self.le_key_index_dir)
+        lay.addRow("Bloom filtre sınırı (MB):", self.le_key_index_bloom_mb)
+        lay.addRow("İndeks yenileme süresi (saat):", self.le_key_index_max_age)
+        lay.addRow("Uzun metin politikası:", self.cbo_truncation)
+        lay.addRow("Batch bellek bütçesi (MB):", self.le_batch_memory)
+        lay.addRow("Hedef commit süresi (sn):", self.le_batch_commit)
+        lay.addRow("Aynı sunucuda sunucu tarafı aktarım:", self.chk_server_side)
+        lay.addRow("Eksik anahtar indeksini otomatik oluştur:", self.chk_auto_key_index)
+        lay.addRow("bulk_load batch boyutu (satır):", self.le_bulk_batch)
+        lay.addRow("bulk_load sırasında BULK_LOGGED recovery:", self.chk_bulk_recovery)
+        lay.addRow("Paralel işlem sayısı (0/1=kapalı):", self.le_worker_processes)
+        lay.addRow("Çoklu kaynakta paralel kaynak sayısı:", self.le_source_parallelism)
+        lay.addRow("FK dalgası içinde paralel grup sayısı:", self.le_group_parallelism)
 
         btn = QPushButton("Kaydet")
         btn.clicked.connect(self.on_save)
@@ -1886,15 +6252,115 @@ class GeneralSettingsDialog(QtWidgets.QDialog):
         self.db_manager.set_setting("auto_start_transfers", "1" if self.chk_auto.isChecked() else "0")
         self.db_manager.set_setting("auto_start_jobs", self.le_auto_jobs.text())
         self.db_manager.set_setting("error_retry_seconds", self.le_retry.text())
+        self.db_manager.set_setting("error_retry_count", self.le_retry_count.text())
         self.db_manager.set_setting("auto_transfer_interval", self.le_interval.text())
+        self.db_manager.set_setting("queue_lease_seconds", self.le_queue_lease.text())
+        self.db_manager.set_setting("worker_processes", self.le_worker_processes.text())
+        self.db_manager.set_setting("source_parallelism", self.le_source_parallelism.text())
+        self.db_manager.set_setting("group_parallelism", self.le_group_parallelism.text())
         self.db_manager.set_setting("smtp_server", self.le_smtp_server.text())
         self.db_manager.set_setting("smtp_port", self.le_smtp_port.text())
         self.db_manager.set_setting("smtp_user", self.le_smtp_user.text())
         self.db_manager.set_setting("smtp_pass", self.le_smtp_pass.text())
         self.db_manager.set_setting("smtp_to", self.le_smtp_to.text())
+        self.db_manager.set_setting("key_index_min_rows", self.le_key_index_min_rows.text())
+        self.db_manager.set_setting("key_index_dir", self.le_key_index_dir.text())
+        self.db_manager.set_setting("key_index_bloom_mb", self.le_key_index_bloom_mb.text())
+        self.db_manager.set_setting("key_index_max_age_hours", self.le_key_index_max_age.text())
+        self.db_manager.set_setting("string_truncation", self.cbo_truncation.currentData())
+        self.db_manager.set_setting("batch_memory_mb", self.le_batch_memory.text())
+        self.db_manager.set_setting("server_side_insert", "1" if self.chk_server_side.isChecked() else "0")
+        self.db_manager.set_setting("auto_create_key_index", "1" if self.chk_auto_key_index.isChecked() else "0")
+        self.db_manager.set_setting("bulk_load_batch_rows", self.le_bulk_batch.text())
+        self.db_manager.set_setting("bulk_load_recovery", "1" if self.chk_bulk_recovery.isChecked() else "0")
+        self.db_manager.set_setting("batch_commit_seconds", self.le_batch_commit.text())
         QMessageBox.information(self, "Bilgi", "Ayarlar kaydedildi.")
         self.accept()
 
+###############################################################################
+# KAYNAK LİMİTLERİ DİYALOG
+###############################################################################
+class SourceLimitsDialog(QtWidgets.QDialog):
+    """
+    İş veya kaynak sunucu bazında satır/sn ve eşzamanlı sorgu limitleri. Saat
+    pencereleri boş bırakılırsa limit tüm gün geçerlidir.
+    """
+    def __init__(self, db_manager: DatabaseManager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.setWindowTitle("Kaynak Limitleri")
+        self.resize(750, 350)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        self.tbl = QTableWidget()
+        self.tbl.setColumnCount(6)
+        self.tbl.setHorizontalHeaderLabels([
+            "İş ID (boş=sunucu)", "Kaynak Sunucu", "Başlangıç (SS:DD)", "Bitiş (SS:DD)",
+            "Satır/sn", "Eşzamanlı Sorgu"
+        ])
+        self.tbl.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.tbl)
+
+        btn_layout = QtWidgets.QHBoxLayout()
+        btn_add = QPushButton("Satır Ekle")
+        btn_delete = QPushButton("Satır Sil")
+        btn_save = QPushButton("Kaydet")
+        btn_add.clicked.connect(lambda: self.tbl.insertRow(self.tbl.rowCount()))
+        btn_delete.clicked.connect(self.on_delete)
+        btn_save.clicked.connect(self.on_save)
+        btn_layout.addWidget(btn_add)
+        btn_layout.addWidget(btn_delete)
+        btn_layout.addStretch()
+        btn_layout.addWidget(btn_save)
+        layout.addLayout(btn_layout)
+
+        self.load_data()
+
+    def load_data(self):
+        rows = self.db_manager.get_source_limits()
+        self.tbl.setRowCount(len(rows))
+        for i, r in enumerate(rows):
+            values = [r["job_id"], r["source_server"], r["start_time"], r["end_time"],
+                      r["max_rows_per_sec"], r["max_concurrent"]]
+            for col, v in enumerate(values):
+                self.tbl.setItem(i, col, QTableWidgetItem("" if v is None else str(v)))
+
+    def on_delete(self):
+        row = self.tbl.currentRow()
+        if row >= 0:
+            self.tbl.removeRow(row)
+
+    def on_save(self):
+        def text(row, col):
+            item = self.tbl.item(row, col)
+            return item.text().strip() if item else ""
+
+        limits = []
+        for row in range(self.tbl.rowCount()):
+            job_id, server = text(row, 0), text(row, 1)
+            start, end = text(row, 2), text(row, 3)
+            rate, conc = text(row, 4), text(row, 5)
+            if not (job_id or server):
+                QMessageBox.warning(self, "Uyarı", f"{row + 1}. satır: İş ID veya Kaynak Sunucu girilmeli.")
+                return
+            for label, t in (("Başlangıç", start), ("Bitiş", end)):
+                if t and not re.fullmatch(r"([01]\d|2[0-3]):[0-5]\d", t):
+                    QMessageBox.warning(self, "Uyarı", f"{row + 1}. satır: {label} SS:DD biçiminde olmalı.")
+                    return
+            if any(v and not v.isdigit() for v in (job_id, rate, conc)):
+                QMessageBox.warning(self, "Uyarı", f"{row + 1}. satır: İş ID ve limitler sayı olmalı.")
+                return
+            limits.append({
+                "job_id": int(job_id) if job_id else None,
+                "source_server": server or None,
+                "start_time": start or None,
+                "end_time": end or None,
+                "max_rows_per_sec": int(rate) if rate else None,
+                "max_concurrent": int(conc) if conc else None
+            })
+        self.db_manager.replace_source_limits(limits)
+        self.accept()
+
 ###############################################################################
 # DB AYARLARI DİYALOG
 ###############################################################################
@@ -1937,6 +6403,58 @@ class DBSettingsDialog(QtWidgets.QDialog):
         QMessageBox.information(self, "Bilgi", "config.json güncellendi.")
         self.accept()
 
+###############################################################################
+# AKTARIM PLANI DİYALOĞU
+###############################################################################
+class PlanDialog(QtWidgets.QDialog):
+    def __init__(self, plan, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Aktarım Planı")
+        self.resize(1200, 400)
+        lay = QVBoxLayout(self)
+
+        tbl = QTableWidget()
+        tbl.setColumnCount(9)
+        tbl.setHorizontalHeaderLabels([
+            "Kaynak Tablo", "Hedef Tablo", "Mod", "Kaynak Satır", "Hedef Satır",
+            "Anahtarlar", "Anahtar İndeksi", "Strateji", "Tahmini Süre"
+        ])
+        tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        tbl.setRowCount(len(plan))
+        for i, p in enumerate(plan):
+            if p["estimate_seconds"] is None:
+                estimate = "-"
+            else:
+                estimate = str(datetime.timedelta(seconds=int(p["estimate_seconds"])))
+            values = [
+                p["source_table"], p["target_table"], p["sync_mode"] or "insert",
+                "-" if p["source_rows"] is None else str(p["source_rows"]),
+                "-" if p["target_rows"] is None else str(p["target_rows"]),
+                ", ".join(p["keys"]), p["key_index"] or ("YOK" if p["keys"] else "-"),
+                p["strategy"], estimate
+            ]
+            for col, val in enumerate(values):
+                item = QTableWidgetItem(val)
+                if p["notes"]:
+                    item.setToolTip("\n".join(p["notes"]))
+                tbl.setItem(i, col, item)
+        lay.addWidget(tbl)
+
+        notes = QtWidgets.QPlainTextEdit()
+        notes.setReadOnly(True)
+        lines = []
+        for p in plan:
+            for note in p["notes"]:
+                lines.append(f"{p['source_table']} >> {p['target_table']}: {note}")
+        total = sum(p["estimate_seconds"] or 0 for p in plan)
+        lines.append(f"Toplam tahmini süre: {datetime.timedelta(seconds=int(total))}")
+        notes.setPlainText("\n".join(lines))
+        lay.addWidget(notes)
+
+        btn = QPushButton("Kapat")
+        btn.clicked.connect(self.accept)
+        lay.addWidget(btn)
+
 ###############################################################################
 # ANA PENCERE
 ###############################################################################
@@ -1957,6 +6475,10 @@ class MainWindow(QtWidgets.QMainWindow):
         act_db.triggered.connect(self.on_db_settings)
         menu_settings.addAction(act_db)
 
+        act_limits = QAction("Kaynak Limitleri", self)
+        act_limits.triggered.connect(self.on_source_limits)
+        menu_settings.addAction(act_limits)
+
         menu_saved_db = menubar.addMenu("Kayıtlı Veritabanları")
         act_manage_saved = QAction("Yönet", self)
         act_manage_saved.triggered.connect(self.on_manage_saved)
@@ -1971,6 +6493,10 @@ class MainWindow(QtWidgets.QMainWindow):
         act_run.triggered.connect(self.on_run_transfer)
         tb.addAction(act_run)
 
+        act_plan = QAction("Planla", self)
+        act_plan.triggered.connect(self.on_plan_transfer)
+        tb.addAction(act_plan)
+
         act_edit = QAction("Düzenle", self)
         act_edit.triggered.connect(self.on_edit_job)
         tb.addAction(act_edit)
@@ -2066,6 +6592,8 @@ class MainWindow(QtWidgets.QMainWindow):
         menu.addAction("Düzenle", self.on_edit_job)
         menu.addAction("Sil", self.on_delete_job)
         menu.addAction("Aktarımı Başlat", self.on_run_transfer)
+        menu.addAction("Planla (Dry-run)", self.on_plan_transfer)
+        menu.addAction("Anahtar İndekslerini Denetle", self.on_check_key_indexes)
         menu.addAction("Kopyala (İşi Çoğalt)", self.on_duplicate_job)
         menu.exec_(self.tbl_jobs.mapToGlobal(pos))
 
@@ -2086,6 +6614,73 @@ class MainWindow(QtWidgets.QMainWindow):
         runner.run()
         self.load_jobs()
 
+    def on_plan_transfer(self):
+        row = self.tbl_jobs.currentRow()
+        if row < 0:
+            return
+        job_id_item = self.tbl_jobs.item(row, 0)
+        if not job_id_item:
+            return
+        job_id = int(job_id_item.text())
+        try:
+            plan = TransferPlanner(self.db_manager, job_id).plan()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Plan oluşturulamadı: {str(e)}")
+            return
+        PlanDialog(plan, self).exec_()
+
+    def on_check_key_indexes(self):
+        row = self.tbl_jobs.currentRow()
+        if row < 0:
+            return
+        job_id_item = self.tbl_jobs.item(row, 0)
+        if not job_id_item:
+            return
+        job_id = int(job_id_item.text())
+        planner = TransferPlanner(self.db_manager, job_id)
+        try:
+            results = planner.advise_key_indexes()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"İndeksler denetlenemedi: {str(e)}")
+            return
+        missing = [r for r in results if not r["index"] and not r["error"]]
+        lines = []
+        for r in results:
+            if r["error"]:
+                status = f"hata: {r['error']}"
+            elif r["index"]:
+                status = f"indeks var ({r['index']})"
+            else:
+                probe = "" if r["probe_before_ms"] is None else f", kontrol {r['probe_before_ms']:.2f} ms"
+                status = f"indeks YOK{probe}"
+            lines.append(f"{r['target_table']} ({', '.join(r['keys'])}): {status}")
+        if not lines:
+            QMessageBox.information(self, "Anahtar İndeksleri", "İşte is_key kolonu tanımlı grup yok.")
+            return
+        if not missing:
+            QMessageBox.information(self, "Anahtar İndeksleri", "\n".join(lines))
+            return
+        msg = QMessageBox.question(
+            self, "Anahtar İndeksleri",
+            "\n".join(lines) + "\n\nEksik indeksler oluşturulsun mu?"
+        )
+        if msg != QMessageBox.Yes:
+            return
+        try:
+            results = planner.advise_key_indexes(create=True)
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"İndeksler oluşturulamadı: {str(e)}")
+            return
+        lines = []
+        for r in results:
+            if r["created"]:
+                before = "-" if r["probe_before_ms"] is None else f"{r['probe_before_ms']:.2f} ms"
+                after = "-" if r["probe_after_ms"] is None else f"{r['probe_after_ms']:.2f} ms"
+                lines.append(f"{r['target_table']}: {r['index']} oluşturuldu ({before} -> {after})")
+            elif r["error"]:
+                lines.append(f"{r['target_table']}: hata: {r['error']}")
+        QMessageBox.information(self, "Anahtar İndeksleri", "\n".join(lines) or "Değişiklik yapılmadı.")
+
     def on_edit_job(self):
         row = self.tbl_jobs.currentRow()
         if row < 0:
@@ -2186,28 +6781,34 @@ class MainWindow(QtWidgets.QMainWindow):
         dlg = SavedDBDialog(self.db_manager, self)
         dlg.exec_()
 
+    def on_source_limits(self):
+        dlg = SourceLimitsDialog(self.db_manager, self)
+        dlg.exec_()
+
     def auto_start_transfers(self):
-        jstr = self.db_manager.get_setting("auto_start_jobs") or ""
-        if not jstr:
-            return
-        job_ids = jstr.split(",")
-        for j in job_ids:
-            j = j.strip()
-            if j.isdigit():
-                runner = TransferJobRunner(self.db_manager, int(j))
-                runner.run()
+        self.run_auto_jobs(0)
 
     def on_auto_timer_tick(self):
+        # Diğer düğümler bu aralıkta işi zaten kuyruğa aldıysa tekrar eklenmez
+        self.run_auto_jobs(int(self.auto_interval * 0.9))
+        self.load_jobs()
+
+    def run_auto_jobs(self, min_interval_seconds):
+        """
+        Otomatik işleri doğrudan çalıştırmak yerine kuyruğa ekler, ardından kuyruktaki
+        (başka düğümlerin eklediği ya da kiralaması dolmuş olanlar dahil) işleri çalıştırır.
+        """
         jstr = self.db_manager.get_setting("auto_start_jobs") or ""
         if not jstr:
             return
-        job_ids = jstr.split(",")
-        for j in job_ids:
-            j = j.strip()
-            if j.isdigit():
-                runner = TransferJobRunner(self.db_manager, int(j))
-                runner.run()
-        self.load_jobs()
+        job_ids = [int(j.strip()) for j in jstr.split(",") if j.strip().isdigit()]
+        worker = TransferQueueWorker(self.db_manager)
+        worker.enqueue(job_ids, min_interval_seconds)
+        try:
+            worker.run_pending()
+        except Exception as e:
+            print("Kuyruk çalıştırılırken hata:", e)
+            self.db_manager.invalidate()
 
 ###############################################################################
 # MAIN
@@ -2223,4 +6824,5 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
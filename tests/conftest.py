@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+# Aktarator.py depo kökünde tek modül
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeConnection, FakeDatabaseManager, column, col_map
+
+
+@pytest.fixture
+def run_full_sync(monkeypatch):
+    """
+    full_sync_group'u sahte bağlantılarla çalıştırır: kaynak ve hedef satırları ORDER BY
+    sırasıyla verilir. (runner, {"insert"/"update"/"delete": yazılan parametreler}) döner.
+    Şema verilmezse id int anahtar, v tinyint.
+    """
+    akt = pytest.importorskip("Aktarator")
+
+    def run(src_rows, tgt_rows, schema=None, phases=("insert", "update", "delete")):
+        schema = schema or {"id": column("id", "int", is_nullable=False), "v": column("v", "tinyint")}
+        col_maps = [col_map("id", is_key=True), col_map("v")]
+        monkeypatch.setattr(akt, "get_table_schema", lambda conn, table: conn.schema)
+        source = FakeConnection([src_rows], schema)
+        target = FakeConnection(schema=schema)
+        reader = FakeConnection([tgt_rows], schema)
+        runner = akt.TransferJobRunner(FakeDatabaseManager(), 1)
+        monkeypatch.setattr(runner, "open_connection", lambda job_info, side: reader)
+        runner.full_sync_group({}, source, target, "src", "tgt", col_maps, "", None, phases)
+        written = {}
+        for sql, params in target.written:
+            written.setdefault(sql.split()[0].lower(), []).extend(params)
+        return runner, written
+
+    return run
@@ -0,0 +1,81 @@
+"""
+Testler için pymssql bağlantısı ve DatabaseManager yerine geçen basit nesneler.
+"""
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.pending = []
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        self.pending = list(self.conn.results.pop(0)) if sql.lstrip().upper().startswith("SELECT") and self.conn.results else []
+
+    def executemany(self, sql, seq):
+        self.conn.written.append((sql, list(seq)))
+
+    def fetchmany(self, size):
+        rows, self.pending = self.pending[:size], self.pending[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.pending = self.pending, []
+        return rows
+
+    def fetchone(self):
+        return self.pending.pop(0) if self.pending else None
+
+
+class FakeConnection:
+    """
+    results: sırayla çalıştırılan her SELECT'in döndüreceği satırlar.
+    schema: get_table_schema yerine döndürülecek şema (testte yamanır).
+    """
+    def __init__(self, results=None, schema=None):
+        self.results = list(results or [])
+        self.schema = schema or {}
+        self.executed = []
+        self.written = []
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def ensure_alive(self):
+        pass
+
+
+class FakeDatabaseManager:
+    def __init__(self, settings=None):
+        self.settings = settings or {}
+        self.logs = []
+
+    def get_setting(self, key):
+        return self.settings.get(key)
+
+    def log_message(self, job_id, message):
+        self.logs.append(message)
+
+
+def column(name, data_type, max_length=None, precision=0, scale=0, is_nullable=True, collation=None):
+    return {
+        "name": name, "data_type": data_type, "max_length": max_length, "precision": precision,
+        "scale": scale, "is_nullable": is_nullable, "column_id": 0, "collation": collation
+    }
+
+
+def col_map(target, source=None, is_key=False, fixed_value="", convert_type=""):
+    return {
+        "target_column": target, "source_column": source if source is not None else target,
+        "fixed_value": fixed_value, "is_key": is_key, "convert_type": convert_type
+    }
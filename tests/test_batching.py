@@ -0,0 +1,68 @@
+import pytest
+
+akt = pytest.importorskip("Aktarator")
+
+
+def test_sizer_probes_then_fills_memory_budget():
+    sizer = akt.BatchSizer(1024 * 1024, 2, 64)
+    assert sizer.next_size() == akt.BATCH_PROBE_ROWS
+    sizer.observe([(1, "x" * 1000)] * 10)
+    assert sizer.rows_read == 10
+    # ~1 KB satırla 1 MB bütçe bin satır civarı
+    assert 500 < sizer.next_size() < 1000
+
+
+def test_sizer_follows_commit_latency():
+    sizer = akt.BatchSizer(1024 ** 3, 2, 64)
+    sizer.observe([(1,)])
+    start = sizer.next_size()
+    sizer.record_commit(start, 10)
+    assert sizer.next_size() == start // 2
+    for _ in range(50):
+        sizer.record_commit(100, 0.1)
+    assert sizer.next_size() == akt.BATCH_MAX_ROWS
+    for _ in range(50):
+        sizer.record_commit(100, 10)
+    assert sizer.next_size() == akt.BATCH_MIN_ROWS
+
+
+def test_row_bytes_estimate_uses_target_schema():
+    schema = {"ad": {"data_type": "nvarchar", "max_length": 100}, "n": {"data_type": "int", "max_length": 4}}
+    assert akt.BatchSizer.estimate_row_bytes(schema, ["ad", "n"]) == (49 + 100) + 28 + 32
+    assert akt.BatchSizer.estimate_row_bytes(None, ["x"]) == 64 + 16
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_limits_rate(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(akt.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(akt.time, "sleep", clock.sleep)
+    bucket = akt.TokenBucket(100)
+    bucket.acquire(100)
+    assert clock.slept == [1.0]
+    clock.now += 0.5
+    bucket.acquire(100)
+    assert clock.slept[-1] == pytest.approx(0.5)
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_without_rate_never_waits(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(akt.time, "sleep", clock.sleep)
+    bucket = akt.TokenBucket(None)
+    bucket.acquire(10 ** 9)
+    bucket.set_rate(0)
+    bucket.acquire(10 ** 9)
+    assert clock.slept == []
@@ -0,0 +1,67 @@
+import datetime
+import decimal
+
+import pytest
+
+from fakes import column, col_map
+
+akt = pytest.importorskip("Aktarator")
+
+
+def convert(col_schema, values, convert_type="", truncate=False):
+    conv = akt.ColumnConverter("c", convert_type, col_schema, truncate)
+    invalid = set()
+    return conv.convert(list(values), invalid), invalid, conv
+
+
+def test_datetime_formats_are_learned_per_column():
+    values, invalid, conv = convert(None, ["01.02.2024", "15.03.2024", "", "bozuk", None], "datetime")
+    assert values == [datetime.datetime(2024, 2, 1), datetime.datetime(2024, 3, 15), None, None, None]
+    assert conv.failures == 1 and not invalid
+
+
+def test_number_conversion_writes_null_on_failure():
+    values, invalid, conv = convert(None, ["1", 2.0, "x"], "int")
+    assert values == [1, 2, None]
+    assert conv.failures == 1
+
+
+def test_strings_longer_than_target_are_rejected_or_truncated():
+    col = column("c", "nvarchar", 3)
+    values, invalid, conv = convert(col, ["abc", "abcd"])
+    assert invalid == {1} and conv.rejected == 1
+    values, invalid, conv = convert(col, ["abc", "abcd"], truncate=True)
+    assert values == ["abc", "abc"] and not invalid and conv.truncated == 1
+
+
+def test_int_range_and_not_null_are_enforced():
+    values, invalid, conv = convert(column("c", "tinyint", is_nullable=False), [" 7", 256, "x", None])
+    assert values[0] == 7
+    assert invalid == {1, 2, 3}
+    assert conv.rejected == 3
+
+
+def test_decimal_is_rounded_to_scale_and_overflow_rejected():
+    col = column("c", "decimal", precision=5, scale=2)
+    values, invalid, conv = convert(col, ["1.005", 123.456, "1000", "abc"])
+    assert values[:2] == [decimal.Decimal("1.01"), decimal.Decimal("123.46")]
+    assert invalid == {2, 3}
+
+
+def test_bit_datetime_and_guid_coercion():
+    values, invalid, _ = convert(column("c", "bit"), ["Evet", "false", 2, "belki"])
+    assert values[:3] == [1, 0, 1] and invalid == {3}
+    values, invalid, _ = convert(column("c", "smalldatetime"), ["2024-01-02", datetime.datetime(1800, 1, 1)])
+    assert values[0] == datetime.datetime(2024, 1, 2) and invalid == {1}
+    values, invalid, _ = convert(column("c", "date"), [datetime.datetime(2024, 1, 2, 10, 0)])
+    assert values == [datetime.date(2024, 1, 2)]
+    values, invalid, _ = convert(column("c", "uniqueidentifier"), [" 0A1B2C3D-0000-0000-0000-000000000001", "x"])
+    assert values[0] == "0a1b2c3d-0000-0000-0000-000000000001" and invalid == {1}
+
+
+def test_make_converters_skips_columns_without_schema_or_type():
+    col_maps = [col_map("a"), col_map("b", convert_type="int"), col_map("c")]
+    converters = akt.make_converters(col_maps, {"c": column("c", "int")})
+    assert converters[0] is None
+    assert converters[1].schema is None and converters[1].convert_type == "int"
+    assert converters[2].schema["data_type"] == "int"
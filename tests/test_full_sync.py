@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("Aktarator")
+
+
+def test_rows_are_inserted_updated_and_deleted(run_full_sync):
+    runner, written = run_full_sync(
+        [(1, 10), (2, 21), (4, 40)],
+        [(1, 10), (2, 20), (3, 30)]
+    )
+    assert written == {"insert": [(4, 40)], "update": [(21, 2)], "delete": [(3,)]}
+    assert runner.failed_groups == 0
+
+
+def test_rejected_row_does_not_shift_following_keys(run_full_sync):
+    # 999 tinyint'e sığmaz: satır elenir, sonraki satırlar kendi anahtarlarıyla eşleşmeli
+    runner, written = run_full_sync(
+        [(1, 10), (2, 999), (3, 31), (4, 40), (5, 50)],
+        [(1, 10), (2, 20), (3, 30), (4, 40)]
+    )
+    # Elenen satırın hedefteki karşılığı ne güncellenir ne silinir
+    assert written == {"insert": [(5, 50)], "update": [(31, 3)]}
+
+
+def test_delete_phase_reads_keys_only(run_full_sync):
+    runner, written = run_full_sync([(1,), (3,)], [(1,), (2,), (3,), (4,)], phases=("delete",))
+    assert written == {"delete": [(2,), (4,)]}
@@ -0,0 +1,72 @@
+import datetime
+import decimal
+
+import pytest
+
+from fakes import FakeConnection, FakeDatabaseManager, column, col_map
+
+akt = pytest.importorskip("Aktarator")
+
+
+def test_numeric_types_hash_alike():
+    assert akt.row_hash([1, decimal.Decimal("2.50"), None]) == akt.row_hash([1.0, 2.5, None])
+    assert akt.row_hash([None]) != akt.row_hash([""])
+    assert akt.row_hash(["a", "b"]) != akt.row_hash(["ab", ""])
+
+
+def test_source_values_hash_as_stored_in_target():
+    cols = akt.hash_columns({
+        "code": column("code", "nchar", 10),
+        "ratio": column("ratio", "real"),
+        "stamp": column("stamp", "datetime"),
+        "minute": column("minute", "smalldatetime"),
+        "precise": column("precise", "datetime2", scale=3)
+    }, ["code", "ratio", "stamp", "minute", "precise"])
+    source = ["ab", 1.1, datetime.datetime(2024, 1, 1, 10, 0, 0, 1234),
+              datetime.datetime(2024, 1, 1, 10, 0, 31), datetime.datetime(2024, 1, 1, 10, 0, 0, 123456)]
+    # pymssql'in hedeften döndürdüğü biçim
+    stored = ["ab        ", 1.100000023841858, datetime.datetime(2024, 1, 1, 10, 0, 0),
+              datetime.datetime(2024, 1, 1, 10, 1), datetime.datetime(2024, 1, 1, 10, 0, 0, 123000)]
+    assert akt.row_hash(source, cols) == akt.row_hash(stored, cols)
+    assert akt.row_hash(source) != akt.row_hash(stored)
+
+
+def test_datetime_rounds_to_sql_server_ticks():
+    col = column("stamp", "datetime")
+    base = datetime.datetime(2024, 1, 1)
+    assert akt.to_target_value(base.replace(microsecond=3000), col) == akt.to_target_value(base.replace(microsecond=3333), col)
+    assert akt.to_target_value(base.replace(microsecond=998000), col) == akt.to_target_value(base.replace(microsecond=997000), col)
+    assert akt.to_target_value(datetime.datetime(2024, 1, 1, 23, 59, 59, 999000), col) == datetime.datetime(2024, 1, 2)
+
+
+def test_varchar_trailing_spaces_are_a_change():
+    cols = akt.hash_columns({"name": column("name", "varchar", 10)}, ["name"])
+    assert akt.row_hash(["ab "], cols) != akt.row_hash(["ab"], cols)
+
+
+def test_normalize_key_follows_collation():
+    folds = akt.key_folds({"k": column("k", "nvarchar", 10, collation="Turkish_CI_AI")}, ["k"])
+    assert akt.normalize_key(["Çay  "], folds) == akt.normalize_key(["cay"], folds)
+    assert akt.normalize_key(["Çay"], [(False, False)]) != akt.normalize_key(["cay"], [(False, False)])
+
+
+def test_upsert_skips_rows_unchanged_in_target_representation():
+    schema = {
+        "id": column("id", "int", is_nullable=False),
+        "code": column("code", "char", 10),
+        "ratio": column("ratio", "real")
+    }
+    col_maps = [col_map("id", is_key=True), col_map("code"), col_map("ratio")]
+    target = akt.JobPlan.compile_target("tgt", col_maps, "upsert", schema, False)
+    # fetch_target_hashes: (batch sırası, code, ratio)
+    conn = FakeConnection([[(0, "ab        ", 1.100000023841858), (1, "cd        ", 2.0)]])
+    runner = akt.TransferJobRunner(FakeDatabaseManager(), 1)
+    sizer = runner.make_batch_sizer(100)
+    src_batch = akt.RowBatch.from_rows(["id", "code", "ratio"], [(1, "ab", 1.1), (2, "cd", 2.5), (3, "ef", 3.0)])
+    writer = runner.upsert_writer(conn, "src", target, sizer)
+    next(writer)
+    writer.send(runner.build_target_batch(col_maps, src_batch, target["converters"]))
+    with pytest.raises(StopIteration):
+        writer.send(None)
+    written = {sql.split()[0].lower(): params for sql, params in conn.written}
+    assert written == {"insert": [(3, "ef", 3.0)], "update": [("cd", 2.5, 2)]}
@@ -0,0 +1,52 @@
+import pytest
+
+from fakes import FakeConnection, FakeDatabaseManager, col_map
+
+akt = pytest.importorskip("Aktarator")
+
+
+def build_index(tmp_path, keys, state="3:"):
+    index = akt.DiskKeyIndex(str(tmp_path / "job1_tgt"), ["id"])
+    index.build(FakeConnection([keys]), "tgt", len(keys), 1024 * 1024, state)
+    return index
+
+
+def test_index_finds_built_and_added_keys(tmp_path):
+    index = build_index(tmp_path, [(1,), (2,)])
+    index.open()
+    assert index.contains([1]) and index.contains([2])
+    assert not index.contains([3])
+    index.add([3])
+    assert index.contains([3])
+    index.close()
+
+
+def test_index_is_rebuilt_when_target_changed(tmp_path):
+    index = build_index(tmp_path, [(1,), (2,)], "2:2024-01-01T10:00:00")
+    assert index.is_valid("tgt", 24, "2:2024-01-01T10:00:00")
+    assert index.is_valid("tgt", 24, None)
+    assert not index.is_valid("tgt", 24, "2:2024-01-01T11:00:00")
+    assert not index.is_valid("other", 24, "2:2024-01-01T10:00:00")
+    assert not index.is_valid("tgt", 0, "2:2024-01-01T10:00:00")
+
+
+def test_insert_writer_confirms_index_hits_against_target(tmp_path):
+    settings = {"key_index_min_rows": "1", "key_index_dir": str(tmp_path)}
+    runner = akt.TransferJobRunner(FakeDatabaseManager(settings), 1)
+    col_maps = [col_map("id", is_key=True), col_map("v")]
+    target = akt.JobPlan.compile_target("tgt", col_maps, "", None, False)
+    conn = FakeConnection([
+        [(3,)], [(3,)], [(None,)],  # satır sayısı, değişim özeti (satır sayısı, son yazma)
+        [(1,), (2,), (3,)],         # indeks oluşturma
+        [(0,)],                     # isabetlerin doğrulanması: 2 başka yazıcı tarafından silinmiş
+        [(4,)], [(None,)]           # kapanıştaki değişim özeti
+    ])
+    writer = runner.insert_writer(conn, "src", target, runner.make_batch_sizer(100))
+    next(writer)
+    writer.send(akt.RowBatch.from_rows(["id", "v"], [(1, "a"), (2, "b"), (4, "d")]))
+    with pytest.raises(StopIteration):
+        writer.send(None)
+    assert conn.written == [(target["insert_sql"], [(2, "b"), (4, "d")])]
+    index = runner.make_key_index("tgt", target["key_cols"])
+    # 3 satırdan bizim 2 eklememizle 4 değil 5 olmalıydı: hedefe başkası da yazmış
+    assert not index.is_valid("tgt", 24, "4:")
@@ -0,0 +1,61 @@
+import datetime
+import uuid
+
+import pytest
+
+from fakes import column
+
+akt = pytest.importorskip("Aktarator")
+
+
+def test_key_mode_follows_either_side():
+    assert akt.merge_key_mode("int", "int") == ""
+    assert akt.merge_key_mode("int", "varchar") == "text"
+    assert akt.merge_key_mode("nchar", "bigint") == "text"
+    assert akt.merge_key_mode("uniqueidentifier", "varchar") == "guid"
+
+
+def test_order_expr_sorts_text_as_nvarchar_bin2():
+    assert akt.merge_order_expr("id", "int", "") == "id"
+    assert akt.merge_order_expr("ad", "nvarchar", "text") == "ad COLLATE Latin1_General_BIN2"
+    assert akt.merge_order_expr("ad", "varchar", "text") == "CAST(ad AS NVARCHAR(4000)) COLLATE Latin1_General_BIN2"
+    assert akt.merge_order_expr("g", "uniqueidentifier", "guid") == \
+        "UPPER(CAST(g AS NVARCHAR(4000))) COLLATE Latin1_General_BIN2"
+
+
+def test_text_keys_compare_as_utf16_code_units():
+    # BIN2 UTF-16 kod birimlerini karşılaştırır: vekil çift (U+10000) U+FFFF'ten önce gelir
+    assert akt.merge_key(["\U00010000"], ["text"]) < akt.merge_key(["\uffff"], ["text"])
+    assert akt.merge_key(["B"], ["text"]) < akt.merge_key(["a"], ["text"])
+    assert akt.merge_key(["ab  "], ["text"]) == akt.merge_key(["ab"], ["text"])
+    # Metin olarak karşılaştırılan sayı: "10" < "9"
+    assert akt.merge_key([10], ["text"]) < akt.merge_key([9], ["text"])
+
+
+def test_guid_keys_compare_as_upper_text():
+    g = uuid.UUID("0a1b2c3d-0000-0000-0000-000000000001")
+    assert akt.merge_key([g], ["guid"]) == akt.merge_key([str(g).upper()], ["guid"])
+    assert akt.merge_key([str(g)], ["guid"]) == akt.merge_key([str(g).upper() + " "], ["guid"])
+
+
+def test_nulls_sort_first_and_dates_match_datetimes():
+    assert akt.merge_key([None], [""]) < akt.merge_key([-5], [""])
+    assert akt.merge_key([None, 2], ["", ""]) < akt.merge_key([1, 1], ["", ""])
+    assert akt.merge_key([datetime.date(2024, 1, 2)], [""]) == akt.merge_key([datetime.datetime(2024, 1, 2)], [""])
+    assert akt.merge_key([datetime.date(2024, 1, 2)], [""]) < akt.merge_key([datetime.datetime(2024, 1, 2, 0, 1)], [""])
+
+
+def test_full_sync_merges_text_keys_in_bin2_order(run_full_sync):
+    schema = {"id": column("id", "nvarchar", 10, is_nullable=False), "v": column("v", "int")}
+    # Her iki taraf da ORDER BY ... COLLATE Latin1_General_BIN2 sırasıyla gelir
+    runner, written = run_full_sync(
+        [("B", 1), ("a", 2), ("b ", 3), ("\U00010000", 4)],
+        [("B", 1), ("b", 30), ("c", 5), ("\U00010000", 4), ("\uffff", 6)],
+        schema=schema
+    )
+    assert written == {"insert": [("a", 2)], "update": [(3, "b")], "delete": [("c",), ("\uffff",)]}
+
+
+def test_full_sync_skips_repeated_source_keys(run_full_sync):
+    runner, written = run_full_sync([(1, 10), (1, 11), (2, 20)], [(2, 20)])
+    assert written == {"insert": [(1, 10)]}
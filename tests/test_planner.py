@@ -0,0 +1,73 @@
+import pytest
+
+from fakes import FakeConnection, FakeDatabaseManager, col_map
+
+akt = pytest.importorskip("Aktarator")
+
+
+class PlannerDatabaseManager(FakeDatabaseManager):
+    def __init__(self, saved, replicas=None):
+        super().__init__()
+        self.saved = saved
+        self.replicas = replicas or {}
+
+    def get_saved_connection(self, conn_id):
+        return self.saved.get(conn_id)
+
+    def get_source_replicas(self, server, db):
+        return self.replicas.get(server, ([], None))
+
+    def get_throughput(self, src_table, tgt_table, sync_mode):
+        return 100.0
+
+
+def saved_connection(conn_id, server):
+    return {"conn_id": conn_id, "conn_name": f"sube{conn_id}", "server": server, "port": None,
+            "username": "u", "passw": "p", "dbname": "db"}
+
+
+def make_planner(monkeypatch, job_info, dbm, source_rows):
+    planner = akt.TransferPlanner(dbm, 1)
+    details = [dict(col_map("id", is_key=True), source_table="src", target_table="tgt", sync_mode="upsert",
+                    filter_predicate="", suspend_constraints=False)]
+    monkeypatch.setattr(planner.runner, "get_job_info", lambda: job_info)
+    monkeypatch.setattr(planner.runner, "get_job_details", lambda job_id: details)
+    monkeypatch.setattr(akt, "get_table_indexes", lambda conn, table: {})
+    opened = []
+
+    def open_connection(info, side):
+        server = info["target_server"] if side == "target" else info.get("source_read_server") or info["source_server"]
+        opened.append(server)
+        if server not in source_rows and side == "source":
+            raise RuntimeError("bağlanılamadı")
+        # get_table_row_count: satır sayısı
+        return FakeConnection([[(source_rows.get(server, 7),)]])
+
+    monkeypatch.setattr(planner.runner, "open_connection", open_connection)
+    return planner, opened
+
+
+JOB = {"source_server": "", "source_user": "", "source_password": "", "source_db": "",
+       "target_server": "hedef", "target_user": "u", "target_password": "p", "target_db": "db"}
+
+
+def test_multi_source_rows_are_summed(monkeypatch):
+    dbm = PlannerDatabaseManager({1: saved_connection(1, "sube1"), 2: saved_connection(2, "sube2"),
+                                  3: saved_connection(3, "kapali")})
+    job_info = dict(JOB, source_conn_ids="1,2,3,9")
+    planner, opened = make_planner(monkeypatch, job_info, dbm, {"sube1": 100, "sube2": 50})
+    [item] = planner.plan()
+    assert item["source_rows"] == 150
+    assert item["estimate_seconds"] == pytest.approx(1.5)
+    assert any("[sube3]" in n for n in item["notes"])
+    assert "Kaynak satır sayısı 2 kaynağın toplamıdır." in item["notes"]
+
+
+def test_source_probe_uses_replica_routing(monkeypatch):
+    dbm = PlannerDatabaseManager({}, {"birincil": (["replika"], 30)})
+    job_info = dict(JOB, source_server="birincil", source_db="db")
+    planner, opened = make_planner(monkeypatch, job_info, dbm, {"replika": 40})
+    monkeypatch.setattr(planner.runner, "check_replica", lambda *args, **kwargs: None)
+    [item] = planner.plan()
+    assert "replika" in opened and "birincil" not in opened
+    assert item["source_rows"] == 40